@@ -0,0 +1,120 @@
+"""Benchmark: carga de los datos en uso a medida que se acumulan cuatrimestres.
+
+Simula varios cuatrimestres con los mismos usuarios: en cada uno se crean
+cursos nuevos con sus evaluaciones, inscripciones y calificaciones. Se
+comparan dos directorios de datos: en uno los cursos de cada cuatrimestre se
+archivan al terminar (archive_courses) y en el otro se conservan todos. Tras
+cada cuatrimestre se mide la carga completa en frío (mejor de 3) y el tamaño
+en disco de los datos en uso y de los archivos históricos: con archivo, la
+carga se mantiene plana aunque la historia crezca.
+
+Uso: python benchmarks/bench_archive.py [cuatrimestres] [cursos por cuatrimestre]
+"""
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+
+STUDENTS = 5000
+INSTRUCTORS = 50
+EVALUATIONS = 5
+ENROLLED = 30  # Estudiantes por curso
+
+
+def populate_users(directory):
+    system = CourseManagementSystem(TextStorage(directory))
+    with contextlib.redirect_stdout(io.StringIO()), system.batch():
+        for i in range(INSTRUCTORS):
+            system.register_user(f"I{i}", f"Instructor {i}", f"i{i}@uni.edu", "instructor")
+        for s in range(STUDENTS):
+            system.register_user(f"S{s}", f"Estudiante {s}", f"s{s}@uni.edu", "estudiante")
+    system.save_data()
+    system.storage.close()
+
+
+def run_term(directory, term, courses, rng, archive):
+    """Crear los cursos del cuatrimestre con sus notas y, si archive, archivarlos al terminar"""
+    system = CourseManagementSystem(TextStorage(directory))
+    course_ids = [f"T{term}C{c}" for c in range(courses)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        with system.batch():
+            for c, course_id in enumerate(course_ids):
+                system.create_course(course_id, f"Curso {c} ({term})", f"{term}-{c:04d}", f"I{c % INSTRUCTORS}")
+                for e in range(EVALUATIONS):
+                    system.create_evaluation(f"{course_id}E{e}", course_id, f"Evaluación {e + 1}",
+                                             "examen" if e < 2 else "tarea", 100)
+                for student in rng.sample(range(STUDENTS), ENROLLED):
+                    system.enroll_student(f"S{student}", course_id)
+                    for e in range(EVALUATIONS):
+                        system.register_grade(f"S{student}", f"{course_id}E{e}", rng.randint(30, 100))
+        if archive:
+            system.archive_courses(f"cuatrimestre-{term}", course_ids)
+        else:
+            system.save_data()
+    system.storage.close()
+
+
+def cold_load(directory):
+    best = float("inf")
+    for _ in range(3):
+        gc.collect()
+        start = time.perf_counter()
+        system = CourseManagementSystem(TextStorage(directory))
+        system.ensure_loaded("grades")
+        best = min(best, time.perf_counter() - start)
+        system.storage.close()
+    return best
+
+
+def size(directory, archive=False):
+    if archive:
+        directory = os.path.join(directory, TextStorage.ARCHIVE_DIRECTORY)
+        if not os.path.isdir(directory):
+            return 0
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+               if os.path.isfile(os.path.join(directory, name)))
+
+
+def main():
+    terms = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    courses = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        archived = os.path.join(tmp, "con_archivo")
+        kept = os.path.join(tmp, "sin_archivo")
+        for directory in (archived, kept):
+            os.mkdir(directory)
+            populate_users(directory)
+        print(f"{STUDENTS:,} estudiantes; por cuatrimestre {courses} cursos, {courses * EVALUATIONS:,} evaluaciones "
+              f"y {courses * ENROLLED * EVALUATIONS:,} calificaciones\n")
+        print(f"{'cuatr.':>6} {'carga sin archivo':>18} {'carga con archivo':>18} {'en uso sin':>11} "
+              f"{'en uso con':>11} {'históricos':>11}")
+        for term in range(1, terms + 1):
+            # Misma semilla en ambos directorios: los mismos cursos, inscripciones y notas
+            run_term(kept, term, courses, random.Random(term), archive=False)
+            run_term(archived, term, courses, random.Random(term), archive=True)
+            print(f"{term:>6} {cold_load(kept) * 1000:>15.1f} ms {cold_load(archived) * 1000:>15.1f} ms "
+                  f"{size(kept) / 2**20:>7.2f} MiB {size(archived) / 2**20:>7.2f} MiB "
+                  f"{size(archived, archive=True) / 2**20:>7.2f} MiB")
+
+        system = CourseManagementSystem(TextStorage(archived))
+        start = time.perf_counter()
+        system.archived_course(f"T{terms}C0")
+        located = time.perf_counter() - start
+        start = time.perf_counter()
+        grades = system.archived_student_grades("S0")
+        scanned = time.perf_counter() - start
+        print(f"\nConsultar un curso archivado: {located * 1000:.1f} ms; notas archivadas de un estudiante "
+              f"({len(grades)}, recorriendo {terms} archivos): {scanned * 1000:.1f} ms")
+        system.storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: eventos de cambio frente a volver a leer todas las calificaciones.
+
+Con el dataset sintético de la suite (benchmarks/suite) mide:
+
+- register_grade (cada una con su fsync) sin changefeed, con changefeed y con
+  suscriptores, uno de ellos lento (nunca consume): la cola acotada descarta
+  en vez de frenar la carga de notas.
+- Lo que paga un consumidor para enterarse de las últimas K calificaciones:
+  read_changes(último offset) sobre un changefeed con cientos de miles de
+  eventos previos (búsqueda binaria del offset) contra cargar de nuevo todos
+  los datos, que es lo que hace hoy un proceso que relee grades.txt.
+
+Uso: python benchmarks/bench_changes.py [estudiantes] [eventos previos en el changefeed]
+"""
+import contextlib
+import gc
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import evaluation_id, generate, student_id  # noqa: E402
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+from course_system.events import ChangeFeed  # noqa: E402
+
+GRADES = 200  # register_grade medidos por variante
+
+
+def grade_targets(system, students, count, start=0):
+    """(student_id, evaluation_id) de estudiantes inscritos, para registrar notas válidas.
+
+    Recorre los estudiantes en círculo: con pocos, las últimas notas reemplazan a las primeras.
+    """
+    targets = []
+    number = start
+    while len(targets) < count:
+        student = student_id(number % students)
+        course = next(iter(system.users[student].enrolled_courses))
+        targets.append((student, evaluation_id(course[1:], number % 5)))
+        number += 1
+    return targets
+
+
+def register_latency(system, targets):
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for student, evaluation in targets:
+            start = time.perf_counter()
+            system.register_grade(student, evaluation, 1.0)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    previous = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    with tempfile.TemporaryDirectory() as directory:
+        manifest = generate(directory, students=students)
+        print(f"{manifest['counts']['grades']:,} calificaciones en grades.txt "
+              f"({os.path.getsize(os.path.join(directory, 'grades.txt')) / 2**20:.1f} MiB)\n")
+        storage = TextStorage(directory)
+        system = CourseManagementSystem(storage)
+        system.ensure_loaded("grades")
+
+        print(f"{'register_grade (mediana)':<44} {'µs':>8}")
+        path = storage.changefeed_path
+        storage.changefeed_path = None
+        print(f"{'sin changefeed':<44} {register_latency(system, grade_targets(system, students, GRADES)):>8.1f}")
+        storage.changefeed_path = path
+        print(f"{'con changefeed':<44} "
+              f"{register_latency(system, grade_targets(system, students, GRADES, GRADES)):>8.1f}")
+        consumers = [system.subscribe() for _ in range(3)]
+        slow = system.subscribe(maxsize=50)
+        latency = register_latency(system, grade_targets(system, students, GRADES, 2 * GRADES))
+        for subscription in consumers:
+            subscription.drain()
+        print(f"{'con changefeed y 4 suscriptores (uno lento)':<44} {latency:>8.1f}  "
+              f"(descartados al lento: {slow.dropped})")
+        for subscription in consumers + [slow]:
+            system.unsubscribe(subscription)
+
+        # Historia previa del changefeed: el consumidor no la recorre
+        feed = ChangeFeed(path)
+        for start in range(0, previous, 10_000):
+            feed.append(0.0, [("grade_registered", {"student_id": student_id(number % students),
+                                                    "course_id": "C0", "evaluation_id": "C0E0", "grade": 1.0})
+                              for number in range(start, min(start + 10_000, previous))])
+        print(f"\nchangefeed con {feed.last_offset():,} eventos "
+              f"({os.path.getsize(path) / 2**20:.1f} MiB)")
+        print(f"{'nuevas':>8} {'read_changes(offset)':>22} {'recargar todo':>15}")
+        offset = 3 * GRADES
+        for count in (10, 1000):
+            since = feed.last_offset()
+            with contextlib.redirect_stdout(io.StringIO()), system.batch():
+                for student, evaluation in grade_targets(system, students, count, offset):
+                    system.register_grade(student, evaluation, 2.0)
+            offset += count
+            # Como en la suite: que una recolección pendiente del lote no caiga en la medición
+            gc.collect()
+            start = time.perf_counter()
+            events = system.read_changes(since)
+            incremental = time.perf_counter() - start
+            assert len(events) == count
+            gc.collect()
+            start = time.perf_counter()
+            reloaded = CourseManagementSystem(TextStorage(directory))
+            reloaded.ensure_loaded("grades")
+            full = time.perf_counter() - start
+            reloaded.storage.close()
+            print(f"{count:>8} {incremental * 1000:>19.2f} ms {full * 1000:>12.1f} ms")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
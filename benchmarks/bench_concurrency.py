@@ -0,0 +1,125 @@
+"""Prueba de estrés: varios procesos registran calificaciones sobre los mismos datos.
+
+Cada proceso abre su propio CourseManagementSystem sobre el directorio (o la
+base SQLite) compartido y registra las calificaciones de su porción de
+estudiantes; de vez en cuando compacta con save_data, como haría el menú al
+salir. Además todos intentan registrar un usuario con el mismo email: solo uno
+debe lograrlo. Al final una carga en frío comprueba que no se perdió ninguna
+calificación; el script termina con código 1 si falta alguna.
+
+Uso: python benchmarks/bench_concurrency.py [procesos] [calificaciones por proceso]
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem, SQLiteStorage, TextStorage  # noqa: E402
+
+EVALUATIONS = 10
+SAVE_EVERY = 50
+
+
+def make_storage(backend):
+    if backend == "sqlite":
+        return SQLiteStorage("stress.db")
+    storage = TextStorage(".")
+    # Un journal pequeño fuerza compactaciones frecuentes en medio de la carrera
+    storage.journal_threshold = 16 * 1024
+    return storage
+
+
+def expected_grade(worker, i):
+    return float((worker * 31 + i) % 101)
+
+
+def setup(backend, workers, per_worker):
+    students = per_worker // EVALUATIONS * workers
+    system = CourseManagementSystem(make_storage(backend))
+    with contextlib.redirect_stdout(io.StringIO()), system.batch():
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        system.create_course("C1", "Curso", "COD1", "I1")
+        for e in range(EVALUATIONS):
+            system.create_evaluation(f"E{e}", "C1", f"Eval {e}", "tarea", 100)
+        for s in range(students):
+            system.register_user(f"S{s}", f"Estudiante {s}", f"s{s}@test.com", "estudiante")
+            system.enroll_student(f"S{s}", "C1")
+    system.save_data()
+    system.storage.close()
+
+
+def worker_grades(worker, per_worker):
+    students_per_worker = per_worker // EVALUATIONS
+    for i in range(students_per_worker * EVALUATIONS):
+        student = worker * students_per_worker + i // EVALUATIONS
+        yield f"S{student}", f"E{i % EVALUATIONS}", expected_grade(worker, i)
+
+
+def run_worker(backend, worker, per_worker, results):
+    system = CourseManagementSystem(make_storage(backend))
+    duplicated = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            system.register_user(f"X{worker}", "Repetido", "dup@test.com", "estudiante")
+            duplicated = 1
+        except ValueError:
+            pass
+        for i, (student_id, eval_id, grade) in enumerate(worker_grades(worker, per_worker), start=1):
+            system.register_grade(student_id, eval_id, grade)
+            if i % SAVE_EVERY == 0:
+                system.save_data()
+    system.storage.close()
+    results.put(duplicated)
+
+
+def run(backend, workers, per_worker):
+    setup(backend, workers, per_worker)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_worker, args=(backend, w, per_worker, results))
+                 for w in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for process in processes if process.exitcode != 0)
+    duplicated = sum(results.get() for _ in range(len(processes) - failed))
+
+    system = CourseManagementSystem(make_storage(backend))
+    grades = {}
+    for student_id, course_grades in ((s, system.student_grades(s)) for s in system.users):
+        for eval_id, grade in course_grades.get("C1", {}).items():
+            grades[(student_id, eval_id)] = grade
+    system.storage.close()
+    lost = sum(1 for w in range(workers)
+               for student_id, eval_id, grade in worker_grades(w, per_worker)
+               if grades.get((student_id, eval_id)) != grade)
+    total = workers * (per_worker // EVALUATIONS * EVALUATIONS)
+    print(f"{backend:<7} {workers} procesos: {total / elapsed:8.0f} calificaciones/s, "
+          f"perdidas {lost}/{total}, usuarios con el email repetido: {duplicated}, procesos fallidos: {failed}")
+    return lost == 0 and duplicated == 1 and not failed
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    per_worker = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    cwd = os.getcwd()
+    ok = True
+    for backend in ("text", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                ok = run(backend, workers, per_worker) and ok
+            finally:
+                os.chdir(cwd)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
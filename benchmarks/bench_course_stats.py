@@ -0,0 +1,69 @@
+"""Benchmark: estadísticas de un curso con 10k estudiantes usando la matriz columnar.
+
+Compara el cálculo vectorizado (GradeMatrix, requiere numpy) con un recorrido
+en Python puro de Evaluation.grades para la media y la desviación por evaluación.
+
+Uso: python benchmarks/bench_course_stats.py [estudiantes] [evaluaciones]
+"""
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem  # noqa: E402
+from course_system.system import grade_matrix_class  # noqa: E402
+
+
+def main():
+    if grade_matrix_class() is None:
+        sys.exit("Este benchmark requiere numpy")
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    evals = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            system = CourseManagementSystem()
+            with contextlib.redirect_stdout(io.StringIO()):
+                system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+                system.create_course("C1", "Curso", "COD1", "I1")
+                for e in range(evals):
+                    system.create_evaluation(f"E{e}", "C1", f"Eval {e}", "examen" if e % 4 == 0 else "tarea",
+                                             100 if e % 4 == 0 else 10)
+            system.import_users((f"S{s}", "Estudiante", f"s{s}@test.com", "estudiante") for s in range(students))
+            system.import_enrollments((f"S{s}", "C1") for s in range(students))
+            system.import_grades((f"S{s}", f"E{e}", (s * 7 + e) % (101 if e % 4 == 0 else 11))
+                                 for e in range(evals) for s in range(students) if (s + e) % 10)
+            system.storage.close()
+
+            start = time.perf_counter()
+            system.grade_matrix("C1")
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            system.course_statistics("C1")
+            vectorized = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for evaluation in system.courses["C1"].get_course_evaluations(system):
+                values = list(evaluation.grades.values())
+                statistics.fmean(values)
+                statistics.median(values)
+                statistics.pstdev(values)
+            pure_python = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    print(f"curso: {students:,} estudiantes x {evals} evaluaciones")
+    print(f"construcción de la matriz:        {build * 1000:8.1f} ms")
+    print(f"estadísticas vectorizadas:        {vectorized * 1000:8.1f} ms")
+    print(f"media/mediana/desv. en Python:    {pure_python * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
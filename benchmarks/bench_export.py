@@ -0,0 +1,66 @@
+"""Benchmark: exportación en streaming de libros de calificaciones y expedientes.
+
+Para varios tamaños de dataset mide filas/s de export_transcripts y
+export_gradebook (CSV y JSON Lines) y el pico de memoria adicional durante la
+exportación (tracemalloc, con los datos ya cargados): debe mantenerse
+constante aunque crezca el número de filas.
+
+Uso: python benchmarks/bench_export.py [calificaciones ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import generate  # noqa: E402
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+
+EVALS_PER_COURSE = 10
+STUDENTS_PER_COURSE = 1000
+
+
+def generate_dataset(directory, total_grades):
+    """Dataset de la suite con cursos de STUDENTS_PER_COURSE estudiantes, cada uno en un solo curso"""
+    manifest = generate(directory, students=max(1, total_grades // EVALS_PER_COURSE),
+                        courses=max(1, total_grades // (STUDENTS_PER_COURSE * EVALS_PER_COURSE)),
+                        evaluations=EVALS_PER_COURSE, courses_per_student=1, graded=1.0)
+    return manifest["counts"]["grades"]
+
+
+def measure(export):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        rows = export(devnull)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    print(f"{'calificaciones':>14} {'exportación':<22} {'filas':>10} {'filas/s':>10} {'pico (KiB)':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            written = generate_dataset(tmp, size)
+            system = CourseManagementSystem(TextStorage(tmp))
+            system.ensure_loaded("grades")
+            for export_format in ("csv", "jsonl"):
+                exports = [
+                    (f"expedientes {export_format}",
+                     lambda file, fmt=export_format: system.export_transcripts(file, fmt)),
+                    (f"libro C0 {export_format}",
+                     lambda file, fmt=export_format: system.export_gradebook("C0", file, fmt)),
+                ]
+                for label, export in exports:
+                    rows, elapsed, peak = measure(export)
+                    print(f"{written:>14,} {label:<22} {rows:>10,} {rows / elapsed:>10,.0f} {peak / 1024:>10.1f}")
+            system.storage.close()
+
+
+if __name__ == "__main__":
+    main()
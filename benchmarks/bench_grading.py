@@ -0,0 +1,60 @@
+"""Benchmark: nota final de un curso de 5000 estudiantes tras cambiar una calificación.
+
+Compara recalcular las notas finales de todo el curso (CourseFinalGrades.build,
+lo que haría falta sin actualización incremental) con registrar una
+calificación cuando la tabla ya está construida (solo se recalcula la nota
+del estudiante afectado). Comprueba que ambas coinciden al terminar.
+
+Uso: python benchmarks/bench_grading.py [estudiantes] [cambios]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import course_id, evaluation_id, generate, student_id  # noqa: E402
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+
+EVALUATIONS = 16
+COURSE = course_id(0)  # El generador le asigna una política de calificación
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        # Un solo curso con todos los estudiantes y todas las evaluaciones calificadas
+        manifest = generate(tmp, students=students, courses=1, evaluations=EVALUATIONS, courses_per_student=1,
+                            graded=1.0)
+        system = CourseManagementSystem(TextStorage(tmp))
+        system.ensure_loaded("grades")
+        print(f"{students:,} estudiantes, {manifest['counts']['grades']:,} calificaciones")
+
+        start = time.perf_counter()
+        system._final_grades.clear()
+        system.final_grades(COURSE)
+        rebuild = time.perf_counter() - start
+        print(f"{'recalcular el curso completo':<34} {rebuild * 1000:10.3f} ms")
+
+        # Los cambios se hacen en memoria (sin tocar el disco) para medir solo el cálculo
+        evaluations = system.evaluations
+        start = time.perf_counter()
+        for change in range(changes):
+            student = system.users[student_id(change * 7919 % students)]
+            evaluation = evaluations[evaluation_id(0, change % EVALUATIONS)]
+            # Hasta 10: entra en el puntaje máximo de cualquier evaluación
+            system._store_grade(student, evaluation, float(change % 11))
+        incremental = (time.perf_counter() - start) / changes
+        print(f"{'actualizar tras un cambio':<34} {incremental * 1000:10.3f} ms  "
+              f"({rebuild / incremental:,.0f}x)")
+
+        updated = dict(system.final_grades(COURSE))
+        system._final_grades.clear()
+        assert updated == dict(system.final_grades(COURSE))
+        system.storage.close()
+
+
+if __name__ == "__main__":
+    main()
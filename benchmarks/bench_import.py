@@ -0,0 +1,66 @@
+"""Benchmark: throughput de la importación masiva de calificaciones.
+
+Genera 1000 estudiantes inscritos en 100 cursos de 10 evaluaciones cada uno y
+mide cuántas filas por segundo procesa import_grades() sobre un archivo CSV de
+1M de calificaciones, incluyendo la persistencia única del lote.
+
+Uso: python benchmarks/bench_import.py [filas]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem  # noqa: E402
+
+STUDENTS = 1000
+EVALS_PER_COURSE = 10
+
+
+def setup(system, course_count):
+    with contextlib.redirect_stdout(io.StringIO()):
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        for c in range(course_count):
+            system.create_course(f"C{c}", f"Curso {c}", f"COD{c}", "I1")
+            for e in range(EVALS_PER_COURSE):
+                system.create_evaluation(f"E{c}_{e}", f"C{c}", f"Eval {e}", "tarea", 100)
+    system.import_users(
+        (f"S{s}", f"Estudiante {s}", f"s{s}@test.com", "estudiante") for s in range(STUDENTS))
+    system.import_enrollments(
+        (f"S{s}", f"C{c}") for s in range(STUDENTS) for c in range(course_count))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    course_count = max(1, rows // (STUDENTS * EVALS_PER_COURSE))
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            system = CourseManagementSystem()
+            setup(system, course_count)
+            with open("import.csv", "w", encoding="utf-8") as file:
+                file.write("student_id,evaluation_id,grade\n")
+                for c in range(course_count):
+                    for e in range(EVALS_PER_COURSE):
+                        for s in range(STUDENTS):
+                            file.write(f"S{s},E{c}_{e},{(s * 7 + e) % 101}\n")
+
+            start = time.perf_counter()
+            imported, errors = system.import_grades("import.csv")
+            elapsed = time.perf_counter() - start
+            system.storage.close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"filas importadas: {imported:,} (errores: {len(errors)})")
+    print(f"tiempo total:     {elapsed:.2f} s")
+    print(f"throughput:       {imported / elapsed:,.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
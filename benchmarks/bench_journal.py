@@ -0,0 +1,56 @@
+"""Benchmark: costo de registrar una calificación según el tamaño del dataset.
+
+Con el journal, registrar una calificación agrega un solo registro al archivo,
+así que el tiempo debe mantenerse plano aunque grades.txt crezca. Como
+referencia se mide también una reescritura completa con save_data().
+
+Uso: python benchmarks/bench_journal.py
+"""
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import DEFAULTS, evaluation_id, generate, student_id  # noqa: E402
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+
+REPEATS = 50
+
+
+def bench(total_grades):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Dataset de la suite con todas las evaluaciones calificadas: 100 notas por estudiante
+        manifest = generate(tmp, students=max(1, total_grades // 100), courses=100, graded=1.0)
+        system = CourseManagementSystem(TextStorage(tmp))
+        # Evitar que una compactación caiga dentro de la medición
+        system.storage.journal_threshold = float("inf")
+        course = next(iter(system.users[student_id(0)].enrolled_courses))
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(REPEATS):
+                start = time.perf_counter()
+                system.register_grade(student_id(0), evaluation_id(course[1:], i % DEFAULTS["evaluations"]),
+                                      float(i % 10))
+                timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        system.save_data()
+        full_rewrite = time.perf_counter() - start
+        system.storage.close()
+        return manifest["counts"]["grades"], statistics.median(timings), full_rewrite
+
+
+def main():
+    print(f"{'calificaciones':>15} {'registro (ms)':>15} {'save_data (ms)':>15}")
+    for size in (1_000, 10_000, 100_000, 500_000):
+        written, journal_time, rewrite_time = bench(size)
+        print(f"{written:>15,} {journal_time * 1000:>15.3f} {rewrite_time * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: arranque y memoria del cargador anterior frente al cargador por bloques.
+
+Con el dataset sintético de la suite (benchmarks/suite, 1M de calificaciones
+por defecto) mide:
+- el cargador original, línea por línea con strip()/split() y todo al inicio;
+- el cargador por bloques cargando todas las secciones;
+- el arranque de un comando que solo lista cursos (no lee grades.txt);
+- la memoria por calificación (tracemalloc) de los dos cargadores completos:
+  el original guarda cada nota dos veces en objetos con __dict__, el actual
+  una sola vez en las columnas del GradeStore.
+
+Uso: python benchmarks/bench_load.py [calificaciones]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import DEFAULTS, generate  # noqa: E402
+from course_system import CourseManagementSystem  # noqa: E402
+from legacy import LegacyLoader  # noqa: E402
+
+# Calificaciones por estudiante con todas las evaluaciones calificadas
+GRADES_PER_STUDENT = DEFAULTS["courses_per_student"] * DEFAULTS["evaluations"]
+
+
+def load_current():
+    system = CourseManagementSystem()
+    system.ensure_loaded("grades")
+    return system
+
+
+def list_courses():
+    return CourseManagementSystem().items("courses")
+
+
+def timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def traced(loader):
+    tracemalloc.start()
+    result = loader()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = generate(tmp, students=max(1, total // GRADES_PER_STUDENT), graded=1.0)
+        written = manifest["counts"]["grades"]
+        # LegacyLoader y el almacenamiento por defecto leen del directorio actual
+        os.chdir(tmp)
+        try:
+            legacy = timed(LegacyLoader)
+            full = timed(load_current)
+            courses_only = timed(list_courses)
+            legacy_current, legacy_peak = traced(LegacyLoader)
+            current, peak = traced(load_current)
+        finally:
+            os.chdir(cwd)
+
+    print(f"dataset: {written:,} calificaciones")
+    print(f"cargador original (todo):       {legacy:8.3f} s")
+    print(f"cargador por bloques (todo):    {full:8.3f} s")
+    print(f"listar cursos (carga diferida): {courses_only:8.3f} s")
+    print(f"\n{'':12} {'bytes/calificación':>20} {'pico (MB)':>12}")
+    print(f"{'original':12} {legacy_current / written:20.1f} {legacy_peak / 2**20:12.1f}")
+    print(f"{'actual':12} {current / written:20.1f} {peak / 2**20:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: costo de la instrumentación desactivada y activada.
+
+Para algunas operaciones mide el tiempo por llamada invocando la función de
+la clase directamente (sin ninguna capa), en una instancia sin métricas y en
+una con enable_metrics(). Sin métricas no debe haber diferencia con la
+llamada directa: la instrumentación no instala nada hasta activarse.
+
+Uso: python benchmarks/bench_metrics.py [repeticiones]
+"""
+import contextlib
+import functools
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem  # noqa: E402
+
+STUDENTS = 500
+
+
+def build(system):
+    with contextlib.redirect_stdout(io.StringIO()), system.batch():
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        system.create_course("C1", "Curso", "COD1", "I1")
+        for e in range(4):
+            system.create_evaluation(f"E{e}", "C1", f"Eval {e}", "tarea", 100)
+        for s in range(STUDENTS):
+            system.register_user(f"S{s}", f"Estudiante {s}", f"s{s}@test.com", "estudiante")
+            system.enroll_student(f"S{s}", "C1")
+
+
+def per_call(function, repetitions):
+    """Nanosegundos por llamada en una medición"""
+    start = time.perf_counter()
+    for i in range(repetitions):
+        function(i)
+    return (time.perf_counter() - start) / repetitions * 1e9
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            system = CourseManagementSystem()
+            build(system)
+            system.student_report("S1")
+            cls = CourseManagementSystem
+
+            def register(method):
+                # Dentro de batch() las escrituras se acumulan: se mide la operación, no el fsync
+                def call(i):
+                    method(f"S{i % STUDENTS}", f"E{i % 4}", float(i % 101))
+                return call
+
+            operations = [
+                ("grading_policy", lambda method: lambda i: method("C1"),
+                 lambda: system.grading_policy, lambda: functools.partial(cls.grading_policy, system)),
+                ("student_report (caché)", lambda method: lambda i: method("S1"),
+                 lambda: system.student_report, lambda: functools.partial(cls.student_report, system)),
+                ("register_grade", register,
+                 lambda: system.register_grade, lambda: functools.partial(cls.register_grade, system)),
+            ]
+            print(f"{'operación':<24} {'directa':>10} {'desactivada':>12} {'activada':>10} "
+                  f"{'sobrecosto desact.':>19} {'activ.':>8}")
+            with contextlib.redirect_stdout(io.StringIO()) as output, system.batch():
+                results = []
+                for label, make_call, bound, direct in operations:
+                    # Variantes intercaladas y el mejor de 5 rondas, para que el orden no sesgue
+                    best = [float("inf")] * 3
+                    for _ in range(5):
+                        best[0] = min(best[0], per_call(make_call(direct()), repetitions))
+                        best[1] = min(best[1], per_call(make_call(bound()), repetitions))
+                        system.enable_metrics()
+                        best[2] = min(best[2], per_call(make_call(bound()), repetitions))
+                        system.disable_metrics()
+                        output.seek(0)
+                        output.truncate()
+                    results.append((label, *best))
+            for label, direct_ns, disabled_ns, enabled_ns in results:
+                print(f"{label:<24} {direct_ns:>8.0f}ns {disabled_ns:>10.0f}ns {enabled_ns:>8.0f}ns "
+                      f"{(disabled_ns - direct_ns) / direct_ns:>19.1%} {(enabled_ns - direct_ns) / direct_ns:>8.1%}")
+            system.storage.close()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: resúmenes de fin de curso en serie y con 1/2/4/8 procesos.
+
+Compara el recorrido en serie sobre los objetos del modelo (cada curso, cada
+estudiante inscrito, cada evaluación) con compute_all_course_reports, que
+envía a los procesos solo los bytes de las columnas del GradeStore.
+Comprueba además que todas las variantes den el mismo resultado.
+
+Uso: python benchmarks/bench_parallel.py [calificaciones]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import generate  # noqa: E402
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+
+COURSES = 200
+EVALS_PER_COURSE = 10
+WORKERS = [1, 2, 4, 8]
+
+
+def generate_dataset(directory, total_grades):
+    """Dataset de la suite en el que cada estudiante toma 4 de los COURSES cursos"""
+    manifest = generate(directory, students=max(1, total_grades // (4 * EVALS_PER_COURSE)), courses=COURSES,
+                        evaluations=EVALS_PER_COURSE, courses_per_student=4)
+    return manifest["counts"]["grades"]
+
+
+def serial_loop(system):
+    """Versión directa sobre el modelo: promedio normalizado y aprobación por curso"""
+    results = {}
+    for course in system.courses.values():
+        evaluations = course.get_course_evaluations(system)
+        averages = []
+        for student_id in course.enrolled_students:
+            percents = [evaluation.grades[student_id] / evaluation.max_score * 100
+                        for evaluation in evaluations if student_id in evaluation.grades]
+            if percents:
+                averages.append(sum(percents) / len(percents))
+        results[course.course_id] = (sum(averages) / len(averages) if averages else None,
+                                     sum(1 for a in averages if a >= 60) / len(averages) if averages else None)
+    return results
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        written = generate_dataset(tmp, total)
+        system = CourseManagementSystem(TextStorage(tmp))
+        system.ensure_loaded("grades")
+        print(f"{COURSES} cursos, {written:,} calificaciones, {os.cpu_count()} CPU")
+
+        start = time.perf_counter()
+        expected = serial_loop(system)
+        baseline = time.perf_counter() - start
+        print(f"{'recorrido en serie del modelo':<32} {baseline:8.3f} s")
+
+        for workers in WORKERS:
+            start = time.perf_counter()
+            summaries = system.compute_all_course_reports(workers=workers)
+            elapsed = time.perf_counter() - start
+            for course_id, (average, pass_rate) in expected.items():
+                summary = summaries[course_id]
+                assert (summary["average"] is None) == (average is None), course_id
+                assert average is None or abs(summary["average"] - average) < 1e-9, course_id
+                assert pass_rate is None or abs(summary["pass_rate"] - pass_rate) < 1e-12, course_id
+            label = f"compute_all_course_reports({workers})"
+            print(f"{label:<32} {elapsed:8.3f} s  ({baseline / elapsed:.1f}x)")
+        system.storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: acceso repetido a reportes con y sin la caché LRU.
+
+Simula la publicación de notas: muchos accesos a show_student_grades y
+show_course_details concentrados en unos pocos estudiantes (distribución
+de Zipf) con una calificación nueva cada WRITE_EVERY accesos, lo que
+invalida las entradas afectadas. Compara la caché desactivada con varios
+tamaños y muestra los contadores de aciertos, fallos y desalojos.
+
+Uso: python benchmarks/bench_reports.py [accesos]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem, ReportCache  # noqa: E402
+
+STUDENTS = 5000
+COURSES = 20
+EVALS_PER_COURSE = 8
+WRITE_EVERY = 50
+CACHE_SIZES = [0, 256, 1024, 8192]
+
+
+def write_dataset():
+    rng = random.Random(7)
+    system = CourseManagementSystem()
+    with contextlib.redirect_stdout(io.StringIO()), system.batch():
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        for c in range(COURSES):
+            system.create_course(f"C{c}", f"Curso {c}", f"COD{c}", "I1")
+            for e in range(EVALS_PER_COURSE):
+                system.create_evaluation(f"E{c}_{e}", f"C{c}", f"Eval {e}", "tarea", 100)
+        for s in range(STUDENTS):
+            system.register_user(f"S{s}", f"Estudiante {s}", f"s{s}@test.com", "estudiante")
+            for c in rng.sample(range(COURSES), 4):
+                system.enroll_student(f"S{s}", f"C{c}")
+                for e in range(EVALS_PER_COURSE):
+                    system.register_grade(f"S{s}", f"E{c}_{e}", float(rng.randint(0, 100)))
+    system.save_data()
+    system.storage.close()
+
+
+def access_pattern(accesses):
+    rng = random.Random(11)
+    weights = [1 / (rank + 1) for rank in range(STUDENTS)]
+    students = rng.choices(range(STUDENTS), weights=weights, k=accesses)
+    return [(f"S{s}", f"C{s % COURSES}" if i % 5 == 0 else None) for i, s in enumerate(students)]
+
+
+def run(max_entries, pattern):
+    system = CourseManagementSystem()
+    system.report_cache = ReportCache(max_entries)
+    system.ensure_loaded("grades")
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i, (student_id, course_id) in enumerate(pattern, start=1):
+            if course_id is not None:
+                system.show_course_details(course_id)
+            else:
+                system.show_student_grades(student_id)
+            if i % WRITE_EVERY == 0:
+                student = system.users[student_id]
+                course_id = next(iter(student.enrolled_courses))
+                system.register_grade(student_id, f"E{course_id[1:]}_0", float(i % 101))
+        elapsed = time.perf_counter() - start
+    system.storage.close()
+    return elapsed, system.report_cache.stats()
+
+
+def main():
+    accesses = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            write_dataset()
+            pattern = access_pattern(accesses)
+            print(f"{accesses:,} accesos ({STUDENTS:,} estudiantes, una calificación cada {WRITE_EVERY})")
+            print(f"{'entradas':>8} {'tiempo (s)':>10} {'accesos/s':>10} {'aciertos':>9} {'fallos':>7} {'desalojos':>9}")
+            for max_entries in CACHE_SIZES:
+                elapsed, stats = run(max_entries, pattern)
+                print(f"{max_entries:>8} {elapsed:10.3f} {accesses / elapsed:10.0f} "
+                      f"{stats['hits']:>9} {stats['misses']:>7} {stats['evictions']:>9}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark: búsqueda por nombre, email y código con 100 000 usuarios.
+
+Genera usuarios con nombres y apellidos realistas (muchos repetidos, como en
+una universidad real), cursos y evaluaciones; construye el índice con la
+primera búsqueda y mide la latencia de consultas exactas, por prefijo, de
+varias palabras y con errores de tipeo (la mediana refleja los términos ya
+paginados antes; el p95, los que se ordenan por primera vez). Como referencia, compara con
+recorrer todos los usuarios buscando la subcadena (lo único posible sin
+índice), y mide el costo de mantener el índice al registrar usuarios.
+
+Uso: python benchmarks/bench_search.py [usuarios] [consultas por tipo]
+"""
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem  # noqa: E402
+from course_system.search import split_words  # noqa: E402
+
+FIRST_NAMES = ("María José Luis Ana Carlos Lucía Juan Sofía Pedro Valentina Diego Camila Jorge Daniela Andrés "
+               "Gabriela Miguel Fernanda Ricardo Paula Alejandro Isabel Fernando Mariana Roberto Natalia Sergio "
+               "Carolina Eduardo Andrea Manuel Verónica Raúl Patricia Javier Laura Óscar Mónica Héctor Elena "
+               "Francisco Adriana Alberto Claudia Rafael Teresa Pablo Rocío Gustavo Silvia").split()
+LAST_NAMES = ("González Rodríguez Gómez Fernández López Díaz Martínez Pérez García Sánchez Romero Sosa Torres "
+              "Álvarez Ruiz Ramírez Flores Benítez Acosta Medina Herrera Suárez Aguirre Giménez Gutiérrez Pereyra "
+              "Rojas Molina Castro Ortiz Silva Núñez Luna Juárez Cabrera Ríos Ferreyra Godoy Morales Domínguez "
+              "Moreno Peralta Vega Carrizo Quiroga Castillo Ledesma Muñoz Ojeda Ponce Vera Villalba Cardozo "
+              "Navarro Coronel Vázquez Ramos Arias Mendoza Figueroa").split()
+SUBJECTS = ("Programación Algoritmos Cálculo Álgebra Física Química Estadística Bases Redes Sistemas Compiladores "
+            "Economía Contabilidad Historia Literatura Biología Ética Inglés Arquitectura Electrónica").split()
+LEVELS = ("Introducción a", "Fundamentos de", "Avanzada de", "Laboratorio de", "Taller de", "Seminario de")
+
+
+def plain(text):
+    return " ".join(split_words(text))
+
+
+def write_dataset(users, courses, rng):
+    instructors = users // 100
+    names = {}
+    with open("users.txt", "w", encoding="utf-8") as user_file:
+        for u in range(users):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+            first, last = plain(name).split()[:2]
+            user_id = f"I{u}" if u < instructors else f"S{u}"
+            user_type = "instructor" if u < instructors else "estudiante"
+            user_file.write(f"{user_id}|{name}|{first}.{last}{u}@uni.edu|{user_type}\n")
+            names[user_id] = name
+    with open("courses.txt", "w", encoding="utf-8") as course_file, \
+            open("evaluations.txt", "w", encoding="utf-8") as evaluation_file:
+        for c in range(courses):
+            course_file.write(f"C{c}|{rng.choice(LEVELS)} {rng.choice(SUBJECTS)} {c // 50 + 1}|"
+                              f"{SUBJECTS[c % len(SUBJECTS)][:3].upper()}-{c:04d}|I{c % instructors}\n")
+            for e in range(10):
+                evaluation_file.write(f"C{c}E{e}|{'Parcial' if e < 3 else 'Trabajo práctico'} {e + 1}|C{c}|"
+                                      f"{'examen' if e < 3 else 'tarea'}|100\n")
+    return names
+
+
+def latencies(function, queries):
+    result = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        result.append(time.perf_counter() - start)
+    return result
+
+
+def report(label, samples, total=None):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+    extra = f"  ~{total:,.0f} resultados" if total is not None else ""
+    print(f"{label:<34} {statistics.median(samples) * 1000:8.3f} {p95 * 1000:8.3f} {samples[-1] * 1000:8.3f} ms"
+          f"{extra}")
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(1)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            names = write_dataset(users, 1000, rng)
+            system = CourseManagementSystem()
+            system.ensure_loaded("evaluations")
+            start = time.perf_counter()
+            system.search("")
+            print(f"{users:,} usuarios, 1,000 cursos, 10,000 evaluaciones; índice construido en "
+                  f"{time.perf_counter() - start:.2f} s\n")
+
+            samples = [name for name in rng.sample(list(names.values()), count)]
+            queries = {
+                "nombre exacto": [name.split()[0] for name in samples],
+                "nombre y apellido": [" ".join(name.split()[:2]) for name in samples],
+                "prefijo de 3 letras": [plain(name).split()[1][:3] for name in samples],
+                "nombre + prefijo de apellido": [f"{name.split()[0]} {name.split()[2][:4]}" for name in samples],
+                "error de tipeo": [name.split()[1][:-2] + name.split()[1][-1] + name.split()[1][-2]
+                                   for name in samples],
+                "email": [f"{plain(name).split()[0]}.{plain(name).split()[1]}" for name in samples],
+                "código de curso": [f"{SUBJECTS[c % len(SUBJECTS)][:3]}-{c:04d}"
+                                    for c in (rng.randrange(1000) for _ in range(count))],
+                "dominio del email (todos)": ["uni.edu"] * 20,
+            }
+            print(f"{'consulta (página de 20)':<34} {'mediana':>8} {'p95':>8} {'máx':>8}")
+            for label, batch in queries.items():
+                # Primero las latencias: incluyen ordenar cada término la primera vez que se pagina
+                samples = latencies(system.search, batch)
+                report(label, samples, statistics.mean(system.search(query).total for query in batch[:20]))
+
+            users_list = list(system.users.values())
+
+            def scan(query):
+                # Sin índice: recorrer todos los usuarios comparando en minúsculas
+                query = query.lower()
+                return [user for user in users_list if query in user.name.lower() or query in user.email]
+
+            report("\nsin índice (subcadena en usuarios)", latencies(scan, queries["nombre y apellido"][:20]))
+
+            with contextlib.redirect_stdout(io.StringIO()), system.batch():
+                start = time.perf_counter()
+                for u in range(1000):
+                    system.register_user(f"N{u}", f"Nuevo {rng.choice(LAST_NAMES)}", f"nuevo{u}@uni.edu",
+                                         "estudiante")
+                indexed = (time.perf_counter() - start) / 1000
+            print(f"register_user con el índice construido: {indexed * 1e6:.1f} µs por usuario "
+                  f"(incluye validación y actualización del índice)")
+            assert system.search("nuevo").total == 1000
+            system.storage.close()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
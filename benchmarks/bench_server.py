@@ -0,0 +1,124 @@
+"""Benchmark: generador de carga contra el servidor HTTP/JSON local.
+
+Levanta `CourseServer` en otro proceso sobre un dataset sintético y lanza
+varias conexiones keep-alive concurrentes desde asyncio. Para cada mezcla de
+operaciones (solo lecturas, solo escrituras, 80/20) reporta peticiones por
+segundo y latencias p50/p99.
+
+Uso: python benchmarks/bench_server.py [conexiones] [peticiones por mezcla]
+"""
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem  # noqa: E402
+from course_system.server import CourseServer  # noqa: E402
+
+STUDENTS = 1000
+EVALUATIONS = 10
+MIXES = [("lecturas", 1.0), ("escrituras", 0.0), ("80% lecturas", 0.8)]
+
+
+def write_dataset():
+    system = CourseManagementSystem()
+    with contextlib.redirect_stdout(io.StringIO()), system.batch():
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        system.create_course("C1", "Curso", "COD1", "I1")
+        for e in range(EVALUATIONS):
+            system.create_evaluation(f"E{e}", "C1", f"Eval {e}", "tarea", 100)
+        for s in range(STUDENTS):
+            system.register_user(f"S{s}", f"Estudiante {s}", f"s{s}@test.com", "estudiante")
+            system.enroll_student(f"S{s}", "C1")
+            for e in range(EVALUATIONS):
+                system.register_grade(f"S{s}", f"E{e}", float((s * 7 + e) % 101))
+    system.save_data()
+    system.storage.close()
+
+
+def serve(ports):
+    async def run():
+        server = CourseServer(CourseManagementSystem(), port=0)
+        await server.start()
+        ports.put(server.port)
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, read_ratio, count, offset, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(count):
+        n = offset + i
+        start = time.perf_counter()
+        # Reparto determinista de lecturas y escrituras según la proporción pedida
+        if (n * 0.618) % 1 < read_ratio:
+            status = await request(reader, writer, "GET", f"/students/S{n % STUDENTS}/grades")
+        else:
+            status = await request(reader, writer, "POST", "/grades",
+                                   {"student_id": f"S{n % STUDENTS}", "evaluation_id": f"E{n % EVALUATIONS}",
+                                    "grade": n % 101})
+        latencies.append(time.perf_counter() - start)
+        assert status == 200, status
+    writer.close()
+
+
+async def load(port, connections, total, read_ratio):
+    latencies = []
+    per_client = total // connections
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, read_ratio, per_client, c * per_client, latencies)
+                           for c in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (len(latencies) / elapsed, statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000)
+
+
+def main():
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            write_dataset()
+            ports = multiprocessing.Queue()
+            server = multiprocessing.Process(target=serve, args=(ports,), daemon=True)
+            server.start()
+            port = ports.get(timeout=30)
+            print(f"{connections} conexiones, {total:,} peticiones por mezcla")
+            print(f"{'mezcla':<14} {'peticiones/s':>12} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+            for label, read_ratio in MIXES:
+                rps, p50, p99 = asyncio.run(load(port, connections, total, read_ratio))
+                print(f"{label:<14} {rps:12.0f} {p50:9.2f} {p99:9.2f}")
+            server.terminate()
+            server.join()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
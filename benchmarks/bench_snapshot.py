@@ -0,0 +1,90 @@
+"""Benchmark: arranque desde los archivos de texto frente al snapshot binario (mmap).
+
+Para cada tamaño mide la carga completa desde texto, el save_data que
+escribe también snapshot.bin, la carga completa desde el snapshot y una
+consulta de un estudiante directamente sobre el archivo mapeado (sin
+cargar las calificaciones). Comprueba que ambas cargas den el mismo estado.
+
+Uso: python benchmarks/bench_snapshot.py [calificaciones ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite.dataset import generate  # noqa: E402
+from course_system import CourseManagementSystem, TextStorage  # noqa: E402
+
+COURSES = 200
+EVALS_PER_COURSE = 10
+
+
+def generate_dataset(directory, total_grades):
+    """Dataset de la suite en el que cada estudiante toma 4 de los COURSES cursos"""
+    manifest = generate(directory, students=max(1, total_grades // (4 * EVALS_PER_COURSE)), courses=COURSES,
+                        evaluations=EVALS_PER_COURSE, courses_per_student=4)
+    return manifest["counts"]["grades"]
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return time.perf_counter() - start, result
+
+
+def load(binary_snapshot=False):
+    system = CourseManagementSystem(TextStorage(binary_snapshot=binary_snapshot))
+    system.ensure_loaded("grades")
+    return system
+
+
+def fingerprint(system):
+    student = system.users["S1"]
+    return (len(system.users), sum(course.counts[eval_id] for _, course in system.grade_store.courses()
+                                   for eval_id in course.columns),
+            # El acumulado se suma en otro orden según de dónde se cargó
+            round(student.get_overall_average(), 9), student.grades, list(student.enrolled_courses))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000, 10_000_000]
+    cwd = os.getcwd()
+    print(f"{'calificaciones':>14} {'texto':>9} {'save_data':>10} {'snapshot':>9} {'mejora':>7} "
+          f"{'consulta':>10} {'grades.txt':>11} {'snapshot.bin':>13}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                written = generate_dataset(tmp, size)
+                text_time, system = timed(load)
+                expected = fingerprint(system)
+                system.storage.close()
+
+                system = load(binary_snapshot=True)
+                save_time, _ = timed(system.save_data)
+                system.storage.close()
+                del system
+
+                snapshot_time, system = timed(load)
+                assert system.storage._snapshot_grades_taken  # Las columnas salieron del snapshot
+                assert fingerprint(system) == expected
+                system.storage.close()
+                del system
+
+                system = CourseManagementSystem()
+                query_time, grades = timed(lambda: system.student_grades("S1"))
+                assert "grades" not in system._loaded and grades == expected[3]
+                system.storage.close()
+
+                print(f"{written:>14,} {text_time:>8.2f}s {save_time:>9.2f}s {snapshot_time:>8.2f}s "
+                      f"{text_time / snapshot_time:>6.1f}x {query_time * 1000:>8.2f}ms "
+                      f"{os.path.getsize('grades.txt') / 2**20:>9.1f}MB "
+                      f"{os.path.getsize('snapshot.bin') / 2**20:>11.1f}MB")
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
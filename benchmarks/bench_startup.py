@@ -0,0 +1,70 @@
+"""Benchmark: tiempo de importación y de arranque en frío.
+
+Mide, en intérpretes nuevos (mediana de varias ejecuciones):
+- ``import course_system``;
+- construir CourseManagementSystem() sobre un dataset sintético;
+- el primer listado de cursos (carga diferida, sin leer grades.txt).
+
+Con --max-import-ms termina con código 1 si la importación supera el límite,
+para detectar regresiones de arranque en CI.
+
+Uso: python benchmarks/bench_startup.py [--grades N] [--max-import-ms MS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.suite.dataset import generate  # noqa: E402
+
+REPEATS = 15
+
+TIMED_SNIPPET = """
+import time
+start = time.perf_counter()
+{setup}
+elapsed = time.perf_counter() - start
+print(elapsed)
+"""
+
+
+def run_timed(setup, cwd):
+    """Ejecutar setup en un intérprete nuevo y devolver su duración mediana en ms"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    samples = []
+    for _ in range(REPEATS):
+        output = subprocess.run([sys.executable, "-c", TIMED_SNIPPET.format(setup=setup)],
+                                cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout
+        samples.append(float(output) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grades", type=int, default=1_000_000)
+    parser.add_argument("--max-import-ms", type=float)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Todas las evaluaciones calificadas: 100 calificaciones por estudiante
+        generate(tmp, students=max(1, args.grades // 100), graded=1.0)
+        import_ms = run_timed("import course_system", tmp)
+        construct_ms = run_timed("import course_system; course_system.CourseManagementSystem()", tmp)
+        list_ms = run_timed("import course_system; course_system.CourseManagementSystem().items('courses')", tmp)
+
+    print(f"import course_system:              {import_ms:8.2f} ms")
+    print(f"import + CourseManagementSystem(): {construct_ms:8.2f} ms")
+    print(f"import + listar cursos:            {list_ms:8.2f} ms  ({args.grades:,} calificaciones en disco)")
+
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"La importación supera el límite de {args.max_import_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: archivos de texto frente a SQLite.
+
+Con el mismo dataset sintético en ambos backends mide:
+- carga completa en frío (todas las secciones, incluidas las calificaciones);
+- escritura de una calificación (mediana de varias);
+- latencia del reporte de un estudiante desde un arranque en frío.
+
+Uso: python benchmarks/bench_storage.py [calificaciones]
+"""
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem, SQLiteStorage, TextStorage  # noqa: E402
+
+STUDENTS = 2000
+EVALS_PER_COURSE = 10
+REPEATS = 30
+
+
+def write_text_dataset(total_grades):
+    course_count = max(1, total_grades // (STUDENTS * EVALS_PER_COURSE))
+    with open("users.txt", "w", encoding="utf-8") as users, \
+            open("courses.txt", "w", encoding="utf-8") as courses, \
+            open("evaluations.txt", "w", encoding="utf-8") as evaluations, \
+            open("grades.txt", "w", encoding="utf-8") as grades:
+        users.write("I1|Instructor|i1@test.com|instructor\n")
+        for s in range(STUDENTS):
+            users.write(f"S{s}|Estudiante {s}|s{s}@test.com|estudiante\n")
+        for c in range(course_count):
+            courses.write(f"C{c}|Curso {c}|COD{c}|I1\n")
+            for e in range(EVALS_PER_COURSE):
+                evaluations.write(f"E{c}_{e}|Eval {e}|C{c}|tarea|100\n")
+                grades.writelines(f"S{s}|C{c}|E{c}_{e}|{(s * 7 + e) % 101}.0\n" for s in range(STUDENTS))
+    return course_count * STUDENTS * EVALS_PER_COURSE
+
+
+def measure(make_storage):
+    results = {}
+
+    start = time.perf_counter()
+    system = CourseManagementSystem(make_storage())
+    system.ensure_loaded("grades")
+    results["carga completa (s)"] = time.perf_counter() - start
+
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        system.enroll_student("S0", "C0")
+        for i in range(REPEATS):
+            start = time.perf_counter()
+            system.register_grade("S0", f"E0_{i % EVALS_PER_COURSE}", float(i % 100))
+            timings.append(time.perf_counter() - start)
+    results["escritura (ms)"] = statistics.median(timings) * 1000
+    system.storage.close()
+
+    start = time.perf_counter()
+    system = CourseManagementSystem(make_storage())
+    with contextlib.redirect_stdout(io.StringIO()):
+        system.show_student_grades("S1")
+    results["reporte en frío (s)"] = time.perf_counter() - start
+    system.storage.close()
+    return results
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            written = write_text_dataset(total)
+            source = CourseManagementSystem()
+            source.ensure_loaded("grades")
+            sqlite_storage = SQLiteStorage("bench.db")
+            sqlite_storage.snapshot(source._snapshot_records())
+            sqlite_storage.close()
+
+            text = measure(TextStorage)
+            sqlite = measure(lambda: SQLiteStorage("bench.db"))
+        finally:
+            os.chdir(cwd)
+
+    print(f"dataset: {written:,} calificaciones")
+    print(f"{'':22} {'texto':>10} {'sqlite':>10}")
+    for metric in text:
+        print(f"{metric:22} {text[metric]:10.3f} {sqlite[metric]:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
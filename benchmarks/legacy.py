@@ -0,0 +1,175 @@
+"""Modelo y cargador originales (antes de las optimizaciones), usados como referencia.
+
+Los benchmarks comparan contra esta copia: objetos con __dict__, cada
+calificación guardada en Student._grades y en Evaluation.grades, y la carga
+línea por línea de los cuatro archivos al iniciar.
+"""
+
+
+class User:
+    def __init__(self, user_id, name, email, user_type):
+        self._user_id = user_id
+        self._name = name
+        self._email = email
+        self._user_type = user_type
+
+    @property
+    def user_id(self):
+        return self._user_id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def email(self):
+        return self._email
+
+    @property
+    def user_type(self):
+        return self._user_type
+
+    def __str__(self):
+        return f"{self._name} - {self._email} - {self._user_type}"
+
+
+class Student(User):
+    def __init__(self, user_id, name, email):
+        super().__init__(user_id, name, email, "estudiante")
+        self._enrolled_courses = []
+        self._grades = {}  # {course_id: {eval_id: grade}}
+
+    @property
+    def enrolled_courses(self):
+        return self._enrolled_courses
+
+    @property
+    def grades(self):
+        return self._grades
+
+    def get_course_grades(self, course_id):
+        """Obtener las calificaciones de un curso específico"""
+        return self._grades.get(course_id, {})
+
+    def add_grade(self, course_id, eval_id, grade):
+        """Agregar una calificación para un curso específico"""
+        if course_id not in self._grades:
+            self._grades[course_id] = {}
+        self._grades[course_id][eval_id] = grade
+
+    def get_course_average(self, course_id):
+        """Calcular el promedio de un curso específico"""
+        course_grades = self.get_course_grades(course_id)
+        if not course_grades:
+            return 0
+        return sum(course_grades.values()) / len(course_grades)
+
+    def get_overall_average(self):
+        """Calcular el promedio general de todos los cursos"""
+        if not self._grades:
+            return 0
+        total_sum = 0
+        total_count = 0
+        for course_grades in self._grades.values():
+            total_sum += sum(course_grades.values())
+            total_count += len(course_grades)
+        return total_sum / total_count if total_count > 0 else 0
+
+
+class Instructor(User):
+    def __init__(self, user_id, name, email):
+        super().__init__(user_id, name, email, "instructor")
+        self._taught_courses = []
+
+    @property
+    def taught_courses(self):
+        return self._taught_courses
+
+
+class Course:
+    def __init__(self, course_id, name, code, instructor_id):
+        self.course_id = course_id
+        self.name = name
+        self.code = code
+        self.instructor_id = instructor_id
+        self.enrolled_students = []
+        self.evaluations = []  # Lista de evaluation_ids
+
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+
+    def get_course_evaluations(self, system):
+        """Obtener objetos de evaluación del curso"""
+        course_evals = []
+        for eval_id in self.evaluations:
+            if eval_id in system.evaluations:
+                course_evals.append(system.evaluations[eval_id])
+        return course_evals
+
+
+class Evaluation:
+    def __init__(self, evaluation_id, course_id, name, evaluation_type, max_score):
+        self.evaluation_id = evaluation_id
+        self.course_id = course_id
+        self.name = name
+        self.evaluation_type = evaluation_type
+        self.max_score = max_score
+        self.grades = {}  # {student_id: grade}
+
+    def __str__(self):
+        return f"{self.name} - ({self.evaluation_type}) - Max: {self.max_score}"
+
+
+class LegacyLoader:
+    """Copia del cargador original, usada como referencia"""
+
+    def __init__(self):
+        self.users = {}
+        self.courses = {}
+        self.evaluations = {}
+        for loader in (self.load_users, self.load_courses, self.load_evaluations, self.load_grades):
+            loader()
+
+    def load_users(self):
+        with open("users.txt", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    user_id, name, email, user_type = line.strip().split("|")
+                    if user_type == "estudiante":
+                        self.users[user_id] = Student(user_id, name, email)
+                    elif user_type == "instructor":
+                        self.users[user_id] = Instructor(user_id, name, email)
+
+    def load_courses(self):
+        with open("courses.txt", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip() and "|" in line:
+                    parts = line.strip().split("|")
+                    if len(parts) == 4:
+                        course_id, name, code, instructor_id = parts
+                        if instructor_id in self.users:
+                            course = Course(course_id, name, code, instructor_id)
+                            self.courses[course_id] = course
+                            if hasattr(self.users[instructor_id], 'taught_courses'):
+                                self.users[instructor_id].taught_courses.append(course_id)
+
+    def load_evaluations(self):
+        with open("evaluations.txt", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip() and "|" in line:
+                    eval_id, name, course_id, eval_type, max_score = line.strip().split("|")
+                    if course_id in self.courses:
+                        evaluation = Evaluation(eval_id, course_id, name, eval_type, int(max_score))
+                        self.evaluations[eval_id] = evaluation
+                        self.courses[course_id].evaluations.append(eval_id)
+
+    def load_grades(self):
+        with open("grades.txt", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip() and "|" in line:
+                    student_id, course_id, eval_id, grade = line.strip().split("|")
+                    if (student_id in self.users and
+                            isinstance(self.users[student_id], Student) and
+                            eval_id in self.evaluations):
+                        self.users[student_id].add_grade(course_id, eval_id, float(grade))
+                        self.evaluations[eval_id].grades[student_id] = float(grade)
@@ -0,0 +1,11 @@
+"""Suite de benchmarks con un dataset sintético a escala configurable.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.suite --list
+    python -m benchmarks.suite --students 10000 --courses 500 --evaluations 20 --output base.json
+    python -m benchmarks.suite --output nuevo.json --baseline base.json
+
+Con --baseline se imprime la diferencia por escenario y el proceso termina
+con código 1 si alguno es más lento que la tolerancia (--tolerance).
+"""
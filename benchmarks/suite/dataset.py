@@ -0,0 +1,103 @@
+"""Generador determinista de datasets en el formato de los archivos de texto.
+
+La misma combinación de parámetros y semilla produce siempre los mismos
+archivos, así que los resultados de distintas corridas son comparables.
+"""
+import json
+import os
+import random
+
+MANIFEST = "dataset.json"
+DEFAULTS = {"students": 10_000, "courses": 500, "evaluations": 20, "courses_per_student": 5,
+            "graded": 0.9, "seed": 1}
+MAX_SCORES = (10, 20, 50, 100)
+
+
+def student_id(number):
+    return f"S{number}"
+
+
+def course_id(number):
+    return f"C{number}"
+
+
+def evaluation_id(course, number):
+    return f"C{course}E{number}"
+
+
+def generate(directory, students=10_000, courses=500, evaluations=20, courses_per_student=5, graded=0.9, seed=1):
+    """Escribir users/courses/evaluations/policies/enrollments/grades.txt en directory.
+
+    Cada estudiante se inscribe en courses_per_student cursos al azar y tiene
+    nota en cada evaluación con probabilidad `graded`. Uno de cada diez cursos
+    define una política de calificación. Devuelve el manifiesto (parámetros y
+    conteos), que también se guarda como dataset.json.
+    """
+    rng = random.Random(seed)
+    instructors = max(1, courses // 5)
+    courses_per_student = min(courses_per_student, courses)
+    exams = max(1, evaluations // 5)
+    max_scores = {}
+    os.makedirs(directory, exist_ok=True)
+
+    def path(filename):
+        return os.path.join(directory, filename)
+
+    with open(path("users.txt"), "w", encoding="utf-8") as users:
+        users.writelines(f"I{i}|Instructor {i}|i{i}@uni.edu|instructor\n" for i in range(instructors))
+        users.writelines(f"{student_id(s)}|Estudiante {s}|s{s}@uni.edu|estudiante\n" for s in range(students))
+
+    with open(path("courses.txt"), "w", encoding="utf-8") as course_file, \
+            open(path("evaluations.txt"), "w", encoding="utf-8") as evaluation_file, \
+            open(path("policies.txt"), "w", encoding="utf-8") as policy_file:
+        for c in range(courses):
+            course_file.write(f"{course_id(c)}|Curso {c}|COD{c:05d}|I{c % instructors}\n")
+            for e in range(evaluations):
+                exam = e < exams
+                max_score = 100 if exam else rng.choice(MAX_SCORES)
+                max_scores[c, e] = max_score
+                evaluation_file.write(f"{evaluation_id(c, e)}|{'Examen' if exam else 'Tarea'} {e}|{course_id(c)}|"
+                                      f"{'examen' if exam else 'tarea'}|{max_score}\n")
+            if c % 10 == 0:
+                policy_file.write(f"{course_id(c)}|examen:0.6,tarea:0.4|tarea:1|90.0:A,80.0:B,70.0:C,60.0:D,0.0:F\n")
+
+    enrollment_count = 0
+    grade_count = 0
+    with open(path("enrollments.txt"), "w", encoding="utf-8") as enrollments, \
+            open(path("grades.txt"), "w", encoding="utf-8") as grades:
+        for s in range(students):
+            lines = []
+            for c in sorted(rng.sample(range(courses), courses_per_student)):
+                enrollments.write(f"{student_id(s)}|{course_id(c)}\n")
+                enrollment_count += 1
+                # Notas sesgadas hacia arriba, como en un curso real
+                for e in range(evaluations):
+                    if rng.random() < graded:
+                        max_score = max_scores[c, e]
+                        grade = round(rng.triangular(0, max_score, max_score * 0.8), 1)
+                        lines.append(f"{student_id(s)}|{course_id(c)}|{evaluation_id(c, e)}|{grade}\n")
+            grades.writelines(lines)
+            grade_count += len(lines)
+
+    manifest = {"parameters": {"students": students, "courses": courses, "evaluations": evaluations,
+                               "courses_per_student": courses_per_student, "graded": graded, "seed": seed},
+                "counts": {"users": students + instructors, "courses": courses,
+                           "evaluations": courses * evaluations, "enrollments": enrollment_count,
+                           "grades": grade_count}}
+    with open(path(MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def load_or_generate(directory, **parameters):
+    """Reutilizar el dataset de directory si se generó con los mismos parámetros"""
+    parameters = {**DEFAULTS, **parameters}
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        manifest = None
+    if manifest is not None and manifest["parameters"] == {
+            **parameters, "courses_per_student": min(parameters["courses_per_student"], parameters["courses"])}:
+        return manifest
+    return generate(directory, **parameters)
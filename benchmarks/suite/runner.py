@@ -0,0 +1,191 @@
+"""Ejecución de los escenarios, resultados en JSON y comparación con una línea base.
+
+Cada corrida de un escenario se hace en un proceso nuevo y sobre una copia
+del dataset, así ninguna hereda cachés, módulos ya importados ni cambios en
+disco de la anterior. Las corridas de tiempo no usan tracemalloc (lo haría
+más lento); el pico de memoria sale de una corrida adicional que sí lo usa.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .dataset import DEFAULTS, MANIFEST, load_or_generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Measure:
+    """Context manager que mide la parte medida de un escenario"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.seconds = None
+        self.peak_memory = None
+
+    def __enter__(self):
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def run_scenario(name, directory, trace_memory=False):
+    """Ejecutar un escenario en este proceso y devolver sus mediciones"""
+    from .scenarios import SCENARIOS
+
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+        manifest = json.load(file)
+    measure = Measure(trace_memory)
+    operations = SCENARIOS[name][1](directory, manifest, measure)
+    result = {"seconds": measure.seconds, "operations": operations, "peak_memory": measure.peak_memory}
+    try:
+        import resource
+    except ImportError:  # Windows
+        pass
+    else:
+        result["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def run_isolated(name, data_directory, trace_memory=False):
+    """Ejecutar un escenario en un proceso nuevo sobre una copia del dataset"""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "datos")
+        shutil.copytree(data_directory, directory)
+        command = [sys.executable, "-m", "benchmarks.suite", "--worker", name, directory]
+        if trace_memory:
+            command.append("--trace-memory")
+        completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode:
+        raise RuntimeError(f"El escenario {name} falló:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_suite(names, data_directory, manifest, repeat=3, log=print):
+    from .scenarios import SCENARIOS
+
+    results = {}
+    for name in names:
+        description = SCENARIOS[name][0]
+        runs = [run_isolated(name, data_directory) for _ in range(repeat)]
+        memory = run_isolated(name, data_directory, trace_memory=True)
+        seconds = [run["seconds"] for run in runs]
+        median = statistics.median(seconds)
+        operations = runs[0]["operations"]
+        results[name] = {"description": description, "operations": operations, "runs": seconds,
+                         "seconds": median, "per_operation": median / operations if operations else None,
+                         "peak_memory": memory["peak_memory"], "max_rss_kib": memory.get("max_rss_kib")}
+        log(f"{name:<22} {median:>9.4f} s  {median / operations * 1e3 if operations else 0:>10.4f} ms/op  "
+            f"pico {memory['peak_memory'] / 2**20:>8.1f} MiB")
+    return {
+        "meta": {"date": datetime.datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "repeat": repeat},
+        "dataset": manifest,
+        "scenarios": results,
+    }
+
+
+def compare(results, baseline, tolerance=0.1, log=print):
+    """Imprimir la comparación con la línea base y devolver los escenarios más lentos"""
+    if baseline.get("dataset", {}).get("parameters") != results["dataset"]["parameters"]:
+        log("Aviso: la línea base usó otro dataset; la comparación no es directa")
+    regressions = []
+    log(f"\n{'escenario':<22} {'base (s)':>10} {'actual (s)':>11} {'cambio':>8} {'memoria':>8}")
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            log(f"{name:<22} {'-':>10} {result['seconds']:>11.4f}   (nuevo)")
+            continue
+        ratio = result["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        memory_ratio = (result["peak_memory"] / base["peak_memory"]
+                        if base.get("peak_memory") else float("nan"))
+        mark = ""
+        if ratio > 1 + tolerance:
+            mark = "  más lento"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            mark = "  más rápido"
+        log(f"{name:<22} {base['seconds']:>10.4f} {result['seconds']:>11.4f} {ratio - 1:>+8.1%} "
+            f"{memory_ratio - 1:>+8.1%}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    from .scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Benchmarks de carga, escritura y reportes con un dataset sintético")
+    for option, value in DEFAULTS.items():
+        parser.add_argument(f"--{option.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--data", help="Directorio del dataset (se genera si falta o no coincide)")
+    parser.add_argument("--scenarios", help="Escenarios separados por comas (por defecto, todos)")
+    parser.add_argument("--repeat", type=int, default=3, help="Corridas de tiempo por escenario (se usa la mediana)")
+    parser.add_argument("--output", help="Guardar los resultados en este archivo JSON")
+    parser.add_argument("--baseline", help="Comparar con un JSON de resultados anterior")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Cambio relativo de tiempo que se considera regresión (0.1 = 10%%)")
+    parser.add_argument("--list", action="store_true", help="Listar los escenarios y salir")
+    parser.add_argument("--worker", nargs=2, metavar=("ESCENARIO", "DIRECTORIO"), help=argparse.SUPPRESS)
+    parser.add_argument("--trace-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_scenario(*args.worker, trace_memory=args.trace_memory)))
+        return 0
+    if args.list:
+        for name, (description, _) in SCENARIOS.items():
+            print(f"{name:<22} {description}")
+        return 0
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"escenarios desconocidos: {', '.join(unknown)}")
+    parameters = {option: getattr(args, option) for option in DEFAULTS}
+    data_directory = args.data or os.path.join(
+        tempfile.gettempdir(), "course-bench-" + "-".join(str(value) for value in parameters.values()))
+    start = time.perf_counter()
+    manifest = load_or_generate(data_directory, **parameters)
+    counts = manifest["counts"]
+    print(f"dataset en {data_directory} ({time.perf_counter() - start:.1f} s): {counts['users']:,} usuarios, "
+          f"{counts['courses']:,} cursos, {counts['evaluations']:,} evaluaciones, "
+          f"{counts['enrollments']:,} inscripciones, {counts['grades']:,} calificaciones")
+
+    results = run_suite(names, data_directory, manifest, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Resultados guardados en {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"Regresiones: {', '.join(regressions)}")
+            return 1
+    return 0
@@ -0,0 +1,201 @@
+"""Escenarios del benchmark.
+
+Cada escenario recibe el directorio de datos (una copia del dataset solo para
+esa corrida), el manifiesto y `measure`, un context manager que envuelve
+únicamente la parte medida; lo anterior es preparación. Devuelve la cantidad
+de operaciones medidas (para el tiempo por operación).
+"""
+import contextlib
+import io
+import os
+
+from course_system import CourseManagementSystem, TextStorage
+
+from .dataset import course_id, evaluation_id, student_id
+
+SCENARIOS = {}  # {nombre: (descripción, función)}
+# Estudiantes consultados en los escenarios que recorren estudiantes uno a uno
+SAMPLE = 1000
+
+
+def scenario(name, description):
+    def register(function):
+        SCENARIOS[name] = (description, function)
+        return function
+    return register
+
+
+def open_system(directory):
+    return CourseManagementSystem(TextStorage(directory))
+
+
+def loaded(directory):
+    system = open_system(directory)
+    system.ensure_loaded("grades")
+    return system
+
+
+def quiet():
+    """Descartar lo que imprimen las operaciones (mensajes y reportes del menú)"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def sample_students(manifest, count=SAMPLE):
+    students = manifest["parameters"]["students"]
+    step = max(1, students // count)
+    return [student_id(number) for number in range(0, students, step)][:count]
+
+
+@scenario("cold_load", "Arranque y carga completa de todas las secciones")
+def cold_load(directory, manifest, measure):
+    with measure:
+        system = loaded(directory)
+    system.storage.close()
+    return 1
+
+
+@scenario("lazy_start", "Arranque y listado de cursos (sin leer calificaciones)")
+def lazy_start(directory, manifest, measure):
+    with measure, quiet():
+        system = open_system(directory)
+        system.list_items("courses")
+    system.storage.close()
+    return 1
+
+
+@scenario("register_grade", "Registrar calificaciones de a una (cada una con su fsync)")
+def register_grade(directory, manifest, measure):
+    system = loaded(directory)
+    evaluations = manifest["parameters"]["evaluations"]
+    grades = []
+    for number, student in enumerate(sample_students(manifest, 200)):
+        course = next(iter(system.users[student].enrolled_courses))
+        grades.append((student, evaluation_id(course[1:], number % evaluations)))
+    with measure, quiet():
+        for student, evaluation in grades:
+            system.register_grade(student, evaluation, 1.0)
+    system.storage.close()
+    return len(grades)
+
+
+@scenario("bulk_enrollment", "Inscribir a todos los estudiantes en un curso nuevo con import_enrollments")
+def bulk_enrollment(directory, manifest, measure):
+    system = loaded(directory)
+    with quiet():
+        system.create_course("NUEVO", "Curso nuevo", "COD-NUEVO", "I0")
+    rows = [(student_id(number), "NUEVO") for number in range(manifest["parameters"]["students"])]
+    with measure:
+        imported, errors = system.import_enrollments(rows)
+    assert not errors, errors[:3]
+    system.storage.close()
+    return imported
+
+
+@scenario("averages", "Promedio general y por curso de cada estudiante")
+def averages(directory, manifest, measure):
+    system = loaded(directory)
+    students = [user for user in system.users.values() if user.user_type == "estudiante"]
+    with measure:
+        for student in students:
+            student.get_overall_average()
+            for course in student.enrolled_courses:
+                student.get_course_average(course)
+    system.storage.close()
+    return len(students)
+
+
+@scenario("report_student", "Reporte completo (show_student_grades) de una muestra de estudiantes")
+def report_student(directory, manifest, measure):
+    system = loaded(directory)
+    students = sample_students(manifest)
+    with measure, quiet():
+        for student in students:
+            system.show_student_grades(student)
+    system.storage.close()
+    return len(students)
+
+
+@scenario("report_course", "Detalle de cada curso (show_course_details, con estadísticas si hay numpy)")
+def report_course(directory, manifest, measure):
+    system = loaded(directory)
+    courses = list(system.courses)
+    with measure, quiet():
+        for course in courses:
+            system.show_course_details(course)
+    system.storage.close()
+    return len(courses)
+
+
+@scenario("report_rankings", "Bajo rendimiento y mejores/peores estudiantes, generales y por curso")
+def report_rankings(directory, manifest, measure):
+    system = loaded(directory)
+    courses = [course_id(number) for number in range(min(50, manifest["parameters"]["courses"]))]
+    with measure:
+        system.low_performance_students(60)
+        system.top_students(10)
+        system.bottom_students(10)
+        for course in courses:
+            system.low_performance_students(60, course)
+            system.top_students(10, course)
+    system.storage.close()
+    return 3 + 2 * len(courses)
+
+
+@scenario("report_final_grades", "Notas finales ponderadas de cada curso")
+def report_final_grades(directory, manifest, measure):
+    system = loaded(directory)
+    courses = list(system.courses)
+    with measure:
+        for course in courses:
+            system.final_grades(course)
+    system.storage.close()
+    return len(courses)
+
+
+@scenario("report_summaries", "Resúmenes de fin de curso de todos los cursos (un proceso)")
+def report_summaries(directory, manifest, measure):
+    system = loaded(directory)
+    with measure:
+        system.compute_all_course_reports(workers=1)
+    system.storage.close()
+    return len(system.courses)
+
+
+@scenario("export_transcripts", "Exportar todas las calificaciones a CSV")
+def export_transcripts(directory, manifest, measure):
+    system = loaded(directory)
+    with open(os.devnull, "w", encoding="utf-8") as devnull, measure:
+        rows = system.export_transcripts(devnull)
+    system.storage.close()
+    return rows
+
+
+@scenario("export_gradebooks", "Exportar el libro de calificaciones de cada curso a CSV")
+def export_gradebooks(directory, manifest, measure):
+    system = loaded(directory)
+    courses = list(system.courses)
+    with open(os.devnull, "w", encoding="utf-8") as devnull, measure:
+        for course in courses:
+            system.export_gradebook(course, devnull)
+    system.storage.close()
+    return len(courses)
+
+
+@scenario("save_data", "Volcado completo con save_data")
+def save_data(directory, manifest, measure):
+    system = loaded(directory)
+    with measure:
+        system.save_data()
+    system.storage.close()
+    return 1
+
+
+@scenario("clear_reload", "clear_all_data y volver a cargar desde disco")
+def clear_reload(directory, manifest, measure):
+    system = loaded(directory)
+    with measure:
+        system.clear_all_data()
+        system.load_data()
+        system.ensure_loaded("grades")
+    system.storage.close()
+    return 1
@@ -0,0 +1,14 @@
+"""Sistema de gestión de cursos.
+
+Importar el paquete no lee datos ni inicia el menú: el sistema se construye
+explícitamente con ``CourseManagementSystem()`` (o ``python -m course_system``).
+"""
+from .cache import ReportCache
+from .models import (Course, CourseGrades, Evaluation, EvaluationGrades, GradeStore, Instructor, Student,
+                     User)
+from .storage import SQLiteStorage, StorageBackend, TextStorage
+from .system import CourseManagementSystem, NotFoundError
+
+__all__ = ["Course", "CourseGrades", "CourseManagementSystem", "Evaluation", "EvaluationGrades", "GradeStore",
+           "Instructor", "NotFoundError", "ReportCache", "SQLiteStorage", "StorageBackend", "Student", "TextStorage",
+           "User"]
@@ -0,0 +1,127 @@
+"""Archivos históricos: cursos archivados en JSON Lines comprimido con gzip.
+
+Cada archivo histórico (por ejemplo, un cuatrimestre) es <nombre>.jsonl.gz en
+el directorio de archivos del almacenamiento. Cada línea es un registro con
+"type" ("course", "policy", "evaluation", "enrollment", "grade" o
+"final_grade") y el course_id al que pertenece. Archivar más cursos con el
+mismo nombre agrega un miembro gzip al final del archivo (gzip lee los
+miembros concatenados como un solo flujo). index.json guarda, por archivo
+histórico, los conteos de cada curso, así que ubicar un curso o listar los
+archivos no requiere descomprimir nada.
+"""
+import gzip
+import json
+import os
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+INDEX_FILE = "index.json"
+# Texto descomprimido por bloque al leer un archivo histórico
+CHUNK_SIZE = 1024 * 1024
+INVALID_NAME_CHARACTERS = set('/\\:*?"<>|')
+# Comienzo de las líneas que read() decodifica aunque no coincidan con el filtro
+ALWAYS_READ = ('{"type": "course"', '{"type": "evaluation"')
+
+
+def validate_name(name):
+    if not name or name.startswith(".") or INVALID_NAME_CHARACTERS.intersection(name) or not name.isprintable():
+        raise ValueError("Nombre de archivo histórico no válido")
+
+
+class ArchiveStore:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def path(self, name):
+        return self._path(name + ARCHIVE_SUFFIX)
+
+    def index(self):
+        """{nombre: {course_id: {"name", "code", "evaluations", "enrollments", "grades"}}}"""
+        try:
+            with open(self._path(INDEX_FILE), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def locate(self, course_id):
+        """Nombre del último archivo histórico que contiene el curso, o None"""
+        found = None
+        for name, courses in self.index().items():
+            if course_id in courses:
+                found = name
+        return found
+
+    def write(self, name, courses):
+        """Agregar los registros de los cursos ({course_id: (resumen, [registro])}) a un archivo.
+
+        Los registros quedan en disco (fsync) antes de actualizar el índice; si
+        algo falla entre ambos pasos, los cursos siguen en los datos en uso y
+        archivarlos de nuevo agrega otra copia, de la que se lee la última.
+        """
+        validate_name(name)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(name), "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as file:
+                for _, records in courses.values():
+                    file.write("".join(json.dumps(record, ensure_ascii=False) + "\n"
+                                       for record in records).encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        index = self.index()
+        entry = index.setdefault(name, {})
+        for course_id, (summary, _) in courses.items():
+            entry[course_id] = summary
+        tmp_path = self._path(INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, ensure_ascii=False, indent=1)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self._path(INDEX_FILE))
+
+    def _blocks(self, name):
+        """Líneas descomprimidas por bloques (iterar la línea a línea sobre gzip es mucho más lento)"""
+        try:
+            file = gzip.open(self.path(name), "rt", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            tail = ""
+            while chunk := file.read(CHUNK_SIZE):
+                lines = (tail + chunk).split("\n")
+                tail = lines.pop()
+                yield lines
+            if tail:
+                yield [tail]
+
+    def read(self, name, field=None, value=None):
+        """Recorrer los registros de un archivo histórico (descomprimiendo en streaming).
+
+        Con field y value (por ejemplo, "student_id" y un id) solo devuelve los
+        registros con ese valor y los de cursos y evaluaciones, que dan nombre
+        a los demás. Las líneas se filtran por texto antes de decodificarlas,
+        que es lo más caro.
+        """
+        loads = json.loads
+        needle = f'"{field}": {json.dumps(value, ensure_ascii=False)}' if field is not None else ""
+        for lines in self._blocks(name):
+            for line in lines:
+                if needle not in line:
+                    if line.startswith(ALWAYS_READ):
+                        yield loads(line)
+                    continue
+                record = loads(line)
+                if field is None or record.get(field) == value or record["type"] in ("course", "evaluation"):
+                    yield record
+
+    def course_records(self, name, course_id):
+        """Registros de un curso en un archivo histórico (los de su última copia)"""
+        records = []
+        for record in self.read(name, "course_id", course_id):
+            if record["course_id"] == course_id:
+                if record["type"] == "course":
+                    records = []
+                records.append(record)
+        return records
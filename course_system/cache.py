@@ -0,0 +1,54 @@
+"""Caché LRU de reportes generados"""
+from collections import OrderedDict
+
+
+class ReportCache:
+    """LRU acotado de reportes ya generados, con contadores de aciertos, fallos y desalojos.
+
+    Cada entrada corresponde a una entidad (por ejemplo ``("student", id)``)
+    y guarda sus variantes (por ejemplo, el reporte de cada curso), de modo
+    que invalidar la entidad descarta todas sus variantes de una vez.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {clave: {variante: reporte}}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, variant=None):
+        """Reporte guardado o None; cuenta el acceso como acierto o fallo"""
+        entry = self._entries.get(key)
+        if entry is not None and variant in entry:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[variant]
+        self.misses += 1
+        return None
+
+    def put(self, key, variant, report):
+        if self.max_entries <= 0:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {}
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._entries.move_to_end(key)
+        entry[variant] = report
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._entries), "max_entries": self.max_entries}
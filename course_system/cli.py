@@ -0,0 +1,438 @@
+"""Interfaz de línea de comandos: menú, importación, exportación, archivo, changefeed y servidor HTTP"""
+import argparse
+import sys
+
+from .reports import format_archives, format_search_page
+from .storage import SQLiteStorage, TextStorage
+from .system import CourseManagementSystem
+
+
+def safe_input(prompt, input_type="str"):
+    while True:
+        try:
+            value = input(prompt)
+            if input_type == "int":
+                return int(value)
+            elif input_type == "float":
+                return float(value)
+            else:
+                return value.strip()
+        except ValueError:
+            print("Error: Ingrese un valor válido")
+        except KeyboardInterrupt:
+            print("\nOperación cancelada")
+            return None
+
+
+def parse_pairs(text, value_type=float):
+    """Convertir "clave=valor, clave=valor" en un dict (vacío si no se escribe nada)"""
+    pairs = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Se esperaba clave=valor: {item.strip()}")
+        pairs[key.strip()] = value_type(value)
+    return pairs
+
+
+SNAPSHOT_HELP = "Con archivos de texto, escribir también un snapshot binario al compactar (arranque más rápido)"
+
+
+def create_system(db_path=None, binary_snapshot=False, metrics=None):
+    """Crear el sistema con archivos de texto o, si se indica una ruta, con SQLite"""
+    if db_path:
+        return CourseManagementSystem(SQLiteStorage(db_path), metrics)
+    return CourseManagementSystem(TextStorage(binary_snapshot=binary_snapshot), metrics)
+
+
+def run_import_command(argv, metrics=None):
+    parser = argparse.ArgumentParser(prog="main.py import",
+                                     description="Importación masiva (CSV o delimitado por '|')")
+    parser.add_argument("--db", help="Usar una base de datos SQLite en lugar de los archivos de texto")
+    parser.add_argument("--users", help="Archivo con user_id, name, email, user_type")
+    parser.add_argument("--enrollments", help="Archivo con student_id, course_id")
+    parser.add_argument("--grades", help="Archivo con student_id, evaluation_id, grade")
+    parser.add_argument("--binary-snapshot", action="store_true", help=SNAPSHOT_HELP)
+    args = parser.parse_args(argv)
+
+    system = create_system(args.db, args.binary_snapshot, metrics)
+    steps = [("Usuarios", args.users, system.import_users),
+             ("Inscripciones", args.enrollments, system.import_enrollments),
+             ("Calificaciones", args.grades, system.import_grades)]
+    failed = False
+    try:
+        for label, path, importer in steps:
+            if not path:
+                continue
+            imported, errors = importer(path)
+            print(f"{label}: {imported} importados, {len(errors)} errores")
+            for row_number, message in errors:
+                print(f"  {path}:{row_number}: {message}", file=sys.stderr)
+            failed = failed or bool(errors)
+    finally:
+        system.storage.close()
+    return 1 if failed else 0
+
+
+def run_export_command(argv, metrics=None):
+    parser = argparse.ArgumentParser(prog="main.py export",
+                                     description="Exportar calificaciones en streaming (CSV o JSON Lines)")
+    parser.add_argument("--db", help="Usar una base de datos SQLite en lugar de los archivos de texto")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--gradebook", metavar="COURSE_ID", help="Libro de calificaciones de un curso")
+    target.add_argument("--transcripts", action="store_true", help="Calificaciones de todos los estudiantes")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--output", help="Archivo de salida (por defecto, la salida estándar)")
+    args = parser.parse_args(argv)
+
+    system = create_system(args.db, metrics=metrics)
+    destination = args.output or sys.stdout
+    try:
+        if args.gradebook:
+            count = system.export_gradebook(args.gradebook, destination, args.format)
+        else:
+            count = system.export_transcripts(destination, args.format)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        system.storage.close()
+    print(f"{count} filas exportadas", file=sys.stderr)
+    return 0
+
+
+def run_archive_command(argv, metrics=None):
+    parser = argparse.ArgumentParser(prog="main.py archive",
+                                     description="Archivar cursos terminados y consultar los archivos históricos")
+    parser.add_argument("--db", help="Usar una base de datos SQLite en lugar de los archivos de texto")
+    parser.add_argument("name", nargs="?", metavar="NOMBRE", help="Archivo histórico, por ejemplo 2024-1")
+    parser.add_argument("courses", nargs="*", metavar="COURSE_ID", help="Cursos a archivar")
+    parser.add_argument("--code-prefix", metavar="PREFIJO",
+                        help="Archivar también los cursos cuyo código empieza con el prefijo")
+    parser.add_argument("--list", action="store_true", help="Listar los archivos históricos")
+    parser.add_argument("--show", metavar="COURSE_ID", help="Mostrar un curso archivado")
+    args = parser.parse_args(argv)
+    if not (args.list or args.show or args.name):
+        parser.error("indique NOMBRE y los cursos, --list o --show")
+
+    system = create_system(args.db, metrics=metrics)
+    try:
+        if args.list:
+            print(format_archives(system.archives()))
+        elif args.show:
+            system.show_archived_course(args.show, args.name)
+        else:
+            courses = list(args.courses)
+            if args.code_prefix:
+                courses.extend(course.course_id for course in system.courses.values()
+                               if course.code.startswith(args.code_prefix))
+            system.archive_courses(args.name, courses)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        system.storage.close()
+    return 0
+
+
+def run_changes_command(argv, metrics=None):
+    parser = argparse.ArgumentParser(prog="main.py changes",
+                                     description="Eventos del changefeed posteriores a un offset (JSON Lines)")
+    parser.add_argument("--db", help="Usar una base de datos SQLite en lugar de los archivos de texto")
+    parser.add_argument("--since", type=int, default=0, help="Último offset ya procesado (0 = desde el inicio)")
+    parser.add_argument("--limit", type=int, help="Máximo de eventos")
+    parser.add_argument("--follow", action="store_true", help="Seguir esperando eventos nuevos (Ctrl+C para salir)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Segundos entre consultas con --follow")
+    args = parser.parse_args(argv)
+
+    import json
+    import time
+
+    system = create_system(args.db, metrics=metrics)
+    since = args.since
+    try:
+        while True:
+            for event in system.read_changes(since, args.limit):
+                print(json.dumps(event._asdict(), ensure_ascii=False), flush=True)
+                since = event.offset
+            if not args.follow:
+                break
+            time.sleep(args.interval)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        system.storage.close()
+    # El próximo --since, para continuar desde aquí
+    print(f"Último offset: {since}", file=sys.stderr)
+    return 0
+
+
+def run_serve_command(argv, metrics=None):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Servidor HTTP/JSON en localhost")
+    parser.add_argument("--db", help="Usar una base de datos SQLite en lugar de los archivos de texto")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--binary-snapshot", action="store_true", help=SNAPSHOT_HELP)
+    args = parser.parse_args(argv)
+
+    from .server import run_server  # asyncio solo se importa en modo servidor
+
+    system = create_system(args.db, args.binary_snapshot, metrics)
+    try:
+        run_server(system, args.host, args.port)
+    finally:
+        system.storage.close()
+    return 0
+
+
+def run_menu(system):
+    while True:
+        print("\n" + "=" * 40)
+        print("  SISTEMA DE GESTIÓN DE CURSOS")
+        print("=" * 40)
+        print("1. Usuarios  2. Cursos  3. Evaluaciones")
+        print("4. Reportes  5. Limpiar  6. Salir")
+
+        option = input("Opción: ")
+
+        try:
+            match option:
+                case "1":
+                    print("\n1. Registrar Estudiante  2. Registrar Instructor")
+                    print("3. Listar Usuarios  4. Listar Estudiantes  5. Listar Instructores")
+                    sub = input("Opción: ")
+                    match sub:
+                        case "1":
+                            user_id = safe_input("ID: ")
+                            if user_id is None: continue
+                            name = safe_input("Nombre: ")
+                            if name is None: continue
+                            email = safe_input("Email: ")
+                            if email is None: continue
+                            system.register_user(user_id, name, email, "estudiante")
+                        case "2":
+                            user_id = safe_input("ID: ")
+                            if user_id is None: continue
+                            name = safe_input("Nombre: ")
+                            if name is None: continue
+                            email = safe_input("Email: ")
+                            if email is None: continue
+                            system.register_user(user_id, name, email, "instructor")
+                        case "3":
+                            system.list_items("users")
+                        case "4":
+                            system.list_items("students")
+                        case "5":
+                            system.list_items("instructors")
+                        case _:
+                            print("Opción no válida. Seleccione del 1 al 5.")
+
+                case "2":
+                    print("\n1. Crear Curso  2. Inscribir Estudiante  3. Ver Detalles  4. Listar Cursos")
+                    print("5. Archivar Cursos  6. Ver Curso Archivado")
+                    sub = input("Opción: ")
+                    match sub:
+                        case "1":
+                            course_id = input("ID curso: ")
+                            name = input("Nombre: ")
+                            code = input("Código: ")
+                            instructor_id = input("ID instructor: ")
+                            system.create_course(course_id, name, code, instructor_id)
+                        case "2":
+                            student_id = input("ID estudiante: ")
+                            course_id = input("ID curso: ")
+                            system.enroll_student(student_id, course_id)
+                        case "3":
+                            course_id = input("ID curso: ")
+                            system.show_course_details(course_id)
+                        case "4":
+                            system.list_items("courses")
+                        case "5":
+                            print(format_archives(system.archives()))
+                            name = input("Archivo histórico (por ejemplo, 2024-1): ").strip()
+                            course_ids = input("IDs de cursos separados por comas: ")
+                            system.archive_courses(name, [course_id.strip() for course_id in course_ids.split(",")
+                                                          if course_id.strip()])
+                        case "6":
+                            course_id = input("ID curso: ").strip()
+                            system.show_archived_course(course_id)
+                        case _:
+                            print("Opción no válida. Seleccione del 1 al 6.")
+
+                case "3":
+                    print("\n1. Crear Evaluación  2. Registrar Calificación  3. Ver Calificaciones")
+                    print("4. Política de Calificación")
+                    sub = input("Opción: ")
+                    match sub:
+                        case "1":
+                            eval_id = input("ID evaluación: ")
+                            course_id = input("ID curso: ")
+                            name = input("Nombre: ")
+                            eval_type = safe_input("Tipo (examen/tarea): ")
+                            if eval_type is None: continue
+                            max_score = safe_input("Puntaje máximo: ", "int")
+                            if max_score is None: continue
+                            system.create_evaluation(eval_id, course_id, name, eval_type, max_score)
+                        case "2":
+                            student_id = input("ID estudiante: ")
+                            eval_id = input("ID evaluación: ")
+                            grade = float(input("Calificación: "))
+                            system.register_grade(student_id, eval_id, grade)
+                        case "3":
+                            student_id = safe_input("ID estudiante: ")
+                            if student_id is None: continue
+                            print("\n1. Ver todas las calificaciones  2. Ver calificaciones por curso")
+                            sub_op = input("Opción: ")
+                            if sub_op == "1":
+                                system.show_student_grades(student_id)
+                            elif sub_op == "2":
+                                course_id = safe_input("ID del curso: ")
+                                if course_id is None: continue
+                                system.show_student_grades(student_id, course_id)
+                            else:
+                                print("Opción no válida")
+                        case "4":
+                            course_id = safe_input("ID curso: ")
+                            if course_id is None: continue
+                            weights = parse_pairs(input("Pesos (ej. examen=0.6, tarea=0.4): "))
+                            drop_lowest = parse_pairs(input("Descartar las más bajas (ej. tarea=1, vacío = ninguna): "), int)
+                            bands = parse_pairs(input("Bandas letra=mínimo (vacío = A=90, B=80, C=70, D=60, F=0): "))
+                            system.set_grading_policy(course_id, weights, drop_lowest,
+                                                      [(minimum, letter) for letter, minimum in bands.items()] or None)
+                        case _:
+                            print("Opción no válida. Seleccione del 1 al 4.")
+
+                case "4":
+                    print("\n1. Estudiantes con bajo rendimiento")
+                    print("2. Reporte de curso")
+                    print("3. Reporte de estudiante")
+                    print("4. Buscar usuarios, cursos o evaluaciones")
+                    sub = input("Opción: ")
+                    match sub:
+                        case "1":
+                            threshold = input("Umbral (60): ")
+                            threshold = float(threshold) if threshold else 60
+                            course_id = input("ID curso (vacío = promedio general): ").strip() or None
+                            scope = f"del curso {course_id}" if course_id else "general"
+                            print(f"\nEstudiantes con promedio {scope} < {threshold}:")
+                            students = system.low_performance_students(threshold, course_id)
+                            for student, average in students:
+                                print(f"- {student.name}: {average:.1f}")
+                            if not students:
+                                print("No se encontraron estudiantes con rendimiento bajo")
+                        case "2":
+                            course_id = safe_input("ID curso: ")
+                            if course_id is None: continue
+                            system.show_course_details(course_id)
+                        case "3":
+                            student_id = safe_input("ID estudiante: ")
+                            if student_id is None: continue
+                            system.show_student_grades(student_id)
+                        case "4":
+                            query = safe_input("Buscar: ")
+                            if query is None: continue
+                            page = 1
+                            while True:
+                                results = system.search(query, page=page)
+                                print(format_search_page(results))
+                                if page * results.page_size >= results.total or \
+                                        input("¿Ver más resultados? (s/n): ").strip().lower() != "s":
+                                    break
+                                page += 1
+                        case _:
+                            print("Opción no válida. Seleccione del 1 al 4.")
+
+                case "5":
+                    confirm = input("¿Estás seguro? Escribe 'CONFIRMAR': ")
+                    if confirm == "CONFIRMAR":
+                        system.clear_all_data()
+                        print("Todos los datos eliminados")
+                    else:
+                        print("Operación cancelada")
+
+                case "6":
+                    print("¡Adiós!")
+                    break
+
+                case _:
+                    print("Opción no válida. Seleccione del 1 al 6.")
+
+        except ValueError as e:
+            print(f"Error: {e}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+
+def run_command(argv, metrics=None):
+    if argv[:1] == ["import"]:
+        return run_import_command(argv[1:], metrics)
+    if argv[:1] == ["export"]:
+        return run_export_command(argv[1:], metrics)
+    if argv[:1] == ["archive"]:
+        return run_archive_command(argv[1:], metrics)
+    if argv[:1] == ["changes"]:
+        return run_changes_command(argv[1:], metrics)
+    if argv[:1] == ["serve"]:
+        return run_serve_command(argv[1:], metrics)
+
+    parser = argparse.ArgumentParser(description="Sistema de gestión de cursos")
+    parser.add_argument("--db", help="Usar una base de datos SQLite en lugar de los archivos de texto")
+    parser.add_argument("--binary-snapshot", action="store_true", help=SNAPSHOT_HELP)
+    parser.add_argument("--profile", metavar="ARCHIVO", help="Perfilar la sesión con cProfile (.prof = datos "
+                                                             "para pstats; otro nombre = reporte de texto)")
+    parser.add_argument("--metrics", metavar="ARCHIVO", help="Medir cada operación y escritura y guardar las "
+                                                             "métricas al salir (.prom = Prometheus; otro = JSON)")
+    args = parser.parse_args(argv)
+    system = create_system(args.db, args.binary_snapshot, metrics)
+    try:
+        run_menu(system)
+    finally:
+        system.storage.close()
+    return 0
+
+
+def run_profiled(path, command, *args):
+    """Ejecutar command(*args) bajo cProfile y guardar el perfil al terminar"""
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(command, *args)
+    finally:
+        if path.endswith(".prof"):
+            profiler.dump_stats(path)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                stats = pstats.Stats(profiler, stream=file)
+                stats.sort_stats("cumulative").print_stats(60)
+                stats.sort_stats("tottime").print_stats(30)
+        print(f"Perfil guardado en {path}", file=sys.stderr)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # --profile y --metrics valen para el menú y para cualquier subcomando
+    options = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    options.add_argument("--profile")
+    options.add_argument("--metrics")
+    known, argv = options.parse_known_args(argv)
+
+    metrics = None
+    if known.metrics:
+        from .metrics import Metrics
+
+        metrics = Metrics()
+    try:
+        if known.profile:
+            return run_profiled(known.profile, run_command, argv, metrics)
+        return run_command(argv, metrics)
+    finally:
+        if metrics is not None:
+            metrics.dump(known.metrics, "prometheus" if known.metrics.endswith(".prom") else "json")
+            print(f"Métricas guardadas en {known.metrics}", file=sys.stderr)
@@ -0,0 +1,197 @@
+"""Eventos de cambio: suscriptores en el proceso y changefeed JSON Lines con offsets.
+
+Cada modificación del sistema produce un ChangeEvent con un tipo de
+EVENT_TYPES y sus datos (los mismos campos que el registro que se guardó). Los
+eventos se publican recién cuando la operación quedó persistida, así que un
+suscriptor nunca ve un cambio que no se guardó.
+
+El changefeed (changes.jsonl junto a los datos) numera los eventos con offsets
+crecientes, también entre procesos (se escribe con el lock del almacenamiento
+tomado). Un consumidor guarda el último offset que procesó y con
+read_changes(offset) obtiene solo lo nuevo, sin volver a leer los datos: la
+búsqueda del offset es binaria sobre el archivo. El changefeed no hace fsync
+propio: ante una caída del sistema operativo puede perder los últimos eventos,
+pero nunca registra uno que no se guardó.
+
+Cada suscriptor tiene una cola acotada. Publicar nunca espera: si la cola está
+llena el evento se descarta y se cuenta en Subscription.dropped; el suscriptor
+recupera lo perdido leyendo el changefeed desde el último offset que procesó.
+"""
+import json
+import os
+import queue
+from collections import namedtuple
+
+# Bytes leídos por bloque al recorrer el changefeed
+READ_CHUNK_SIZE = 1024 * 1024
+
+ChangeEvent = namedtuple("ChangeEvent", "offset type time data")
+
+# {tipo de registro del almacenamiento: (tipo de evento, campos de data en orden)}
+RECORD_EVENTS = {
+    "U": ("user_registered", ("user_id", "name", "email", "user_type")),
+    "C": ("course_created", ("course_id", "name", "code", "instructor_id")),
+    "E": ("evaluation_created", ("evaluation_id", "name", "course_id", "evaluation_type", "max_score")),
+    "P": ("grading_policy_set", ("course_id", "weights", "drop_lowest", "bands")),
+    "N": ("student_enrolled", ("student_id", "course_id")),
+    "G": ("grade_registered", ("student_id", "course_id", "evaluation_id", "grade")),
+}
+DATA_CLEARED = "data_cleared"  # data: {}
+COURSES_ARCHIVED = "courses_archived"  # data: {"archive", "course_ids"}
+EVENT_TYPES = frozenset([event_type for event_type, _ in RECORD_EVENTS.values()] + [DATA_CLEARED, COURSES_ARCHIVED])
+
+
+def record_event(kind, fields):
+    """(tipo, data) del evento que corresponde a un registro (tipo, campos) del almacenamiento"""
+    event_type, names = RECORD_EVENTS[kind]
+    return event_type, dict(zip(names, fields))
+
+
+class Subscription:
+    """Cola acotada de eventos de un suscriptor (se consume desde cualquier hilo)"""
+
+    def __init__(self, maxsize=1024, types=None):
+        if types is not None:
+            types = frozenset(types)
+            if not types <= EVENT_TYPES:
+                raise ValueError(f"Tipos de evento no válidos: {', '.join(sorted(types - EVENT_TYPES))}")
+        self.types = types
+        self.dropped = 0  # Eventos descartados por tener la cola llena
+        self.last_dropped = None  # Offset del último evento descartado
+        self._queue = queue.Queue(maxsize)
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def offer(self, events):
+        """Encolar los eventos que le interesan sin esperar nunca (los que no caben se descartan)"""
+        for event in events:
+            if self.types is not None and event.type not in self.types:
+                continue
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+                self.last_dropped = event.offset
+
+    def get(self, timeout=None):
+        """Próximo evento, esperando hasta timeout segundos (None = sin límite); None si no llegó ninguno"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        """Todos los eventos encolados, sin esperar"""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class ChangeFeed:
+    """Archivo JSON Lines de eventos con offsets crecientes.
+
+    append() debe llamarse con el lock del almacenamiento tomado; read() no lo
+    necesita (ignora una última línea a medio escribir).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._size = None  # Tamaño del archivo después de la última escritura de este proceso
+        self._last_offset = 0
+
+    def _open(self):
+        """Abrir en modo append, descartando una línea final incompleta"""
+        file = open(self.path, "ab+")
+        if file.seek(0, os.SEEK_END):
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                file.seek(0)
+                file.truncate(file.read().rfind(b"\n") + 1)
+                file.seek(0, os.SEEK_END)
+        return file
+
+    def _read_last_offset(self, file, size):
+        """Offset de la última línea del archivo (0 si está vacío)"""
+        block = 4096
+        while True:
+            start = max(0, size - block)
+            file.seek(start)
+            data = file.read(size - start)
+            lines = data.rstrip(b"\n").rsplit(b"\n", 1)
+            if len(lines) == 2 or start == 0:
+                return json.loads(lines[-1])["offset"] if lines[-1] else 0
+            block *= 2
+
+    def last_offset(self):
+        """Offset del último evento registrado (de cualquier proceso)"""
+        try:
+            with open(self.path, "rb") as file:
+                return self._read_last_offset(file, file.seek(0, os.SEEK_END))
+        except FileNotFoundError:
+            return 0
+
+    def append(self, event_time, events):
+        """Registrar [(tipo, data)] y devolverlos como ChangeEvent con sus offsets"""
+        # Se abre en cada escritura: no queda un descriptor abierto por sistema creado
+        with self._open() as file:
+            size = file.tell()
+            if size != self._size:
+                # Otro proceso escribió (o se truncó una línea incompleta) desde nuestra última escritura
+                self._last_offset = self._read_last_offset(file, size)
+                file.seek(0, os.SEEK_END)
+            result = [ChangeEvent(offset, event_type, event_time, data)
+                      for offset, (event_type, data) in enumerate(events, self._last_offset + 1)]
+            file.write("".join(json.dumps(event._asdict(), ensure_ascii=False) + "\n"
+                               for event in result).encode("utf-8"))
+            self._size = file.tell()
+        self._last_offset = result[-1].offset
+        return result
+
+    def _line_at(self, file, position):
+        """(inicio, offset) de la primera línea completa que empieza en position o después"""
+        file.seek(max(position - 1, 0))
+        if position:
+            file.readline()  # El resto de la línea que contiene position - 1
+        start = file.tell()
+        line = file.readline()
+        if not line.endswith(b"\n"):
+            return start, None
+        return start, json.loads(line)["offset"]
+
+    def read(self, since=0, limit=None):
+        """Eventos con offset mayor que since, en orden (como mucho limit)"""
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return []
+        events = []
+        with file:
+            # Búsqueda binaria de la primera línea con offset > since
+            low, high = 0, file.seek(0, os.SEEK_END)
+            while low < high:
+                middle = (low + high) // 2
+                start, offset = self._line_at(file, middle)
+                if offset is None or offset > since:
+                    high = middle
+                else:
+                    low = start + 1
+            start, _ = self._line_at(file, low)
+            file.seek(start)
+            tail = b""
+            while limit is None or len(events) < limit:
+                chunk = file.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break  # Lo que quede en tail es una línea a medio escribir
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                if limit is not None:
+                    del lines[limit - len(events):]
+                if lines:
+                    # Un solo json.loads por bloque en vez de uno por línea
+                    events.extend(ChangeEvent(event["offset"], event["type"], event["time"], event["data"])
+                                  for event in json.loads(b"[" + b",".join(lines) + b"]"))
+        return events
@@ -0,0 +1,141 @@
+"""Políticas de calificación y notas finales ponderadas mantenidas de forma incremental"""
+import bisect
+
+EVALUATION_TYPES = ("examen", "tarea")
+DEFAULT_BANDS = ((90.0, "A"), (80.0, "B"), (70.0, "C"), (60.0, "D"), (0.0, "F"))
+
+
+def percent(grade, max_score):
+    return grade / max_score * 100 if max_score else 0.0
+
+
+class GradingPolicy:
+    """Pesos por tipo de evaluación, descarte de las N notas más bajas y bandas de letras.
+
+    Cada calificación se normaliza a porcentaje con el max_score de su
+    evaluación; por tipo se promedian los porcentajes (tras descartar los
+    drop_lowest[tipo] más bajos, dejando siempre al menos uno) y la nota final
+    es el promedio ponderado de los tipos en los que hay calificaciones.
+    """
+
+    __slots__ = ("weights", "drop_lowest", "bands")
+
+    def __init__(self, weights=None, drop_lowest=None, bands=None):
+        self.weights = dict(weights) if weights is not None else {evaluation_type: 1.0
+                                                                    for evaluation_type in EVALUATION_TYPES}
+        self.drop_lowest = dict(drop_lowest or {})
+        # Bandas ordenadas de mayor a menor porcentaje mínimo
+        self.bands = tuple(sorted(((float(minimum), letter) for minimum, letter in (bands or DEFAULT_BANDS)),
+                                  reverse=True))
+        self._validate()
+
+    def _validate(self):
+        for evaluation_type, weight in self.weights.items():
+            if evaluation_type not in EVALUATION_TYPES:
+                raise ValueError(f"Tipo de evaluación no válido: {evaluation_type}")
+            if weight < 0:
+                raise ValueError("Los pesos no pueden ser negativos")
+        if not any(self.weights.values()):
+            raise ValueError("Al menos un tipo de evaluación debe tener peso")
+        for evaluation_type, count in self.drop_lowest.items():
+            if evaluation_type not in EVALUATION_TYPES:
+                raise ValueError(f"Tipo de evaluación no válido: {evaluation_type}")
+            if count < 0:
+                raise ValueError("La cantidad de notas a descartar no puede ser negativa")
+        if not self.bands or self.bands[-1][0] > 0:
+            raise ValueError("Las bandas deben cubrir desde 0%")
+        for _, letter in self.bands:
+            if not letter or any(char in letter for char in "|,:\r\n"):
+                raise ValueError(f"Letra no válida: {letter!r}")
+
+    def type_average(self, evaluation_type, percents):
+        """Promedio de una lista ordenada de porcentajes tras descartar los más bajos"""
+        dropped = min(self.drop_lowest.get(evaluation_type, 0), len(percents) - 1)
+        kept = percents[dropped:] if dropped > 0 else percents
+        return sum(kept) / len(kept)
+
+    def final_grade(self, percents_by_type):
+        """(porcentaje, letra) a partir de {tipo: porcentajes ordenados}; None sin notas con peso"""
+        total = 0.0
+        weight_sum = 0.0
+        for evaluation_type, percents in percents_by_type.items():
+            weight = self.weights.get(evaluation_type, 0)
+            if percents and weight:
+                total += weight * self.type_average(evaluation_type, percents)
+                weight_sum += weight
+        if not weight_sum:
+            return None
+        value = total / weight_sum
+        return value, self.letter(value)
+
+    def letter(self, value):
+        for minimum, letter in self.bands:
+            if value >= minimum:
+                return letter
+        return self.bands[-1][1]
+
+    def to_fields(self):
+        """Campos para el almacenamiento: pesos, descartes y bandas como texto"""
+        return (",".join(f"{evaluation_type}:{weight}" for evaluation_type, weight in self.weights.items()),
+                ",".join(f"{evaluation_type}:{count}" for evaluation_type, count in self.drop_lowest.items()),
+                ",".join(f"{minimum}:{letter}" for minimum, letter in self.bands))
+
+    @classmethod
+    def from_fields(cls, weights, drop_lowest, bands):
+        def pairs(text):
+            return [item.split(":", 1) for item in text.split(",") if item]
+
+        return cls({evaluation_type: float(weight) for evaluation_type, weight in pairs(weights)},
+                   {evaluation_type: int(count) for evaluation_type, count in pairs(drop_lowest)},
+                   [(float(minimum), letter) for minimum, letter in pairs(bands)])
+
+
+# Política de los cursos que no definen una: mismo peso para exámenes y tareas
+DEFAULT_POLICY = GradingPolicy()
+
+
+class CourseFinalGrades:
+    """Notas finales de un curso, actualizadas con cada calificación.
+
+    Por estudiante se guardan los porcentajes de cada tipo de evaluación en
+    listas ordenadas (bisect), así que registrar o corregir una nota solo
+    recalcula la nota final de ese estudiante.
+    """
+
+    __slots__ = ("policy", "_percents", "grades")
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._percents = {}  # {student_id: {tipo: [porcentajes ordenados]}}
+        self.grades = {}  # {student_id: (porcentaje, letra)}
+
+    def build(self, entries):
+        """Carga inicial desde (student_id, tipo, porcentaje): ordena una vez por lista"""
+        for student_id, evaluation_type, value in entries:
+            percents_by_type = self._percents.get(student_id)
+            if percents_by_type is None:
+                percents_by_type = self._percents[student_id] = {}
+            percents_by_type.setdefault(evaluation_type, []).append(value)
+        final_grade = self.policy.final_grade
+        for student_id, percents_by_type in self._percents.items():
+            for percents in percents_by_type.values():
+                percents.sort()
+            final = final_grade(percents_by_type)
+            if final is not None:
+                self.grades[student_id] = final
+
+    def update(self, student_id, evaluation_type, previous_percent, value):
+        percents_by_type = self._percents.get(student_id)
+        if percents_by_type is None:
+            percents_by_type = self._percents[student_id] = {}
+        percents = percents_by_type.get(evaluation_type)
+        if percents is None:
+            percents = percents_by_type[evaluation_type] = []
+        if previous_percent is not None:
+            del percents[bisect.bisect_left(percents, previous_percent)]
+        bisect.insort(percents, value)
+        final = self.policy.final_grade(percents_by_type)
+        if final is None:
+            self.grades.pop(student_id, None)
+        else:
+            self.grades[student_id] = final
@@ -0,0 +1,102 @@
+"""Estadísticas vectorizadas por curso. Requiere numpy (dependencia opcional)."""
+import warnings
+
+import numpy as np
+
+
+class GradeMatrix:
+    """Calificaciones de un curso en formato columnar (estudiantes x evaluaciones).
+
+    Las celdas sin calificación quedan marcadas como ausentes en la máscara
+    ``present``.
+    """
+
+    def __init__(self, evaluations):
+        self.evaluation_ids = [evaluation.evaluation_id for evaluation in evaluations]
+        self.max_scores = np.array([evaluation.max_score for evaluation in evaluations], dtype=float)
+        self._columns = {eval_id: j for j, eval_id in enumerate(self.evaluation_ids)}
+        self.student_ids = []
+        self._rows = {}
+        rows, columns, grades = [], [], []
+        for column, evaluation in enumerate(evaluations):
+            for student_id, grade in evaluation.grades.items():
+                row = self._rows.get(student_id)
+                if row is None:
+                    row = self._rows[student_id] = len(self.student_ids)
+                    self.student_ids.append(student_id)
+                rows.append(row)
+                columns.append(column)
+                grades.append(grade)
+        shape = (max(16, len(self.student_ids)), len(self.evaluation_ids))
+        self._values = np.zeros(shape)
+        self._present = np.zeros(shape, dtype=bool)
+        self._values[rows, columns] = grades
+        self._present[rows, columns] = True
+
+    def _row(self, student_id):
+        row = self._rows.get(student_id)
+        if row is None:
+            row = len(self.student_ids)
+            if row == len(self._values):
+                # Crecer al doble para que agregar estudiantes sea O(1) amortizado
+                self._values = np.concatenate([self._values, np.zeros_like(self._values)])
+                self._present = np.concatenate([self._present, np.zeros_like(self._present)])
+            self._rows[student_id] = row
+            self.student_ids.append(student_id)
+        return row
+
+    def set_grade(self, student_id, eval_id, grade):
+        row = self._row(student_id)
+        column = self._columns[eval_id]
+        self._values[row, column] = grade
+        self._present[row, column] = True
+
+    @property
+    def values(self):
+        return self._values[:len(self.student_ids)]
+
+    @property
+    def present(self):
+        return self._present[:len(self.student_ids)]
+
+    def _masked(self):
+        return np.where(self.present, self.values, np.nan)
+
+    def evaluation_statistics(self, percentiles=(25, 50, 75, 90), bins=10):
+        """Media, mediana, desviación, percentiles e histograma de cada evaluación"""
+        data = self._masked()
+        with warnings.catch_warnings():
+            # Las evaluaciones sin calificaciones producen NaN en lugar de un resultado
+            warnings.simplefilter("ignore", RuntimeWarning)
+            counts = self.present.sum(axis=0)
+            means = np.nanmean(data, axis=0)
+            medians = np.nanmedian(data, axis=0)
+            stds = np.nanstd(data, axis=0)
+            quantiles = np.nanpercentile(data, percentiles, axis=0)
+
+        statistics = []
+        for j, eval_id in enumerate(self.evaluation_ids):
+            if not counts[j]:
+                statistics.append({"evaluation_id": eval_id, "count": 0})
+                continue
+            histogram, edges = np.histogram(data[self.present[:, j], j], bins=bins,
+                                            range=(0, self.max_scores[j] or 1))
+            statistics.append({
+                "evaluation_id": eval_id,
+                "count": int(counts[j]),
+                "mean": float(means[j]),
+                "median": float(medians[j]),
+                "std": float(stds[j]),
+                "percentiles": {p: float(quantiles[i, j]) for i, p in enumerate(percentiles)},
+                "histogram": (histogram.tolist(), edges.tolist()),
+            })
+        return statistics
+
+    def student_averages(self):
+        """Promedio de cada estudiante en porcentaje, normalizando por max_score"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                averages = np.nanmean(self._masked() / self.max_scores, axis=1) * 100
+        return {student_id: float(average)
+                for student_id, average in zip(self.student_ids, averages) if not np.isnan(average)}
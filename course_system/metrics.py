@@ -0,0 +1,198 @@
+"""Instrumentación opcional: contadores e histogramas de latencia en memoria.
+
+CourseManagementSystem(metrics=Metrics()) (o enable_metrics()) reemplaza, solo
+en esa instancia, cada método público por una versión que cuenta llamadas y
+errores y mide su duración; el backend mide cada archivo que escribe. Sin
+métricas no se instala nada, así que el costo desactivado es nulo.
+
+Los tiempos son inclusivos: register_grade también cuenta lo que tardó la
+carga diferida que haya disparado (que además se mide como load_*).
+"""
+import bisect
+import functools
+import json
+import time
+
+# Límites superiores (segundos) de los intervalos de los histogramas de latencia
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+OPERATIONS = "course_system_operations_total"
+OPERATION_ERRORS = "course_system_operation_errors_total"
+OPERATION_SECONDS = "course_system_operation_seconds"
+FILE_WRITE_SECONDS = "course_system_file_write_seconds"
+DESCRIPTIONS = {
+    OPERATIONS: "Llamadas a cada operación",
+    OPERATION_ERRORS: "Llamadas que terminaron con una excepción",
+    OPERATION_SECONDS: "Duración de cada operación",
+    FILE_WRITE_SECONDS: "Duración de cada escritura a disco por archivo",
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "total")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # El último intervalo es +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self):
+        """[(límite, observaciones <= límite)] como en los histogramas de Prometheus"""
+        result = []
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+class Timer:
+    """Context manager que registra en un histograma el tiempo transcurrido"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Contadores e histogramas identificados por nombre y etiquetas ((clave, valor), ...)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}  # {(nombre, etiquetas): valor}
+        self._histograms = {}  # {(nombre, etiquetas): Histogram}
+
+    def increment(self, name, labels=(), value=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def histogram(self, name, labels=()):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def observe(self, name, labels, seconds):
+        self.histogram(name, labels).observe(seconds)
+
+    def timer(self, name, labels=()):
+        return Timer(self.histogram(name, labels))
+
+    def file_timer(self, filename):
+        """Medir una escritura a disco (journal, archivo base, snapshot o transacción)"""
+        return self.timer(FILE_WRITE_SECONDS, (("file", filename),))
+
+    def instrument(self, operation, function):
+        """Envolver una función para contar sus llamadas y errores y medir su duración"""
+        labels = (("operation", operation),)
+        calls_key = (OPERATIONS, labels)
+        errors_key = (OPERATION_ERRORS, labels)
+        histogram = self.histogram(OPERATION_SECONDS, labels)
+        counters = self._counters
+        counters.setdefault(calls_key, 0)
+        counters.setdefault(errors_key, 0)
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            counters[calls_key] += 1
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                counters[errors_key] += 1
+                raise
+            finally:
+                histogram.observe(clock() - start)
+        return wrapper
+
+    def reset(self):
+        for key in self._counters:
+            self._counters[key] = 0
+        for histogram in self._histograms.values():
+            histogram.counts = [0] * len(histogram.counts)
+            histogram.count = 0
+            histogram.total = 0.0
+
+    def _series(self):
+        """Contadores e histogramas a volcar, omitiendo las operaciones que nunca se llamaron"""
+        histograms = {key: histogram for key, histogram in self._histograms.items() if histogram.count}
+        observed = {labels for _, labels in histograms}
+        counters = {key: value for key, value in self._counters.items() if value or key[1] in observed}
+        return counters, histograms
+
+    def to_dict(self):
+        """Contadores e histogramas como dicts y listas (para JSON)"""
+        counters, histograms = self._series()
+        return {
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in counters.items()],
+            "histograms": [{"name": name, "labels": dict(labels), "count": histogram.count,
+                            "sum": histogram.total,
+                            "buckets": {_format_bound(bound): count for bound, count in histogram.cumulative()}}
+                           for (name, labels), histogram in histograms.items()],
+        }
+
+    def to_prometheus(self):
+        """Formato de texto de exposición de Prometheus"""
+        counters, histograms = self._series()
+        lines = []
+        described = set()
+
+        def header(name, metric_type):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+        def label_text(labels, extra=()):
+            pairs = [*labels, *extra]
+            return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}" if pairs else ""
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{label_text(labels)} {value}")
+        for (name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+            header(name, "histogram")
+            for bound, count in histogram.cumulative():
+                lines.append(f"{name}_bucket{label_text(labels, [('le', _format_bound(bound))])} {count}")
+            lines.append(f"{name}_sum{label_text(labels)} {histogram.total!r}")
+            lines.append(f"{name}_count{label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, destination, export_format="json"):
+        """Escribir las métricas en una ruta o archivo abierto ("json" o "prometheus")"""
+        if export_format == "json":
+            text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2) + "\n"
+        elif export_format == "prometheus":
+            text = self.to_prometheus()
+        else:
+            raise ValueError(f"Formato no válido: {export_format}")
+        if isinstance(destination, str):
+            with open(destination, "w", encoding="utf-8") as file:
+                file.write(text)
+        else:
+            destination.write(text)
@@ -0,0 +1,321 @@
+"""Modelo de dominio: usuarios, cursos, evaluaciones y el almacén de calificaciones"""
+import sys
+from array import array
+from collections.abc import Mapping
+
+
+MISSING = float("nan")
+
+
+class GradeStore:
+    """Almacén compartido de calificaciones, guardadas una sola vez.
+
+    Por curso se mantiene un índice {student_id: fila} y, por evaluación, una
+    columna array('d') con una celda por fila (NaN = sin calificación).
+    Student.grades y Evaluation.grades son vistas sobre estas columnas.
+    """
+
+    __slots__ = ("_courses",)
+
+    def __init__(self):
+        self._courses = {}  # {course_id: CourseGrades}
+
+    def set(self, student_id, course_id, eval_id, grade):
+        """Guardar una calificación y devolver la anterior (o None)"""
+        course = self._courses.get(course_id)
+        if course is None:
+            course = self._courses[course_id] = CourseGrades()
+        row = course.rows.get(student_id)
+        if row is None:
+            row = course.rows[student_id] = len(course.rows)
+            for column in course.columns.values():
+                column.append(MISSING)
+        column = course.columns.get(eval_id)
+        if column is None:
+            column = course.columns[eval_id] = array("d", [MISSING]) * len(course.rows)
+            course.counts[eval_id] = 0
+        previous = column[row]
+        column[row] = grade
+        if previous != previous:  # NaN: la celda estaba vacía
+            course.counts[eval_id] += 1
+            return None
+        return previous
+
+    def get(self, student_id, course_id, eval_id, default=None):
+        course = self._courses.get(course_id)
+        return default if course is None else course.get(student_id, eval_id, default)
+
+    def student_course_grades(self, student_id, course_id):
+        """{eval_id: grade} de un estudiante en un curso"""
+        course = self._courses.get(course_id)
+        return {} if course is None else course.student_grades(student_id)
+
+    def course(self, course_id):
+        return self._courses.get(course_id)
+
+    def courses(self):
+        """Pares (course_id, CourseGrades) en el orden en que se crearon"""
+        return self._courses.items()
+
+    def load_course(self, course_id, student_ids, columns):
+        """Crear el bloque de un curso a partir de columnas ya armadas.
+
+        columns: [(eval_id, calificaciones registradas, columna)] con una celda
+        por estudiante. La columna es un array('d'), que se usa sin copiar, o
+        bytes de float64 (por ejemplo desde un snapshot binario).
+        """
+        course = self._courses[course_id] = CourseGrades()
+        course.rows = dict(zip(student_ids, range(len(student_ids))))
+        for eval_id, count, data in columns:
+            if isinstance(data, array):
+                column = data
+            else:
+                column = array("d")
+                column.frombytes(data)
+            course.columns[eval_id] = column
+            course.counts[eval_id] = count
+        return course
+
+    def iter_grades(self):
+        """Recorrer todas las calificaciones como (student_id, course_id, eval_id, grade)"""
+        for course_id, course in self._courses.items():
+            for student_id, eval_id, grade in course.iter_grades():
+                yield student_id, course_id, eval_id, grade
+
+    __iter__ = iter_grades
+
+    def remove_course(self, course_id):
+        return self._courses.pop(course_id, None)
+
+
+class CourseGrades:
+    """Bloque columnar de calificaciones de un curso dentro de GradeStore"""
+
+    __slots__ = ("rows", "columns", "counts")
+
+    def __init__(self):
+        self.rows = {}  # {student_id: fila}
+        self.columns = {}  # {eval_id: array('d')}
+        self.counts = {}  # {eval_id: calificaciones registradas}
+
+    def get(self, student_id, eval_id, default=None):
+        row = self.rows.get(student_id)
+        column = self.columns.get(eval_id)
+        if row is None or column is None:
+            return default
+        grade = column[row]
+        return default if grade != grade else grade
+
+    def student_grades(self, student_id):
+        row = self.rows.get(student_id)
+        if row is None:
+            return {}
+        grades = {}
+        for eval_id, column in self.columns.items():
+            grade = column[row]
+            if grade == grade:
+                grades[eval_id] = grade
+        return grades
+
+    def iter_grades(self):
+        for eval_id, column in self.columns.items():
+            for student_id, row in self.rows.items():
+                grade = column[row]
+                if grade == grade:
+                    yield student_id, eval_id, grade
+
+
+class EvaluationGrades(Mapping):
+    """Vista {student_id: grade} de una evaluación sobre el GradeStore"""
+
+    __slots__ = ("_store", "_course_id", "_eval_id")
+
+    def __init__(self, store, course_id, eval_id):
+        self._store = store
+        self._course_id = course_id
+        self._eval_id = eval_id
+
+    def _column(self):
+        course = self._store.course(self._course_id)
+        if course is None or self._eval_id not in course.columns:
+            return None, None
+        return course, course.columns[self._eval_id]
+
+    def __getitem__(self, student_id):
+        grade = self._store.get(student_id, self._course_id, self._eval_id)
+        if grade is None:
+            raise KeyError(student_id)
+        return grade
+
+    def __iter__(self):
+        course, column = self._column()
+        if column is None:
+            return
+        for student_id, row in course.rows.items():
+            if column[row] == column[row]:
+                yield student_id
+
+    def __len__(self):
+        course, column = self._column()
+        return 0 if column is None else course.counts[self._eval_id]
+
+    def items(self):
+        course, column = self._column()
+        if column is None:
+            return []
+        return [(student_id, column[row]) for student_id, row in course.rows.items()
+                if column[row] == column[row]]
+
+    def values(self):
+        return [grade for _, grade in self.items()]
+
+
+class User:
+    __slots__ = ("_user_id", "_name", "_email", "_user_type")
+
+    def __init__(self, user_id, name, email, user_type):
+        self._user_id = sys.intern(user_id)
+        self._name = name
+        self._email = email
+        self._user_type = user_type
+
+    @property
+    def user_id(self):
+        return self._user_id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def email(self):
+        return self._email
+
+    @property
+    def user_type(self):
+        return self._user_type
+
+    def __str__(self):
+        return f"{self._name} - {self._email} - {self._user_type}"
+
+
+class Student(User):
+    __slots__ = ("_enrolled_courses", "_store", "_course_totals", "_total_sum", "_total_count")
+
+    def __init__(self, user_id, name, email, store=None):
+        super().__init__(user_id, name, email, "estudiante")
+        self._enrolled_courses = {}  # Conjunto ordenado {course_id: None}
+        # Las calificaciones viven en el GradeStore compartido con las evaluaciones
+        self._store = store if store is not None else GradeStore()
+        # Acumulados para obtener los promedios en O(1)
+        self._course_totals = {}  # {course_id: [suma, cantidad]}
+        self._total_sum = 0
+        self._total_count = 0
+
+    @property
+    def enrolled_courses(self):
+        return self._enrolled_courses.keys()
+
+    @property
+    def graded_courses(self):
+        """Cursos en los que el estudiante tiene al menos una calificación"""
+        return self._course_totals.keys()
+
+    @property
+    def grades(self):
+        """{course_id: {eval_id: grade}}, construido a partir del GradeStore"""
+        return {course_id: self.get_course_grades(course_id) for course_id in self._course_totals}
+
+    def get_course_grades(self, course_id):
+        """Obtener las calificaciones de un curso específico"""
+        return self._store.student_course_grades(self._user_id, course_id)
+
+    def add_grade(self, course_id, eval_id, grade):
+        """Agregar (o reemplazar) una calificación, actualizar los acumulados y devolver la anterior"""
+        previous = self._store.set(self._user_id, course_id, eval_id, grade)
+        totals = self._course_totals.get(course_id)
+        if totals is None:
+            totals = self._course_totals[course_id] = [0, 0]
+        if previous is None:
+            totals[1] += 1
+            self._total_count += 1
+        else:
+            totals[0] -= previous
+            self._total_sum -= previous
+        totals[0] += grade
+        self._total_sum += grade
+        return previous
+
+    def remove_course(self, course_id):
+        """Quitar la inscripción y los acumulados de un curso (sus notas se quitan del GradeStore)"""
+        self._enrolled_courses.pop(course_id, None)
+        totals = self._course_totals.pop(course_id, None)
+        if totals is not None:
+            self._total_count -= totals[1]
+            # Sin calificaciones restantes, evitar que quede el error de redondeo de las restas
+            self._total_sum = self._total_sum - totals[0] if self._total_count else 0
+
+    def get_course_average(self, course_id):
+        """Calcular el promedio de un curso específico"""
+        totals = self._course_totals.get(course_id)
+        if not totals or not totals[1]:
+            return 0
+        return totals[0] / totals[1]
+
+    def get_overall_average(self):
+        """Calcular el promedio general de todos los cursos"""
+        if not self._total_count:
+            return 0
+        return self._total_sum / self._total_count
+
+
+class Instructor(User):
+    __slots__ = ("_taught_courses",)
+
+    def __init__(self, user_id, name, email):
+        super().__init__(user_id, name, email, "instructor")
+        self._taught_courses = []
+
+    @property
+    def taught_courses(self):
+        return self._taught_courses
+
+
+class Course:
+    __slots__ = ("course_id", "name", "code", "instructor_id", "enrolled_students", "evaluations")
+
+    def __init__(self, course_id, name, code, instructor_id):
+        self.course_id = sys.intern(course_id)
+        self.name = name
+        self.code = code
+        self.instructor_id = sys.intern(instructor_id)
+        self.enrolled_students = {}  # Conjunto ordenado {student_id: None}
+        self.evaluations = []  # Lista de evaluation_ids
+
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+
+    def get_course_evaluations(self, system):
+        """Obtener objetos de evaluación del curso"""
+        course_evals = []
+        for eval_id in self.evaluations:
+            if eval_id in system.evaluations:
+                course_evals.append(system.evaluations[eval_id])
+        return course_evals
+
+
+class Evaluation:
+    __slots__ = ("evaluation_id", "course_id", "name", "evaluation_type", "max_score", "grades")
+
+    def __init__(self, evaluation_id, course_id, name, evaluation_type, max_score, store=None):
+        self.evaluation_id = sys.intern(evaluation_id)
+        self.course_id = sys.intern(course_id)
+        self.name = name
+        self.evaluation_type = evaluation_type
+        self.max_score = max_score
+        # Vista {student_id: grade}; las calificaciones se registran con Student.add_grade
+        self.grades = EvaluationGrades(store if store is not None else GradeStore(),
+                                       self.course_id, self.evaluation_id)
+
+    def __str__(self):
+        return f"{self.name} - ({self.evaluation_type}) - Max: {self.max_score}"
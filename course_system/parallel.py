@@ -0,0 +1,99 @@
+"""Resúmenes de fin de curso calculados en paralelo con un pool de procesos.
+
+A los procesos no se les envían objetos Student ni Evaluation: cada curso
+viaja como ``(course_id, filas, [(eval_id, max_score, bytes de la columna)])``,
+es decir, las columnas array('d') del GradeStore tal cual (NaN = sin nota).
+Así el costo de serializar es una copia de memoria por columna.
+"""
+import os
+from array import array
+
+
+def course_payload(course, evaluations, course_grades):
+    """Datos compactos de un curso para enviar a un proceso del pool"""
+    rows = len(course_grades.rows) if course_grades is not None else 0
+    columns = []
+    for evaluation in evaluations:
+        column = course_grades.columns.get(evaluation.evaluation_id) if course_grades is not None else None
+        columns.append((evaluation.evaluation_id, evaluation.max_score,
+                        column.tobytes() if column is not None else b""))
+    return course.course_id, rows, columns
+
+
+def histogram(values, upper, bins):
+    """Conteos en `bins` intervalos iguales de [0, upper] (el último incluye upper)"""
+    counts = [0] * bins
+    if upper <= 0:
+        counts[0] = len(values)
+        return counts
+    scale = bins / upper
+    last = bins - 1
+    for value in values:
+        index = int(value * scale)
+        counts[index if index < last else last] += 1
+    return counts
+
+
+def summarize_course(payload, pass_threshold=60.0, bins=10):
+    """Promedios, tasa de aprobación y distribuciones de un curso.
+
+    Los promedios de los estudiantes están en porcentaje (cada nota se
+    normaliza por el max_score de su evaluación), como en GradeMatrix.
+    """
+    course_id, rows, columns = payload
+    totals = [0.0] * rows
+    counts = [0] * rows
+    evaluations = []
+    for eval_id, max_score, data in columns:
+        column = array("d")
+        column.frombytes(data)
+        scale = 100.0 / max_score if max_score else 0.0
+        grades = []
+        for row, grade in enumerate(column):
+            if grade == grade:  # NaN: sin calificación
+                grades.append(grade)
+                totals[row] += grade * scale
+                counts[row] += 1
+        summary = {"evaluation_id": eval_id, "count": len(grades)}
+        if grades:
+            summary.update(mean=sum(grades) / len(grades), min=min(grades), max=max(grades),
+                           histogram=histogram(grades, max_score, bins))
+        evaluations.append(summary)
+
+    averages = [total / count for total, count in zip(totals, counts) if count]
+    result = {"course_id": course_id, "graded_students": len(averages), "evaluations": evaluations,
+              "average": None, "pass_rate": None, "distribution": histogram(averages, 100.0, bins)}
+    if averages:
+        result["average"] = sum(averages) / len(averages)
+        result["pass_rate"] = sum(1 for average in averages if average >= pass_threshold) / len(averages)
+    return result
+
+
+def summarize_courses(payloads, pass_threshold=60.0, bins=10):
+    return [summarize_course(payload, pass_threshold, bins) for payload in payloads]
+
+
+def partition(payloads, parts):
+    """Repartir los cursos en `parts` grupos de tamaño parecido (mayor primero al grupo más liviano)"""
+    groups = [[] for _ in range(parts)]
+    sizes = [0] * parts
+    for payload in sorted(payloads, key=lambda payload: payload[1] * len(payload[2]), reverse=True):
+        lightest = sizes.index(min(sizes))
+        groups[lightest].append(payload)
+        sizes[lightest] += payload[1] * len(payload[2]) + 1
+    return [group for group in groups if group]
+
+
+def summarize_all(payloads, workers=None, pass_threshold=60.0, bins=10):
+    """Resumir todos los cursos, en este proceso (workers=1) o con un ProcessPoolExecutor"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(payloads) <= 1:
+        return summarize_courses(payloads, pass_threshold, bins)
+
+    from concurrent.futures import ProcessPoolExecutor  # Solo se importa al usar el pool
+
+    # Varios grupos por proceso equilibran la carga cuando los cursos tienen tamaños distintos
+    groups = partition(payloads, min(len(payloads), workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize_courses, group, pass_threshold, bins) for group in groups]
+        return [summary for future in futures for summary in future.result()]
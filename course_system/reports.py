@@ -0,0 +1,191 @@
+"""Reportes estructurados, su formato de texto y exportadores en streaming.
+
+Los métodos de CourseManagementSystem devuelven estas tuplas con nombre
+(inmutables, así la caché puede compartirlas; namedtuple en lugar de
+dataclasses porque estas importan inspect y re al arrancar). Las funciones
+format_* producen el mismo texto que imprimía el menú y write_csv /
+write_jsonl vuelcan filas de un iterable sin materializarlas.
+"""
+from collections import namedtuple
+
+GradeEntry = namedtuple("GradeEntry", "evaluation_id name grade max_score percentage")
+# Calificaciones de un estudiante en un curso; average es None si no tiene y final_grade es
+# (porcentaje, letra) según la política de calificación del curso
+CourseGradesSummary = namedtuple("CourseGradesSummary", "course_id name grades average final_grade")
+# course_id es el curso pedido o None para el reporte completo; courses sigue el orden de inscripción
+StudentReport = namedtuple("StudentReport", "student_id name course_id courses overall_average")
+# statistics: ver GradeMatrix.evaluation_statistics (None sin numpy)
+EvaluationSummary = namedtuple("EvaluationSummary", "evaluation_id name evaluation_type max_score statistics")
+# average_percent: promedio normalizado del curso (None sin numpy o sin calificaciones);
+# final_grades: {letra: estudiantes} en el orden de las bandas de la política
+CourseReport = namedtuple("CourseReport", "course_id name code instructor_id instructor_name enrolled_count "
+                                          "evaluations average_percent final_grades")
+UserSummary = namedtuple("UserSummary", "user_id name email user_type")
+CourseSummary = namedtuple("CourseSummary", "course_id name code instructor_id instructor_name")
+# section: "users", "courses" o "evaluations"; detail: email y tipo, código o curso de la evaluación
+SearchHit = namedtuple("SearchHit", "section item_id name detail score")
+# Una página de resultados ordenados por puntaje; total cuenta todos los resultados de la consulta
+SearchPage = namedtuple("SearchPage", "query total page page_size hits")
+# Un archivo histórico (o lo agregado en una operación): course_ids y conteos de lo archivado
+ArchiveSummary = namedtuple("ArchiveSummary", "name courses evaluations enrollments grades")
+# Curso leído de un archivo histórico: evaluations son EvaluationSummary sin estadísticas, students
+# {student_id: nombre}, grades {evaluation_id: {student_id: nota}} y final_grades {student_id: (%, letra)}
+ArchivedCourse = namedtuple("ArchivedCourse", "archive course_id name code instructor_id instructor_name "
+                                              "archived_at evaluations students grades final_grades")
+ArchivedGrade = namedtuple("ArchivedGrade", "archive course_id course_name evaluation_id evaluation_name grade "
+                                            "max_score")
+
+
+def to_dict(value):
+    """Convertir un reporte (y las tuplas con nombre que contiene) en dicts y listas para JSON"""
+    if hasattr(value, "_asdict"):
+        return {name: to_dict(item) for name, item in zip(value._fields, value)}
+    if isinstance(value, (list, tuple)):
+        return [to_dict(item) for item in value]
+    return value
+
+
+def _format_grades(lines, grades):
+    for entry in grades:
+        lines.append(f"- {entry.name}: {entry.grade}/{entry.max_score} ({entry.percentage:.1f}%)")
+
+
+def _format_final_grade(lines, final_grade):
+    if final_grade is not None:
+        lines.append(f"Nota final: {final_grade[0]:.1f}% ({final_grade[1]})")
+
+
+def format_student_report(report):
+    if report.course_id is not None:
+        course = report.courses[0]
+        lines = [f"\nCalificaciones de {report.name} en {course.name}:"]
+        if course.average is None:
+            lines.append("No tiene calificaciones en este curso")
+        else:
+            _format_grades(lines, course.grades)
+            lines.append(f"Promedio del curso: {course.average:.2f}")
+            _format_final_grade(lines, course.final_grade)
+        return "\n".join(lines)
+
+    lines = [f"\nCalificaciones de {report.name}:"]
+    if report.overall_average is None:
+        lines.append("No tiene calificaciones")
+        return "\n".join(lines)
+    for course in report.courses:
+        if course.average is not None:
+            lines.append(f"\n--- {course.name} ---")
+            _format_grades(lines, course.grades)
+            lines.append(f"Promedio: {course.average:.2f}")
+            _format_final_grade(lines, course.final_grade)
+    lines.append(f"\nPromedio general: {report.overall_average:.2f}")
+    return "\n".join(lines)
+
+
+def format_course_report(report):
+    lines = [f"\nCurso: {report.name} ({report.code})",
+             f"Instructor: {report.instructor_name or 'No encontrado'}",
+             f"Estudiantes inscritos: {report.enrolled_count}",
+             f"Evaluaciones: {len(report.evaluations)}"]
+    if report.evaluations:
+        lines.append("\nEvaluaciones:")
+        for evaluation in report.evaluations:
+            lines.append(f"- {evaluation.name} ({evaluation.evaluation_type}) - Max: {evaluation.max_score}")
+
+    if any(report.final_grades.values()):
+        lines.append("Notas finales: " + ", ".join(f"{letter}={count}"
+                                                   for letter, count in report.final_grades.items()))
+
+    if not report.evaluations or report.evaluations[0].statistics is None:
+        return "\n".join(lines)
+
+    lines.append("\nEstadísticas:")
+    for evaluation in report.evaluations:
+        stats = evaluation.statistics
+        if not stats["count"]:
+            lines.append(f"- {evaluation.name}: sin calificaciones")
+            continue
+        lines.append(f"- {evaluation.name}: n={stats['count']} media={stats['mean']:.2f} "
+                     f"mediana={stats['median']:.2f} desv={stats['std']:.2f} "
+                     f"p25={stats['percentiles'][25]:.2f} p90={stats['percentiles'][90]:.2f}")
+    if report.average_percent is not None:
+        lines.append(f"Promedio normalizado del curso: {report.average_percent:.1f}%")
+    return "\n".join(lines)
+
+
+EMPTY_LISTS = {"users": "No hay usuarios registrados", "students": "No hay estudiantes registrados",
+               "instructors": "No hay instructores registrados", "courses": "No hay cursos registrados"}
+
+
+def format_items(item_type, items):
+    if not items:
+        return EMPTY_LISTS[item_type]
+    if item_type == "courses":
+        return "\n".join(f"- [{course.course_id}] {course.name} ({course.code}) - "
+                         f"{course.instructor_name or 'No encontrado'}" for course in items)
+    return "\n".join(f"- [{user.user_id}] {user.name} - {user.email} - {user.user_type}" for user in items)
+
+
+SECTION_LABELS = {"users": "Usuario", "courses": "Curso", "evaluations": "Evaluación"}
+
+
+def format_search_page(page):
+    if not page.hits:
+        return f"Sin resultados para '{page.query}'"
+    first = (page.page - 1) * page.page_size + 1
+    lines = [f"\nResultados {first}-{first + len(page.hits) - 1} de {page.total} para '{page.query}':"]
+    lines.extend(f"- {SECTION_LABELS[hit.section]} [{hit.item_id}] {hit.name} - {hit.detail}" for hit in page.hits)
+    return "\n".join(lines)
+
+
+def format_archives(archives):
+    if not archives:
+        return "No hay cursos archivados"
+    return "\n".join(f"- {archive.name}: {len(archive.courses)} cursos ({', '.join(archive.courses)}), "
+                     f"{archive.enrollments} inscripciones, {archive.grades} calificaciones"
+                     for archive in archives)
+
+
+def format_archived_course(course):
+    lines = [f"\nCurso archivado en {course.archive}: {course.name} ({course.code})",
+             f"Instructor: {course.instructor_name or 'No encontrado'}",
+             f"Estudiantes inscritos: {len(course.students)}",
+             f"Evaluaciones: {len(course.evaluations)}"]
+    for evaluation in course.evaluations:
+        grades = course.grades.get(evaluation.evaluation_id, {})
+        average = f", promedio {sum(grades.values()) / len(grades):.2f}" if grades else ""
+        lines.append(f"- {evaluation.name} ({evaluation.evaluation_type}) - Max: {evaluation.max_score}, "
+                     f"{len(grades)} calificaciones{average}")
+    if course.final_grades:
+        letters = {}
+        for _, letter in course.final_grades.values():
+            letters[letter] = letters.get(letter, 0) + 1
+        lines.append("Notas finales: " + ", ".join(f"{letter}={count}" for letter, count in letters.items()))
+    return "\n".join(lines)
+
+
+def write_csv(file, columns, rows):
+    """Escribir una cabecera y las filas del iterable, una a una"""
+    import csv
+
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(file, columns, rows):
+    """Escribir cada fila como un objeto JSON por línea"""
+    import json
+
+    count = 0
+    for row in rows:
+        file.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+EXPORT_FORMATS = {"csv": write_csv, "jsonl": write_jsonl}
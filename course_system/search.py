@@ -0,0 +1,237 @@
+"""Índice de búsqueda en memoria por prefijos y por trigramas.
+
+Cada documento (el id de un usuario, curso o evaluación, únicos entre sí) se
+indexa por las palabras de sus campos en minúsculas y sin acentos. Una palabra de
+la consulta coincide con los términos iguales y con los que empiezan por ella
+(bisect sobre la lista ordenada de términos). Si no hay ninguno, coincide con
+los términos parecidos según los trigramas que comparten, lo que tolera errores
+de tipeo. Un documento es resultado si coinciden todas las palabras, y su
+puntaje es la suma de la mejor coincidencia de cada una.
+
+Los documentos de cada término (y de cada tipo) se guardan en conjuntos. Así
+una consulta se resuelve en "niveles": conjuntos disjuntos de documentos con
+el mismo puntaje, que se combinan con uniones, diferencias e intersecciones
+de conjuntos sin recorrer los documentos uno a uno. Solo se ordenan los
+documentos del nivel que contiene la página pedida; si el nivel es un término
+completo, su orden queda guardado hasta que el término cambie.
+"""
+import bisect
+import heapq
+import itertools
+import unicodedata
+
+EXACT = 1.0
+PREFIX = 0.5  # Más hasta 0.5 según la parte del término que cubre el prefijo
+FUZZY = 0.5  # Por la similitud (Jaccard de trigramas)
+MIN_SIMILARITY = 0.4
+MIN_FUZZY_LENGTH = 3  # Palabras más cortas no se buscan por parecido
+# Términos nuevos a partir de los cuales conviene reordenar la lista en vez de insertar uno a uno
+RESORT_THRESHOLD = 64
+
+_SEPARATORS = str.maketrans({char: " " for char in "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"})
+
+
+def split_words(text):
+    """Palabras de un texto en minúsculas y sin acentos, separando letras de números.
+
+    "José.Pérez12@uni.edu" -> ["jose", "perez", "12", "uni", "edu"]
+    """
+    text = text.casefold()
+    if text.isascii():
+        words = text.translate(_SEPARATORS).split()
+    else:
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+        words = "".join(char if char.isalnum() else " " for char in text).split()
+    if all(word.isalpha() or word.isdigit() for word in words):
+        return words
+    return ["".join(run) for word in words for _, run in itertools.groupby(word, str.isdigit)]
+
+
+def trigrams(term):
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self):
+        self._postings = {}  # {término: {documentos}}
+        self._kinds = {}  # {tipo: {documentos}}
+        self._documents = {}  # {documento: (tipo, términos)}, para quitarlo o reindexarlo
+        self._terms = []  # Términos ordenados (para los prefijos)
+        self._new_terms = []  # Términos agregados que aún no están en _terms
+        self._trigrams = {}  # {trigrama: {términos}}, solo de los términos con letras
+        self._ordered = {}  # {término: documentos ordenados}, para paginar sin ordenar en cada consulta
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, document):
+        return document in self._documents
+
+    def kind(self, document):
+        return self._documents[document][0]
+
+    def add(self, document, kind, texts):
+        """Indexar (o reindexar) un documento de un tipo por las palabras de los textos"""
+        if document in self._documents:
+            self.remove(document)
+        terms = tuple(dict.fromkeys(term for text in texts for term in split_words(text)))
+        postings = self._postings
+        for term in terms:
+            self._ordered.pop(term, None)
+            documents = postings.get(term)
+            if documents is None:
+                postings[term] = {document}
+                self._new_terms.append(term)
+                if term.isalpha():
+                    for trigram in trigrams(term):
+                        self._trigrams.setdefault(trigram, set()).add(term)
+            else:
+                documents.add(document)
+        self._kinds.setdefault(kind, set()).add(document)
+        self._documents[document] = (kind, terms)
+
+    def remove(self, document):
+        if document not in self._documents:
+            return
+        kind, terms = self._documents.pop(document)
+        self._kinds[kind].discard(document)
+        for term in terms:
+            self._ordered.pop(term, None)
+            documents = self._postings[term]
+            documents.discard(document)
+            if not documents:
+                self._forget_term(term)
+
+    def _forget_term(self, term):
+        del self._postings[term]
+        if term.isalpha():
+            for trigram in trigrams(term):
+                terms = self._trigrams[trigram]
+                terms.discard(term)
+                if not terms:
+                    del self._trigrams[trigram]
+        index = bisect.bisect_left(self._terms, term)
+        if index < len(self._terms) and self._terms[index] == term:
+            del self._terms[index]
+        else:
+            self._new_terms.remove(term)
+
+    def _sorted_terms(self):
+        new_terms = self._new_terms
+        if new_terms:
+            if len(new_terms) > RESORT_THRESHOLD:
+                self._terms.extend(new_terms)
+                self._terms.sort()
+            else:
+                for term in new_terms:
+                    bisect.insort(self._terms, term)
+            new_terms.clear()
+        return self._terms
+
+    def _matching_terms(self, word):
+        """[(término, puntaje)] por prefijo o, si no hay ninguno, por parecido"""
+        terms = self._sorted_terms()
+        matches = []
+        for index in range(bisect.bisect_left(terms, word), len(terms)):
+            term = terms[index]
+            if not term.startswith(word):
+                break
+            matches.append((term, EXACT if term == word else PREFIX + PREFIX * len(word) / len(term)))
+        if matches or len(word) < MIN_FUZZY_LENGTH or not word.isalpha():
+            return matches
+
+        query = trigrams(word)
+        shared = {}
+        for trigram in query:
+            for term in self._trigrams.get(trigram, ()):
+                shared[term] = shared.get(term, 0) + 1
+        for term, count in shared.items():
+            # Cota superior de la similitud sin calcular los trigramas del término
+            if count < MIN_SIMILARITY * len(query):
+                continue
+            similarity = count / (len(query) + len(trigrams(term)) - count)
+            if similarity >= MIN_SIMILARITY:
+                matches.append((term, FUZZY * similarity))
+        return matches
+
+    def _word_levels(self, word):
+        """Niveles de una palabra: cada documento en el de su mejor coincidencia"""
+        by_score = {}
+        for term, score in self._matching_terms(word):
+            by_score.setdefault(score, []).append(term)
+        levels = []
+        previous = []
+        for score in sorted(by_score, reverse=True):
+            terms = by_score[score]
+            # Los conjuntos del índice no se modifican: una unión o una diferencia crean uno nuevo
+            documents = self._postings[terms[0]]
+            if len(terms) > 1:
+                documents = documents.union(*(self._postings[term] for term in terms[1:]))
+            if previous:
+                # Recorre solo este nivel (suele ser el más chico), sin copiar los anteriores
+                remaining = documents.difference(*previous)
+                if len(remaining) < len(documents):
+                    documents = remaining
+                    terms = ()
+            if documents:
+                levels.append((score, documents, terms[0] if len(terms) == 1 else None))
+                previous.append(documents)
+        return levels
+
+    def search(self, query, kinds=None):
+        """Niveles [(puntaje, {documentos}, término)] de mayor a menor puntaje con los documentos en los
+        que coinciden todas las palabras de la consulta; kinds (un conjunto) limita los tipos de documento.
+
+        término es el del índice cuyos documentos forman el nivel completo, o None.
+        """
+        levels = None
+        for word in dict.fromkeys(split_words(query)):
+            word_levels = self._word_levels(word)
+            if levels is None:
+                levels = word_levels
+            else:
+                # Los niveles de cada palabra son disjuntos, así que las intersecciones también
+                combined = {}
+                for score, documents, _ in levels:
+                    for word_score, word_documents, _ in word_levels:
+                        common = documents & word_documents
+                        if common:
+                            combined.setdefault(round(score + word_score, 6), []).append(common)
+                levels = [(score, sets[0] if len(sets) == 1 else set().union(*sets), None)
+                          for score, sets in sorted(combined.items(), reverse=True)]
+            if not levels:
+                return []
+        if levels is None:
+            return []
+        if kinds is not None and not kinds.issuperset(self._kinds):
+            allowed = [self._kinds[kind] for kind in kinds if kind in self._kinds]
+            levels = [(score, set().union(*(documents & kind_documents for kind_documents in allowed)), None)
+                      for score, documents, _ in levels]
+            levels = [level for level in levels if level[1]]
+        return levels
+
+    def page(self, levels, start, stop):
+        """[(documento, puntaje)] de las posiciones start a stop de un resultado de search().
+
+        El orden es por puntaje y, a igual puntaje, por documento.
+        """
+        result = []
+        position = 0
+        for score, documents, term in levels:
+            end = position + len(documents)
+            if end > start:
+                if term is not None:
+                    ordered = self._ordered.get(term)
+                    if ordered is None:
+                        ordered = self._ordered[term] = sorted(documents)
+                    ordered = ordered[:stop - position]
+                elif stop - position < len(documents):
+                    ordered = heapq.nsmallest(stop - position, documents)
+                else:
+                    ordered = sorted(documents)
+                result.extend((document, score) for document in ordered[max(start - position, 0):])
+            position = end
+            if position >= stop:
+                break
+        return result
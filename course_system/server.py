@@ -0,0 +1,300 @@
+"""Servidor HTTP/JSON (asyncio, solo biblioteca estándar) sobre CourseManagementSystem.
+
+Las lecturas se atienden directamente en el bucle de eventos. Las escrituras
+pasan por una cola que consume una única tarea escritora: agrupa las
+operaciones disponibles en un solo system.batch() (una escritura a disco por
+lote) y responde a cada cliente cuando el lote quedó persistido. Los lotes
+corren en un único hilo escritor, porque toman el lock bloqueante del
+almacenamiento; mientras tanto el bucle sigue aceptando conexiones y las
+lecturas esperan a que el lote termine.
+
+Rutas:
+    POST /users          {user_id, name, email, user_type}
+    POST /courses        {course_id, name, code, instructor_id}
+    POST /evaluations    {evaluation_id, course_id, name, evaluation_type, max_score}
+    POST /enrollments    {student_id, course_id}
+    POST /grades         {student_id, evaluation_id, grade}
+    GET  /users | /students | /instructors | /courses
+    GET  /courses/<course_id>
+    GET  /students/<student_id>/grades[?course_id=...]
+    GET  /reports/low-performance[?threshold=60&course_id=...]
+    GET  /search?q=...[&type=users|students|instructors|courses|evaluations&page=1&page_size=20]
+    GET  /archives
+    GET  /archives/courses/<course_id>[?archive=...]
+    GET  /students/<student_id>/archived-grades
+    GET  /changes[?since=0&limit=1000]   (eventos del changefeed, ver course_system.events)
+    GET  /metrics        (solo con la instrumentación activada, ver course_system.metrics)
+
+Las escrituras devuelven el mensaje que imprime la operación ({"output": ...});
+las lecturas, los reportes estructurados de course_system.reports como JSON.
+Un usuario, curso o evaluación inexistente responde 404 y los demás datos no
+válidos, 400.
+"""
+import asyncio
+import concurrent.futures
+import contextlib
+import io
+import json
+import math
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .reports import to_dict
+from .system import NotFoundError
+
+
+def finite_float(value):
+    """float() que rechaza NaN e infinitos ("nan" e "inf" son válidos para float())"""
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(value)
+    return value
+
+
+# {ruta: (método del sistema, campos del cuerpo JSON en orden)}
+WRITE_ROUTES = {
+    "/users": ("register_user", ("user_id", "name", "email", "user_type")),
+    "/courses": ("create_course", ("course_id", "name", "code", "instructor_id")),
+    "/evaluations": ("create_evaluation", ("evaluation_id", "course_id", "name", "evaluation_type", "max_score")),
+    "/enrollments": ("enroll_student", ("student_id", "course_id")),
+    "/grades": ("register_grade", ("student_id", "evaluation_id", "grade")),
+}
+# Conversión de los campos numéricos (el menú hace lo mismo con safe_input)
+FIELD_TYPES = {"max_score": int, "grade": finite_float}
+LIST_ROUTES = {"/users": "users", "/students": "students", "/instructors": "instructors", "/courses": "courses"}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY = 1024 * 1024
+# Máximo de eventos por respuesta de /changes
+CHANGES_LIMIT = 1000
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def captured(function, *args):
+    """Ejecutar una operación que informa con print() y devolver su salida"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        function(*args)
+    return output.getvalue()
+
+
+class CourseServer:
+    def __init__(self, system, host="127.0.0.1", port=8080, max_batch=256):
+        self.system = system
+        self.host = host
+        self.port = port
+        # Máximo de escrituras agrupadas en un mismo lote
+        self.max_batch = max_batch
+        self._queue = None
+        self._server = None
+        self._writer_task = None
+        # Un solo hilo para todos los lotes: las escrituras nunca corren en paralelo
+        self._executor = None
+        # Tomado por la tarea escritora durante cada lote y por las lecturas
+        self._system_lock = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._system_lock = asyncio.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="course-writer")
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Con port=0 el sistema operativo elige un puerto libre
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._writer_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._writer_task
+        self._executor.shutdown()
+
+    def _apply_batch(self, jobs):
+        """Aplicar y persistir un lote de escrituras (en un hilo del executor) y devolver sus resultados"""
+        results = []
+        try:
+            with self.system.batch():
+                for method, args, future in jobs:
+                    try:
+                        results.append((future, (200, {"output": captured(getattr(self.system, method), *args)})))
+                    except NotFoundError as e:
+                        results.append((future, (404, {"error": str(e)})))
+                    except ValueError as e:
+                        results.append((future, (400, {"error": str(e)})))
+                    except Exception as e:
+                        results.append((future, (500, {"error": str(e)})))
+        except Exception as e:
+            # Falló la persistencia del lote: ninguna operación quedó confirmada
+            results = [(future, (500, {"error": f"No se pudo guardar: {e}"})) for _, _, future in jobs]
+        return results
+
+    async def _writer(self):
+        """Única tarea que modifica el sistema: aplica y persiste las escrituras por lotes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self._queue.get()]
+            while len(jobs) < self.max_batch and not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+            # El lock del almacenamiento (flock) bloquea: fuera del bucle de eventos
+            async with self._system_lock:
+                results = await loop.run_in_executor(self._executor, self._apply_batch, jobs)
+            for future, result in results:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _write(self, path, body):
+        method, fields = WRITE_ROUTES[path]
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "El cuerpo no es JSON válido") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "El cuerpo debe ser un objeto JSON")
+        args = []
+        for field in fields:
+            if field not in data:
+                raise HTTPError(400, f"Falta el campo {field}")
+            value = data[field]
+            try:
+                args.append(FIELD_TYPES[field](value) if field in FIELD_TYPES else str(value).strip())
+            except (TypeError, ValueError):
+                raise HTTPError(400, f"Valor no válido para {field}: {value}") from None
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((method, args, future))
+        return await future
+
+    def _read(self, path, query):
+        system = self.system
+        if path in LIST_ROUTES:
+            return 200, {"items": to_dict(system.items(LIST_ROUTES[path]))}
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if len(parts) == 2 and parts[0] == "courses":
+            return 200, to_dict(system.course_report(parts[1]))
+        if len(parts) == 3 and parts[0] == "students" and parts[2] == "grades":
+            course_id = query.get("course_id", [None])[0]
+            return 200, to_dict(system.student_report(parts[1], course_id))
+        if len(parts) == 3 and parts[0] == "students" and parts[2] == "archived-grades":
+            return 200, {"grades": to_dict(system.archived_student_grades(parts[1]))}
+        if path == "/changes":
+            try:
+                since = int(query.get("since", ["0"])[0])
+                limit = int(query.get("limit", [str(CHANGES_LIMIT)])[0])
+            except ValueError:
+                raise HTTPError(400, "Offset o límite no válido") from None
+            events = system.read_changes(since, min(limit, CHANGES_LIMIT))
+            # El cliente continúa desde next_since (igual a since si no hubo eventos nuevos)
+            return 200, {"events": to_dict(events), "next_since": events[-1].offset if events else since}
+        if path == "/archives":
+            return 200, {"archives": to_dict(system.archives())}
+        if len(parts) == 3 and parts[:2] == ["archives", "courses"]:
+            return 200, to_dict(system.archived_course(parts[2], query.get("archive", [None])[0]))
+        if path == "/metrics":
+            if system.metrics is None:
+                raise HTTPError(404, "Las métricas no están activadas (--metrics)")
+            return 200, system.metrics.to_dict()
+        if path == "/search":
+            try:
+                page = int(query.get("page", ["1"])[0])
+                page_size = int(query.get("page_size", ["20"])[0])
+            except ValueError:
+                raise HTTPError(400, "Página no válida") from None
+            return 200, to_dict(system.search(query.get("q", [""])[0], query.get("type", [None])[0],
+                                              page, page_size))
+        if parts == ["reports", "low-performance"]:
+            try:
+                threshold = float(query.get("threshold", ["60"])[0])
+            except ValueError:
+                raise HTTPError(400, "Umbral no válido") from None
+            students = system.low_performance_students(threshold, query.get("course_id", [None])[0])
+            return 200, {"students": [{"student_id": student.user_id, "name": student.name, "average": average}
+                                      for student, average in students]}
+        raise HTTPError(404, "Ruta no encontrada")
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        try:
+            if method == "POST":
+                if path not in WRITE_ROUTES:
+                    raise HTTPError(404, "Ruta no encontrada")
+                return await self._write(path, body)
+            if method == "GET":
+                # Sin await dentro: una lectura no se intercala con el lote que corre en el executor
+                async with self._system_lock:
+                    return self._read(path, parse_qs(url.query))
+            raise HTTPError(405, "Método no permitido")
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except NotFoundError as e:
+            return 404, {"error": str(e)}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def _handle_connection(self, reader, writer):
+        """Atender las peticiones HTTP/1.1 de una conexión (con keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    status, payload = 413, {"error": "Cuerpo demasiado grande"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._dispatch(method, target, body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def run_server(system, host="127.0.0.1", port=8080):
+    """Atender peticiones hasta Ctrl+C"""
+    server = CourseServer(system, host, port)
+
+    async def serve():
+        await server.start()
+        print(f"Servidor escuchando en http://{server.host}:{server.port}")
+        await server.serve_forever()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve())
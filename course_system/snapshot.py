@@ -0,0 +1,333 @@
+"""Snapshot binario de todas las secciones, leído con mmap.
+
+Formato (little-endian; cada parte empieza alineada a 8 bytes):
+
+- cabecera: MAGIC, generación del journal para la que se escribió, tamaño y
+  mtime de cada archivo de texto (si se editaron a mano, el snapshot ya no
+  vale) y un directorio {parte: (offset, cantidad)};
+- tabla de strings: IDs, nombres y demás campos de texto, únicos y ordenados,
+  como offsets uint32 más los datos UTF-8 separados por "\\0";
+- users, courses, evaluations, policies y enrollments: registros de ancho
+  fijo con un uint32 (índice en la tabla de strings) por campo;
+- grades: un bloque por curso con el mismo diseño que GradeStore: filas
+  (estudiantes), suma y cantidad de notas por fila y una columna float64 por
+  evaluación (NaN = sin calificación);
+- índices para consultar sin cargar: (estudiante, bloque, fila) ordenado por
+  estudiante y, para las inscripciones, sus posiciones agrupadas por curso
+  (roster_order) con un rango (curso, inicio, cantidad) por curso. Las
+  inscripciones se guardan en el orden recibido, que conserva el orden de
+  inscripción de cada estudiante.
+"""
+import bisect
+import mmap
+import struct
+import sys
+from array import array
+
+from .models import GradeStore
+
+MAGIC = b"CURSNAP2"
+# Las columnas se leen con el orden de bytes nativo: solo se usa en máquinas little-endian
+SUPPORTED = sys.byteorder == "little" and array("I").itemsize == 4
+RECORD_SECTIONS = {"users": 4, "courses": 4, "evaluations": 5, "policies": 4, "enrollments": 2}
+PARTS = ("string_offsets", "string_data", *RECORD_SECTIONS, "grades", "grade_index", "postings", "roster_order", "rosters")
+FILE_COUNT = 6
+HEADER = struct.Struct("<8sQ" + "qq" * FILE_COUNT + "QQ" * len(PARTS))
+BLOCK_HEADER = struct.Struct("<IIII")  # curso, filas, columnas, relleno
+COLUMN_HEADER = struct.Struct("<II")  # evaluación, calificaciones registradas
+UINT = struct.Struct("<I")
+DOUBLE = struct.Struct("<d")
+
+
+class SnapshotWriter:
+    """Acumula los registros de un volcado completo y escribe el snapshot binario"""
+
+    __slots__ = ("_records", "_grades")
+
+    def __init__(self):
+        self._records = {section: [] for section in RECORD_SECTIONS}
+        self._grades = GradeStore()
+
+    def collect(self, section, records):
+        """Devolver los registros de la sección tal cual, guardándolos a medida que se recorren"""
+        if isinstance(records, GradeStore):
+            # Las columnas ya están armadas: se escriben al final sin copiarlas
+            self._grades = records
+            return records
+        return self._collect(section, records)
+
+    def _collect(self, section, records):
+        for fields in records:
+            if section == "grades":
+                student_id, course_id, eval_id, grade = fields
+                self._grades.set(student_id, course_id, eval_id, float(grade))
+            else:
+                self._records[section].append(tuple(map(str, fields)))
+            yield fields
+
+    def _string_table(self):
+        strings = set()
+        for records in self._records.values():
+            for fields in records:
+                strings.update(fields)
+        for course_id, course in self._grades.courses():
+            strings.add(course_id)
+            strings.update(course.rows)
+            strings.update(course.columns)
+        # El orden de los code points coincide con el de los bytes UTF-8: se puede buscar con bisect
+        return sorted(strings)
+
+    def write(self, file, generation, file_stats):
+        """Escribir el snapshot en un archivo binario abierto (el reemplazo atómico es del llamador)"""
+        strings = self._string_table()
+        index = {text: position for position, text in enumerate(strings)}
+        directory = {}
+
+        def part(name, count, *chunks):
+            file.write(bytes(-file.tell() % 8))
+            directory[name] = (file.tell(), count)
+            for chunk in chunks:
+                file.write(chunk)
+
+        file.write(bytes(HEADER.size))
+        data = "\0".join(strings).encode("utf-8")
+        offsets = array("I", [0])
+        for text in strings:
+            offsets.append(offsets[-1] + len(text.encode("utf-8")) + 1)
+        part("string_offsets", len(strings), offsets)
+        part("string_data", len(data), data)
+
+        # Posiciones de las inscripciones agrupadas por curso (en el orden de aparición), para
+        # indexarlas por rangos sin cambiar el orden en que se guardan
+        by_course = {}
+        for position, (_, course_id) in enumerate(self._records["enrollments"]):
+            by_course.setdefault(course_id, []).append(position)
+        roster_order = array("I")
+        rosters = []
+        for course_id, positions in by_course.items():
+            rosters.append((index[course_id], len(roster_order), len(positions)))
+            roster_order.extend(positions)
+
+        for section, records in self._records.items():
+            part(section, len(records), array("I", [index[field] for fields in records for field in fields]))
+
+        block_offsets = array("Q")
+        postings = []
+        file.write(bytes(-file.tell() % 8))
+        grades_offset = file.tell()
+        for block, (course_id, course) in enumerate(self._grades.courses()):
+            # Cada bloque mide un múltiplo de 8 bytes: los siguientes quedan alineados
+            block_offsets.append(file.tell())
+            rows = len(course.rows)
+            sums = array("d", bytes(8 * rows))
+            counts = array("I", bytes(4 * rows))
+            for column in course.columns.values():
+                for row, grade in enumerate(column):
+                    if grade == grade:
+                        sums[row] += grade
+                        counts[row] += 1
+            file.write(BLOCK_HEADER.pack(index[course_id], rows, len(course.columns), 0))
+            file.write(array("I", [index[student_id] for student_id in course.rows]))
+            file.write(counts)
+            file.write(sums)
+            for eval_id, column in course.columns.items():
+                file.write(COLUMN_HEADER.pack(index[eval_id], course.counts[eval_id]))
+                file.write(column)
+            postings.extend((index[student_id], block, row) for student_id, row in course.rows.items())
+        directory["grades"] = (grades_offset, len(block_offsets))
+        part("grade_index", len(block_offsets), block_offsets)
+
+        postings.sort()
+        part("postings", len(postings), *(array("I", [posting[i] for posting in postings]) for i in range(3)))
+        part("roster_order", len(roster_order), roster_order)
+        rosters.sort()
+        part("rosters", len(rosters), *(array("I", [roster[i] for roster in rosters]) for i in range(3)))
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, generation, *file_stats,
+                               *(value for name in PARTS for value in directory[name])))
+
+
+class BinarySnapshot:
+    """Snapshot binario mapeado en memoria.
+
+    records() y grade_blocks() sirven para la carga completa; student_grades,
+    course_grades y course_roster leen directamente del archivo mapeado, sin
+    construir objetos por cada calificación del snapshot.
+    """
+
+    __slots__ = ("_file", "_map", "generation", "file_stats", "_parts", "_strings", "_blocks")
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Archivo vacío
+            self._file.close()
+            raise ValueError("Snapshot binario vacío") from None
+        if not SUPPORTED or len(self._map) < HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("Snapshot binario no válido")
+        header = HEADER.unpack_from(self._map)
+        self.generation = header[1]
+        self.file_stats = header[2:2 + 2 * FILE_COUNT]
+        directory = header[2 + 2 * FILE_COUNT:]
+        self._parts = {name: (directory[2 * i], directory[2 * i + 1]) for i, name in enumerate(PARTS)}
+        self._strings = None
+        self._blocks = None  # {índice del curso: offset del bloque}, solo para consultas
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _uint(self, part, position):
+        return UINT.unpack_from(self._map, self._parts[part][0] + 4 * position)[0]
+
+    def _array(self, typecode, offset, count):
+        values = array(typecode)
+        with memoryview(self._map) as view:
+            values.frombytes(view[offset:offset + values.itemsize * count])
+        return values
+
+    def strings(self):
+        """Toda la tabla de strings decodificada de una vez (para la carga completa)"""
+        if self._strings is None:
+            offset, size = self._parts["string_data"]
+            self._strings = self._map[offset:offset + size].decode("utf-8").split("\0") if size else []
+        return self._strings
+
+    def _string(self, position):
+        if self._strings is not None:
+            return self._strings[position]
+        start, end = struct.unpack_from("<II", self._map, self._parts["string_offsets"][0] + 4 * position)
+        data = self._parts["string_data"][0]
+        return self._map[data + start:data + end - 1].decode("utf-8")
+
+    def _lookup(self, text):
+        """Índice de un string en la tabla (búsqueda binaria sobre el archivo) o None"""
+        key = text.encode("utf-8")
+        count = self._parts["string_offsets"][1]
+        offsets = self._parts["string_offsets"][0]
+        data = self._parts["string_data"][0]
+
+        def entry(position):
+            start, end = struct.unpack_from("<II", self._map, offsets + 4 * position)
+            return self._map[data + start:data + end - 1]
+
+        position = bisect.bisect_left(range(count), key, key=entry)
+        return position if position < count and entry(position) == key else None
+
+    def records(self, section):
+        """Registros de una sección como tuplas de strings, en el orden en que se escribieron"""
+        offset, count = self._parts[section]
+        field_count = RECORD_SECTIONS[section]
+        strings = self.strings()
+        values = [strings[position] for position in self._array("I", offset, count * field_count)]
+        return zip(*[iter(values)] * field_count)
+
+    def _block(self, offset):
+        """(curso, filas, columnas) y offsets de estudiantes, cantidades, sumas y primera columna"""
+        course, rows, columns, _ = BLOCK_HEADER.unpack_from(self._map, offset)
+        students = offset + BLOCK_HEADER.size
+        counts = students + 4 * rows
+        sums = counts + 4 * rows
+        return course, rows, columns, students, counts, sums, sums + 8 * rows
+
+    def grade_blocks(self):
+        """Bloques (course_id, student_ids, cantidades, sumas, [(eval_id, cantidad, columna)]).
+
+        Las columnas son vistas de solo lectura sobre el archivo mapeado (bytes
+        de float64, NaN = sin nota): quien las use debe copiarlas antes de cerrar.
+        """
+        strings = self.strings()
+        blocks = []
+        offset, count = self._parts["grade_index"]
+        view = memoryview(self._map)
+        for block_offset in self._array("Q", offset, count):
+            course, rows, column_count, students, counts, sums, column = self._block(block_offset)
+            columns = []
+            for _ in range(column_count):
+                eval_id, graded = COLUMN_HEADER.unpack_from(self._map, column)
+                start = column + COLUMN_HEADER.size
+                columns.append((strings[eval_id], graded, view[start:start + 8 * rows]))
+                column = start + 8 * rows
+            blocks.append((strings[course], [strings[position] for position in self._array("I", students, rows)],
+                           self._array("I", counts, rows), self._array("d", sums, rows), columns))
+        return blocks
+
+    def grade_records(self):
+        """Calificaciones como (student_id, course_id, eval_id, grade), igual que GradeStore.iter_grades"""
+        for course_id, student_ids, _, _, columns in self.grade_blocks():
+            for eval_id, _, data in columns:
+                column = array("d")
+                column.frombytes(data)
+                data.release()
+                for row, grade in enumerate(column):
+                    if grade == grade:
+                        yield student_ids[row], course_id, eval_id, grade
+
+    def _block_offset(self, course_id):
+        if self._blocks is None:
+            offset, count = self._parts["grade_index"]
+            self._blocks = {BLOCK_HEADER.unpack_from(self._map, block_offset)[0]: block_offset
+                            for block_offset in self._array("Q", offset, count)}
+        position = self._lookup(course_id)
+        return None if position is None else self._blocks.get(position)
+
+    def _columns(self, column, column_count, rows):
+        for _ in range(column_count):
+            eval_id, _ = COLUMN_HEADER.unpack_from(self._map, column)
+            yield eval_id, column + COLUMN_HEADER.size
+            column += COLUMN_HEADER.size + 8 * rows
+
+    def student_grades(self, student_id):
+        """Lista de (course_id, evaluation_id, grade) de un estudiante"""
+        position = self._lookup(student_id)
+        if position is None:
+            return []
+        count = self._parts["postings"][1]
+        grades = []
+        index = bisect.bisect_left(range(count), position, key=lambda i: self._uint("postings", i))
+        while index < count and self._uint("postings", index) == position:
+            block = self._uint("postings", count + index)
+            row = self._uint("postings", 2 * count + index)
+            block_offset = struct.unpack_from("<Q", self._map, self._parts["grade_index"][0] + 8 * block)[0]
+            course, rows, column_count, _, _, _, column = self._block(block_offset)
+            course_id = self._string(course)
+            for eval_id, data in self._columns(column, column_count, rows):
+                grade = DOUBLE.unpack_from(self._map, data + 8 * row)[0]
+                if grade == grade:
+                    grades.append((course_id, self._string(eval_id), grade))
+            index += 1
+        return grades
+
+    def course_grades(self, course_id):
+        """Lista de (student_id, evaluation_id, grade) de un curso"""
+        block_offset = self._block_offset(course_id)
+        if block_offset is None:
+            return []
+        _, rows, column_count, students, _, _, column = self._block(block_offset)
+        student_ids = [self._string(position) for position in self._array("I", students, rows)]
+        grades = []
+        with memoryview(self._map) as view:
+            for eval_id, data in self._columns(column, column_count, rows):
+                evaluation_id = self._string(eval_id)
+                with view[data:data + 8 * rows].cast("d") as column_view:
+                    grades.extend((student_ids[row], evaluation_id, grade)
+                                  for row, grade in enumerate(column_view) if grade == grade)
+        return grades
+
+    def course_roster(self, course_id):
+        """Lista de student_id inscritos en un curso"""
+        position = self._lookup(course_id)
+        count = self._parts["rosters"][1]
+        if position is None:
+            return []
+        index = bisect.bisect_left(range(count), position, key=lambda i: self._uint("rosters", i))
+        if index == count or self._uint("rosters", index) != position:
+            return []
+        start = self._uint("rosters", count + index)
+        size = self._uint("rosters", 2 * count + index)
+        enrollments = self._parts["enrollments"][0]
+        return [self._string(UINT.unpack_from(self._map, enrollments + 8 * position)[0])
+                for position in self._array("I", self._parts["roster_order"][0] + 4 * start, size)]
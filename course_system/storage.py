@@ -0,0 +1,678 @@
+"""Backends de persistencia: archivos de texto con journal y SQLite"""
+import contextlib
+import itertools
+import os
+
+try:
+    import fcntl
+except ImportError:  # Sin flock (Windows): un solo proceso por directorio de datos
+    fcntl = None
+
+
+class StorageBackend:
+    """Interfaz de persistencia usada por CourseManagementSystem.
+
+    Los datos viajan como registros ``(tipo, campos)`` con los tipos "U"
+    (usuario), "C" (curso), "E" (evaluación), "P" (política de calificación),
+    "N" (inscripción) y "G" (calificación); los campos siguen el mismo orden
+    que las columnas de los archivos de texto.
+    """
+
+    # Los backends que pueden responder consultas sin cargar todo en memoria
+    supports_queries = False
+    # Metrics opcional (ver course_system.metrics): duración de cada escritura por archivo
+    metrics = None
+    # Directorio de los archivos históricos (ver course_system.archive); None si no se puede archivar
+    archive_directory = None
+    # Archivo del changefeed (ver course_system.events); None si no se registran los eventos en disco
+    changefeed_path = None
+
+    def _timed_write(self, filename):
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.file_timer(filename)
+
+    def reset(self):
+        """Olvidar el estado de lectura para volver a cargar desde el almacenamiento"""
+
+    def locked(self):
+        """Context manager que excluye a los demás procesos mientras se modifica el almacenamiento"""
+        return contextlib.nullcontext()
+
+    def changes(self):
+        """Registros (tipo, campos) escritos por otros procesos desde la última lectura.
+
+        Solo incluye los tipos de las secciones ya leídas con iter_records; el
+        resto queda pendiente para cuando se lean. Devuelve None si el
+        almacenamiento se reemplazó (snapshot o clear ajenos) y hay que volver a
+        cargarlo completo. Debe llamarse con locked() tomado.
+        """
+        return []
+
+    def iter_records(self, section):
+        """Recorrer los campos de cada registro de una sección ("users", "courses", ...)"""
+        raise NotImplementedError
+
+    def iter_record_columns(self, section):
+        """Los registros de iter_records por lotes, cada lote como una tupla por campo.
+
+        Para la carga masiva: quien consume puede armar diccionarios y columnas
+        con zip/map sobre el lote entero en vez de desarmar registro por registro.
+        """
+        for batch in batched(self.iter_records(section)):
+            yield tuple(zip(*batch))
+
+    def grade_blocks(self):
+        """Calificaciones por curso ya en columnas, o None si hay que leerlas con iter_records.
+
+        Cada bloque es (course_id, student_ids, cantidades, sumas, [(eval_id,
+        cantidad, columna)]) como en BinarySnapshot.grade_blocks. Si devuelve
+        bloques, iter_records("grades") solo recorre lo registrado después.
+        """
+        return None
+
+    def append(self, records):
+        """Persistir una lista de registros (tipo, campos) como una sola operación.
+
+        Devuelve False si el backend prefiere un volcado completo con snapshot().
+        """
+        raise NotImplementedError
+
+    def snapshot(self, sections):
+        """Reemplazar todo el contenido por {sección: iterable de campos}"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def student_grades(self, student_id):
+        """Lista de (course_id, evaluation_id, grade) de un estudiante"""
+        raise NotImplementedError
+
+    def course_grades(self, course_id):
+        """Lista de (student_id, evaluation_id, grade) de un curso"""
+        raise NotImplementedError
+
+    def course_roster(self, course_id):
+        """Lista de student_id inscritos en un curso"""
+        raise NotImplementedError
+
+    def is_enrolled(self, student_id, course_id):
+        """Si el estudiante está inscrito en el curso, sin cargar las inscripciones"""
+        raise NotImplementedError
+
+
+class FileLock:
+    """Lock exclusivo entre procesos con flock sobre un archivo auxiliar"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            # Cerrar el descriptor libera el lock
+            self._file.close()
+            self._file = None
+
+
+def batched(records, size=10_000):
+    """Agrupar un iterable de registros en listas de hasta size elementos"""
+    records = iter(records)
+    while batch := list(itertools.islice(records, size)):
+        yield batch
+
+
+SECTIONS = ["users", "courses", "evaluations", "policies", "enrollments", "grades"]
+SECTION_KINDS = {"users": "U", "courses": "C", "evaluations": "E", "policies": "P", "enrollments": "N",
+                 "grades": "G"}
+FIELD_COUNTS = {"U": 4, "C": 4, "E": 5, "P": 4, "N": 2, "G": 4}
+
+
+class TextStorage(StorageBackend):
+    """Archivos base delimitados por "|" más un journal de operaciones append-only.
+
+    Con binary_snapshot, save_data escribe además un snapshot binario
+    (snapshot.bin, ver course_system.snapshot). Al cargar se prefiere ese
+    snapshot mientras siga vigente: escrito para la generación actual del
+    journal y sin cambios posteriores en los archivos de texto.
+    """
+
+    DATA_FILES = {"users": "users.txt", "courses": "courses.txt", "evaluations": "evaluations.txt",
+                  "policies": "policies.txt", "enrollments": "enrollments.txt", "grades": "grades.txt"}
+    JOURNAL_FILE = "journal.txt"
+    SNAPSHOT_FILE = "snapshot.bin"
+    LOCK_FILE = "cursos.lock"
+    # Tamaño (en bytes) a partir del cual el journal se compacta en los archivos base
+    journal_threshold = 4 * 1024 * 1024
+    # Tamaño de los bloques leídos al cargar los archivos base
+    CHUNK_SIZE = 1024 * 1024
+
+    ARCHIVE_DIRECTORY = "archive"
+    CHANGEFEED_FILE = "changes.jsonl"
+
+    def __init__(self, directory=".", binary_snapshot=False):
+        self.directory = directory
+        self.binary_snapshot = binary_snapshot
+        self.archive_directory = os.path.join(directory, self.ARCHIVE_DIRECTORY)
+        self.changefeed_path = os.path.join(directory, self.CHANGEFEED_FILE)
+        self._journal = None
+        self._journal_backlog = None  # {tipo de registro: [campos]} pendientes de aplicar
+        self._taken = set()  # Tipos de registro cuyas secciones ya se leyeron
+        # Versión de lo leído: generación del journal (cambia con cada snapshot) y bytes consumidos
+        self._generation = None
+        self._position = 0
+        self._snapshot = None  # BinarySnapshot vigente abierto al empezar a leer
+        self._snapshot_grades_taken = False
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def reset(self):
+        self.close()
+        self._journal_backlog = None
+        self._taken = set()
+
+    @property
+    def supports_queries(self):
+        """Con un snapshot binario vigente y sin calificaciones ni inscripciones en el journal"""
+        self._start_reading()
+        return (self._snapshot is not None
+                and "G" not in self._journal_backlog and "N" not in self._journal_backlog)
+
+    def locked(self):
+        return FileLock(self._path(self.LOCK_FILE))
+
+    def _read_lines(self, filename):
+        """Leer un archivo en bloques grandes y devolver sus líneas por lotes"""
+        with open(self._path(filename), "r", encoding="utf-8") as file:
+            tail = ""
+            while chunk := file.read(self.CHUNK_SIZE):
+                lines = (tail + chunk).split("\n")
+                tail = lines.pop()
+                yield lines
+            if tail:
+                yield [tail]
+
+    def iter_records(self, section):
+        kind = SECTION_KINDS[section]
+        field_count = FIELD_COUNTS[kind]
+        # El journal (y su generación) se lee antes que el archivo base: si un snapshot ajeno
+        # ocurre entre ambas lecturas, el cambio de generación se detecta en changes()
+        journal_records = self._take_journal_records(kind)
+        if self._snapshot is not None:
+            if section != "grades":
+                yield from self._snapshot.records(section)
+            elif not self._snapshot_grades_taken:
+                yield from self._snapshot.grade_records()
+            yield from journal_records
+            return
+        try:
+            for lines in self._read_lines(self.DATA_FILES[section]):
+                for line in lines:
+                    fields = line.split("|")
+                    if len(fields) == field_count:
+                        yield fields
+        except FileNotFoundError:
+            pass
+        yield from journal_records
+
+    def iter_record_columns(self, section):
+        if self._snapshot is not None:
+            yield from super().iter_record_columns(section)
+            return
+        field_count = FIELD_COUNTS[SECTION_KINDS[section]]
+        journal_records = self._take_journal_records(SECTION_KINDS[section])
+        try:
+            for lines in self._read_lines(self.DATA_FILES[section]):
+                fields = "|".join(lines).split("|")
+                # Ningún campo puede contener '|', así que ninguna línea tiene campos de más: si el
+                # total cuadra, todas están completas y alcanza con un solo split por bloque
+                if len(fields) == field_count * len(lines):
+                    yield tuple(fields[i::field_count] for i in range(field_count))
+                else:
+                    batch = [fields for line in lines if len(fields := line.split("|")) == field_count]
+                    if batch:
+                        yield tuple(zip(*batch))
+        except FileNotFoundError:
+            pass
+        for batch in batched(journal_records):
+            yield tuple(zip(*batch))
+
+    @staticmethod
+    def _journal_generation(journal):
+        """Generación anotada en la cabecera del journal (0 si no tiene)"""
+        journal.seek(0)
+        header = journal.readline()
+        if header.startswith(b"V|") and header.endswith(b"\n"):
+            return int(header[2:-1])
+        return 0
+
+    def _read_journal(self, journal):
+        """Leer los registros completos del journal desde la posición ya consumida"""
+        journal.seek(self._position)
+        data = journal.read()
+        # Una línea sin salto final es una escritura incompleta (caída o append en curso)
+        end = data.rfind(b"\n") + 1
+        self._position += end
+        records = []
+        for line in data[:end].decode("utf-8").split("\n")[:-1]:
+            kind, _, rest = line.partition("|")
+            records.append((kind, rest.split("|")))
+        return records
+
+    def _start_reading(self):
+        """Leer el journal y elegir la fuente de los datos base la primera vez que hacen falta"""
+        if self._journal_backlog is not None:
+            return
+        self._journal_backlog = {}
+        self._position = 0
+        try:
+            with open(self._path(self.JOURNAL_FILE), "rb") as journal:
+                self._generation = self._journal_generation(journal)
+                records = self._read_journal(journal)
+        except FileNotFoundError:
+            self._generation = 0
+            records = []
+        for record_kind, fields in records:
+            self._journal_backlog.setdefault(record_kind, []).append(fields)
+        self._snapshot = self._open_snapshot()
+        self._snapshot_grades_taken = False
+
+    def _data_file_stats(self):
+        """(tamaño, mtime en ns) de cada archivo base, -1 si no existe"""
+        stats = []
+        for section in SECTIONS:
+            try:
+                stat = os.stat(self._path(self.DATA_FILES[section]))
+            except FileNotFoundError:
+                stats.extend((-1, -1))
+            else:
+                stats.extend((stat.st_size, stat.st_mtime_ns))
+        return tuple(stats)
+
+    def _open_snapshot(self):
+        """El snapshot binario si existe y está vigente, o None para leer los archivos de texto"""
+        path = self._path(self.SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return None
+        from .snapshot import BinarySnapshot  # Solo se importa si hay un snapshot binario
+
+        try:
+            snapshot = BinarySnapshot(path)
+        except (OSError, ValueError):
+            return None
+        if snapshot.generation != self._generation or snapshot.file_stats != self._data_file_stats():
+            snapshot.close()
+            return None
+        return snapshot
+
+    def _close_snapshot(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def grade_blocks(self):
+        self._start_reading()
+        if self._snapshot is None or "G" in self._taken:
+            return None
+        self._snapshot_grades_taken = True
+        return self._snapshot.grade_blocks()
+
+    def student_grades(self, student_id):
+        return self._snapshot.student_grades(student_id)
+
+    def course_grades(self, course_id):
+        return self._snapshot.course_grades(course_id)
+
+    def course_roster(self, course_id):
+        return self._snapshot.course_roster(course_id)
+
+    def is_enrolled(self, student_id, course_id):
+        return student_id in self._snapshot.course_roster(course_id)
+
+    def _take_journal_records(self, kind):
+        """Devolver (y descartar) los registros del journal de un tipo aún no aplicados"""
+        self._start_reading()
+        self._taken.add(kind)
+        return [fields for fields in self._journal_backlog.pop(kind, [])
+                if len(fields) == FIELD_COUNTS[kind]]
+
+    def changes(self):
+        if self._journal_backlog is None:
+            # Todavía no se leyó nada: la primera carga verá el estado actual
+            return []
+        try:
+            journal = open(self._path(self.JOURNAL_FILE), "rb")
+        except FileNotFoundError:
+            return [] if self._generation == 0 and self._position == 0 else None
+        with journal:
+            if (self._journal_generation(journal) != self._generation
+                    or journal.seek(0, os.SEEK_END) < self._position):
+                return None
+            records = self._read_journal(journal)
+        changes = []
+        for kind, fields in records:
+            if len(fields) != FIELD_COUNTS.get(kind):
+                continue
+            if kind in self._taken:
+                changes.append((kind, fields))
+            else:
+                self._journal_backlog.setdefault(kind, []).append(fields)
+        return changes
+
+    def _open_journal(self):
+        """Abrir el journal en modo append, descartando un registro final incompleto"""
+        journal = open(self._path(self.JOURNAL_FILE), "ab+")
+        if journal.seek(0, os.SEEK_END):
+            journal.seek(-1, os.SEEK_END)
+            if journal.read(1) != b"\n":
+                journal.seek(0)
+                journal.truncate(journal.read().rfind(b"\n") + 1)
+                journal.seek(0, os.SEEK_END)
+        return journal
+
+    def append(self, records):
+        """Agregar los registros al journal con un solo fsync"""
+        if self._journal is None:
+            self._journal = self._open_journal()
+        data = "".join("|".join([kind, *map(str, fields)]) + "\n" for kind, fields in records).encode("utf-8")
+        if self._journal.tell() + len(data) >= self.journal_threshold:
+            # El journal terminaría en una compactación: escribir directamente los archivos base
+            return False
+        with self._timed_write(self.JOURNAL_FILE):
+            self._journal.write(data)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        self._position = self._journal.tell()
+        if self._journal_backlog is not None:
+            for kind, fields in records:
+                if kind not in self._taken:
+                    # Sección todavía sin leer: su carga tiene que ver también lo escrito por este proceso
+                    self._journal_backlog.setdefault(kind, []).append(list(map(str, fields)))
+        return True
+
+    def _write_snapshot(self, writer, generation):
+        """Escribir el snapshot binario para `generation` con los archivos base ya escritos"""
+        path = self._path(self.SNAPSHOT_FILE)
+        tmp_path = path + ".tmp"
+        with self._timed_write(self.SNAPSHOT_FILE):
+            with open(tmp_path, "wb") as file:
+                writer.write(file, generation, self._data_file_stats())
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, path)
+
+    def _remove_snapshot(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path(self.SNAPSHOT_FILE))
+
+    def _write_atomic(self, filename, lines):
+        """Escribir un archivo completo en un temporal y reemplazar el original"""
+        path = self._path(filename)
+        tmp_path = path + ".tmp"
+        with self._timed_write(filename):
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.writelines(lines)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, path)
+
+    def _next_generation(self):
+        try:
+            with open(self._path(self.JOURNAL_FILE), "rb") as journal:
+                return self._journal_generation(journal) + 1
+        except FileNotFoundError:
+            return 1
+
+    def _new_generation(self):
+        """Reemplazar el journal por uno vacío con la generación siguiente"""
+        # Todo lo leído ya está en memoria: también se cierra el snapshot binario, si había
+        self.close()
+        generation = self._next_generation()
+        header = "V|%d\n" % generation
+        self._write_atomic(self.JOURNAL_FILE, [header])
+        self._generation = generation
+        self._position = len(header)
+
+    def snapshot(self, sections):
+        """Compactar: escribir los archivos base y empezar un journal de nueva generación"""
+        writer = None
+        if self.binary_snapshot:
+            from .snapshot import SUPPORTED, SnapshotWriter
+
+            writer = SnapshotWriter() if SUPPORTED else None
+        for section, records in sections.items():
+            line_format = "|".join(["%s"] * FIELD_COUNTS[SECTION_KINDS[section]]) + "\n"
+            if writer is not None:
+                records = writer.collect(section, records)
+            self._write_atomic(self.DATA_FILES[section], (line_format % tuple(fields) for fields in records))
+        # El snapshot binario se escribe después de los archivos base (guarda su tamaño y mtime)
+        # y antes del journal: nadie lo ve vigente hasta que exista la nueva generación
+        if writer is not None:
+            self._write_snapshot(writer, self._next_generation())
+        else:
+            self._remove_snapshot()
+        # Los archivos base ya contienen todo lo registrado en el journal
+        self._new_generation()
+
+    def clear(self):
+        self._remove_snapshot()
+        for filename in self.DATA_FILES.values():
+            self._write_atomic(filename, [])
+        self._new_generation()
+        self._journal_backlog = {}
+        self._taken = set(SECTION_KINDS.values())
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self._close_snapshot()
+
+
+class SQLiteStorage(StorageBackend):
+    """Base de datos SQLite (modo WAL) con una transacción por operación.
+
+    Cada append registra también sus registros en la tabla changes (una fila
+    por registro, numeradas con seq). Los demás procesos leen solo las filas
+    nuevas de esa tabla para ponerse al día, como con el journal de texto. Un
+    snapshot o clear incrementa la generación en meta y vacía changes, y los
+    demás procesos vuelven a cargar. Las filas viejas se descartan cuando
+    superan CHANGE_LOG_LIMIT; un proceso que quedó más atrás también vuelve a
+    cargar.
+    """
+
+    supports_queries = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id TEXT PRIMARY KEY, name TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE, user_type TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS courses (
+            course_id TEXT PRIMARY KEY, name TEXT NOT NULL,
+            code TEXT NOT NULL UNIQUE, instructor_id TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS evaluations (
+            evaluation_id TEXT PRIMARY KEY, name TEXT NOT NULL, course_id TEXT NOT NULL,
+            evaluation_type TEXT NOT NULL, max_score INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS evaluations_course ON evaluations (course_id);
+        CREATE TABLE IF NOT EXISTS policies (
+            course_id TEXT PRIMARY KEY, weights TEXT NOT NULL,
+            drop_lowest TEXT NOT NULL, bands TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS enrollments (
+            student_id TEXT NOT NULL, course_id TEXT NOT NULL,
+            UNIQUE (student_id, course_id));
+        CREATE INDEX IF NOT EXISTS enrollments_course ON enrollments (course_id);
+        CREATE TABLE IF NOT EXISTS grades (
+            student_id TEXT NOT NULL, course_id TEXT NOT NULL,
+            evaluation_id TEXT NOT NULL, grade REAL NOT NULL,
+            UNIQUE (student_id, evaluation_id));
+        CREATE INDEX IF NOT EXISTS grades_course ON grades (course_id);
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL,
+            f1, f2, f3, f4, f5);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO meta VALUES ('generation', 0), ('pruned', 0);
+    """
+    COLUMNS = {
+        "users": "user_id, name, email, user_type",
+        "courses": "course_id, name, code, instructor_id",
+        "evaluations": "evaluation_id, name, course_id, evaluation_type, max_score",
+        "policies": "course_id, weights, drop_lowest, bands",
+        "enrollments": "student_id, course_id",
+        "grades": "student_id, course_id, evaluation_id, grade",
+    }
+    INSERTS = {
+        "U": "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)",
+        "C": "INSERT OR REPLACE INTO courses VALUES (?, ?, ?, ?)",
+        "E": "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)",
+        "P": "INSERT OR REPLACE INTO policies VALUES (?, ?, ?, ?)",
+        "N": "INSERT OR IGNORE INTO enrollments VALUES (?, ?)",
+        # Actualizar en el lugar conserva el orden de inserción de las calificaciones
+        "G": "INSERT INTO grades VALUES (?, ?, ?, ?) "
+             "ON CONFLICT (student_id, evaluation_id) DO UPDATE SET grade = excluded.grade",
+    }
+    # Filas de changes que se conservan (al superarlas se descarta la mitad más vieja)
+    CHANGE_LOG_LIMIT = 100_000
+
+    def __init__(self, path="cursos.db"):
+        import sqlite3  # Solo se paga al usar este backend
+
+        self.path = path
+        if path != ":memory:":
+            self.archive_directory = path + ".archive"
+            self.changefeed_path = path + ".changes.jsonl"
+        # La conexión se usa desde más de un hilo (el servidor persiste los lotes en un hilo
+        # escritor), pero nunca a la vez: todo acceso ocurre con el sistema sincronizado
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.executescript(self.SCHEMA)
+        self._data_version = None
+        # Versión de lo leído: generación de meta y última fila de changes ya considerada
+        self._generation = None
+        self._seq = 0
+        self._read_marks = {}  # {tipo de registro: última fila de changes incluida al leer su sección}
+
+    def _log_position(self):
+        """(generación, última fila de changes, última fila descartada)"""
+        generation, pruned = (value for _, value in self._connection.execute(
+            "SELECT key, value FROM meta WHERE key IN ('generation', 'pruned') ORDER BY key"))
+        seq = self._connection.execute("SELECT coalesce(max(seq), 0) FROM changes").fetchone()[0]
+        return generation, max(seq, pruned), pruned
+
+    def reset(self):
+        # data_version cambia cuando otra conexión confirma una transacción
+        self._data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        self._generation, self._seq, _ = self._log_position()
+        self._read_marks = {}
+
+    def locked(self):
+        if self.path == ":memory:":
+            return contextlib.nullcontext()
+        return FileLock(self.path + ".lock")
+
+    def changes(self):
+        data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return []
+        self._data_version = data_version
+        generation, seq, pruned = self._log_position()
+        if generation != self._generation or pruned > self._seq:
+            # Otro proceso reemplazó los datos o se descartaron filas que no leímos
+            return None
+        changes = []
+        for row in self._connection.execute(
+                "SELECT seq, kind, f1, f2, f3, f4, f5 FROM changes WHERE seq > ? ORDER BY seq", (self._seq,)):
+            kind = row[1]
+            # Las secciones todavía no leídas ya traerán la fila al leer su tabla
+            if row[0] > self._read_marks.get(kind, seq):
+                changes.append((kind, row[2:2 + FIELD_COUNTS[kind]]))
+        self._seq = seq
+        return changes
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._timed_write(os.path.basename(self.path)):
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def iter_records(self, section):
+        # Una transacción de lectura: la tabla y la marca en changes corresponden al mismo estado
+        self._connection.execute("BEGIN")
+        try:
+            self._read_marks[SECTION_KINDS[section]] = self._connection.execute(
+                "SELECT coalesce(max(seq), 0) FROM changes").fetchone()[0]
+            yield from self._connection.execute(f"SELECT {self.COLUMNS[section]} FROM {section} ORDER BY rowid")
+        finally:
+            self._connection.execute("COMMIT")
+
+    def append(self, records):
+        with self._transaction() as connection:
+            for kind, group in itertools.groupby(records, key=lambda record: record[0]):
+                connection.executemany(self.INSERTS[kind], (fields for _, fields in group))
+            connection.executemany("INSERT INTO changes (kind, f1, f2, f3, f4, f5) VALUES (?, ?, ?, ?, ?, ?)",
+                                   ((kind, *fields, *[None] * (5 - len(fields))) for kind, fields in records))
+            # Con el lock tomado ya estábamos al día: lo propio no vuelve como cambio ajeno
+            self._seq = connection.execute("SELECT max(seq) FROM changes").fetchone()[0]
+            oldest = connection.execute("SELECT min(seq) FROM changes").fetchone()[0]
+            if self._seq - oldest >= self.CHANGE_LOG_LIMIT:
+                pruned = self._seq - self.CHANGE_LOG_LIMIT // 2
+                connection.execute("DELETE FROM changes WHERE seq <= ?", (pruned,))
+                connection.execute("UPDATE meta SET value = ? WHERE key = 'pruned'", (pruned,))
+        return True
+
+    def _replaced(self, connection):
+        """Nueva generación: los demás procesos vuelven a cargar en vez de leer changes"""
+        connection.execute("DELETE FROM changes")
+        connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        self._generation, self._seq, _ = self._log_position()
+
+    def snapshot(self, sections):
+        with self._transaction() as connection:
+            for section, records in sections.items():
+                connection.execute(f"DELETE FROM {section}")
+                connection.executemany(self.INSERTS[SECTION_KINDS[section]], records)
+            self._replaced(connection)
+
+    def clear(self):
+        with self._transaction() as connection:
+            for section in SECTIONS:
+                connection.execute(f"DELETE FROM {section}")
+            self._replaced(connection)
+
+    def close(self):
+        self._connection.close()
+
+    def student_grades(self, student_id):
+        return self._connection.execute(
+            "SELECT course_id, evaluation_id, grade FROM grades WHERE student_id = ? ORDER BY rowid",
+            (student_id,)).fetchall()
+
+    def course_grades(self, course_id):
+        return self._connection.execute(
+            "SELECT student_id, evaluation_id, grade FROM grades WHERE course_id = ? ORDER BY rowid",
+            (course_id,)).fetchall()
+
+    def course_roster(self, course_id):
+        return [student_id for student_id, in self._connection.execute(
+            "SELECT student_id FROM enrollments WHERE course_id = ? ORDER BY rowid", (course_id,))]
+
+    def is_enrolled(self, student_id, course_id):
+        return self._connection.execute(
+            "SELECT 1 FROM enrollments WHERE student_id = ? AND course_id = ?",
+            (student_id, course_id)).fetchone() is not None
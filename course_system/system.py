@@ -0,0 +1,1416 @@
+"""CourseManagementSystem: reglas de negocio, índices y reportes sobre un backend"""
+import bisect
+import contextlib
+import functools
+import math
+import os
+import time
+import types
+from array import array
+
+from .cache import ReportCache
+from .grading import DEFAULT_POLICY, CourseFinalGrades, GradingPolicy, percent
+from .models import MISSING, Course, Evaluation, GradeStore, Instructor, Student
+from .parallel import course_payload, summarize_all
+from .reports import (EXPORT_FORMATS, ArchivedCourse, ArchivedGrade, ArchiveSummary, CourseGradesSummary, CourseReport,
+                      CourseSummary, EvaluationSummary, GradeEntry, SearchHit, SearchPage, StudentReport, UserSummary,
+                      format_archived_course, format_course_report, format_items, format_search_page,
+                      format_student_report)
+from .storage import SECTION_KINDS, SECTIONS, TextStorage
+
+
+@functools.lru_cache(maxsize=None)
+def grade_matrix_class():
+    """GradeMatrix si numpy está instalado, None si no (se importa bajo demanda)"""
+    try:
+        from .matrix import GradeMatrix
+    except ImportError:
+        return None
+    return GradeMatrix
+
+
+# Métodos públicos que no se miden: devuelven context managers o generadores (medirían solo su
+# creación), administran la propia instrumentación o se llaman en cada acceso a los datos
+UNTIMED_METHODS = frozenset({"batch", "gradebook", "transcripts", "ensure_loaded", "enable_metrics",
+                             "disable_metrics", "subscribe", "unsubscribe"})
+
+# Separador de campos y fines de línea de los registros de texto: no pueden aparecer en un campo
+RESERVED_CHARACTERS = "|\r\n"
+# Sección de cada tipo de registro del almacenamiento ("G" -> "grades")
+RECORD_SECTIONS = {kind: section for section, kind in SECTION_KINDS.items()}
+
+# Campos indexados para search()
+SEARCH_FIELDS = {"users": ("name", "email"), "courses": ("name", "code"), "evaluations": ("name",)}
+# Tipos de documento del índice y los que abarca cada item_type de search()
+USER_KINDS = {"estudiante": "students", "instructor": "instructors"}
+KIND_SECTIONS = {"students": "users", "instructors": "users", "courses": "courses", "evaluations": "evaluations"}
+SEARCH_TYPES = {"users": frozenset(USER_KINDS.values()), "students": frozenset({"students"}),
+                "instructors": frozenset({"instructors"}), "courses": frozenset({"courses"}),
+                "evaluations": frozenset({"evaluations"})}
+
+
+@functools.lru_cache(maxsize=None)
+def instrumented_methods(cls):
+    """Nombres de los métodos públicos de la clase que enable_metrics() mide"""
+    return tuple(name for name in dir(cls)
+                 if not name.startswith("_") and name not in UNTIMED_METHODS
+                 and isinstance(getattr(cls, name), types.FunctionType))
+
+
+class NotFoundError(ValueError):
+    """El usuario, curso o evaluación pedido no existe (o el curso no está archivado)"""
+
+
+def synchronized(method):
+    """Ejecutar el método con el almacenamiento bloqueado y al día con los otros procesos"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._synchronized():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class CourseManagementSystem:
+    """Reglas de negocio, índices y reportes sobre un StorageBackend.
+
+    Los datos se leen por secciones (ver SECTIONS y ensure_loaded) con el
+    primer acceso que las necesita. Las propiedades users, courses y
+    evaluations cargan todas las secciones: los Student, Course y Evaluation
+    que devuelven siempre tienen sus inscripciones y calificaciones. Los
+    métodos que no las necesitan (validaciones, listados, consultas directas
+    al backend) cargan solo sus secciones y usan _users, _courses y
+    _evaluations.
+    """
+
+    def __init__(self, storage=None, metrics=None):
+        self.storage = storage if storage is not None else TextStorage()
+        # Índices secundarios para las validaciones de unicidad
+        self._emails = {}  # {email: user_id}
+        self._course_codes = {}  # {code: course_id}
+        self._evaluation_names = {}  # {(course_id, nombre en minúsculas): evaluation_id}
+        self._pending = None  # Registros acumulados dentro de batch()
+        # Registros escritos sin cargar su sección que todavía no llegaron al almacenamiento (ver _persist)
+        self._unloaded_records = []
+        self._unloaded_enrollments = set()  # Sus inscripciones, como (student_id, course_id)
+        self._lock_depth = 0  # Anidamiento de _synchronized() en este proceso
+        # Eventos de cambio (ver course_system.events): suscriptores y changefeed, creado con el primer evento
+        self._subscriptions = []
+        self._changefeed = None
+        self._event_offset = 0  # Sin changefeed en disco, los offsets se numeran en memoria
+        # Reportes ya generados por estudiante y por curso (ver _invalidate_*)
+        self.report_cache = ReportCache()
+        self.metrics = None
+        if metrics is not None:
+            # Antes de load_data, para medir también la carga inicial
+            self.enable_metrics(metrics)
+        self.load_data()
+
+    def enable_metrics(self, metrics=None):
+        """Contar y medir los métodos públicos de esta instancia y las escrituras a disco.
+
+        Devuelve el Metrics en uso (uno nuevo si no se pasa ninguno).
+        """
+        from .metrics import Metrics  # Solo se importa si se activa la instrumentación
+
+        self.disable_metrics()
+        self.metrics = metrics if metrics is not None else Metrics()
+        for name in instrumented_methods(type(self)):
+            setattr(self, name, self.metrics.instrument(name, getattr(self, name)))
+        self.storage.metrics = self.metrics
+        return self.metrics
+
+    def disable_metrics(self):
+        """Quitar la instrumentación: los métodos vuelven a ser los de la clase"""
+        if self.metrics is None:
+            return
+        for name in instrumented_methods(type(self)):
+            self.__dict__.pop(name, None)
+        self.storage.metrics = None
+        self.metrics = None
+
+    @property
+    def users(self):
+        self.ensure_loaded("grades")
+        return self._users
+
+    @property
+    def courses(self):
+        self.ensure_loaded("grades")
+        return self._courses
+
+    @property
+    def evaluations(self):
+        self.ensure_loaded("grades")
+        return self._evaluations
+
+    def _id_in_use(self, item_id):
+        self.ensure_loaded("evaluations")
+        return item_id in self._users or item_id in self._courses or item_id in self._evaluations
+
+    def load_data(self):
+        """Preparar la carga diferida: cada sección se lee con el primer acceso que la necesita"""
+        self._users = {}
+        self._courses = {}
+        self._evaluations = {}
+        self.grade_store = GradeStore()
+        self._emails.clear()
+        self._course_codes.clear()
+        self._evaluation_names.clear()
+        self._loaded = set()
+        self.storage.reset()
+        # Rankings ordenados por promedio, construidos con la primera consulta
+        self._ranking = None  # [(promedio general, student_id)]
+        self._course_rankings = None  # {course_id: [(promedio del curso, student_id)]}
+        self._grade_matrices = {}  # {course_id: GradeMatrix}, solo con numpy disponible
+        self._policies = {}  # {course_id: GradingPolicy}
+        self._final_grades = {}  # {course_id: CourseFinalGrades}, construidas con la primera consulta
+        self._search_index = None  # SearchIndex, construido con la primera búsqueda
+        self.report_cache.clear()
+
+    def ensure_loaded(self, section="grades"):
+        """Cargar la sección indicada (ver SECTIONS) y todas las anteriores, de las que depende"""
+        if section in self._loaded:
+            return
+        # Cada sección depende de las anteriores (cursos -> instructores, etc.)
+        loaders = {"users": self.load_users, "courses": self.load_courses,
+                   "evaluations": self.load_evaluations, "policies": self.load_policies,
+                   "enrollments": self.load_enrollments, "grades": self.load_grades}
+        for name in SECTIONS:
+            if name not in self._loaded:
+                self._loaded.add(name)
+                loaders[name]()
+                kind = SECTION_KINDS[name]
+                for record_kind, fields in self._unloaded_records:
+                    if record_kind == kind:
+                        self._apply_record(kind, fields)
+            if name == section:
+                break
+
+    def _queries_backend(self, section):
+        """Si la sección no está en memoria y el backend puede responder consultas sin cargarla"""
+        return section not in self._loaded and self.storage.supports_queries
+
+    def _apply_user(self, user_id, name, email, user_type):
+        if user_type == "estudiante":
+            user = Student(user_id, name, email, self.grade_store)
+        elif user_type == "instructor":
+            user = Instructor(user_id, name, email)
+        else:
+            return
+        previous = self._users.get(user_id)
+        if previous is not None and self._emails.get(previous.email) == user_id:
+            del self._emails[previous.email]
+        self._users[user_id] = user
+        self._emails[email] = user_id
+        self._index_item("users", user_id, user)
+        # Un reporte pedido antes de registrar al usuario dice que no existe
+        self.report_cache.invalidate(("student", user_id))
+
+    def _apply_course(self, course_id, name, code, instructor_id):
+        if instructor_id in self._users:
+            course = Course(course_id, name, code, instructor_id)
+            self._courses[course_id] = course
+            self._course_codes[code] = course_id
+            self._index_item("courses", course_id, course)
+            taught_courses = getattr(self._users[instructor_id], 'taught_courses', None)
+            if taught_courses is not None and course_id not in taught_courses:
+                taught_courses.append(course_id)
+            self.report_cache.invalidate(("course", course_id))
+
+    def _apply_evaluation(self, eval_id, name, course_id, eval_type, max_score):
+        if course_id in self._courses:
+            evaluation = Evaluation(eval_id, course_id, name, eval_type, int(max_score), self.grade_store)
+            self._evaluations[eval_id] = evaluation
+            self._evaluation_names[(course_id, name.lower())] = eval_id
+            self._index_item("evaluations", eval_id, evaluation)
+            if eval_id not in self._courses[course_id].evaluations:
+                self._courses[course_id].evaluations.append(eval_id)
+            self.report_cache.invalidate(("course", course_id))
+
+    def _apply_policy(self, course_id, policy):
+        course = self._courses.get(course_id)
+        if course is None:
+            return
+        self._policies[course_id] = policy
+        # Las notas finales del curso se reconstruyen con la nueva política en la próxima consulta
+        self._final_grades.pop(course_id, None)
+        self.report_cache.invalidate(("course", course_id))
+        for student_id in course.enrolled_students:
+            self.report_cache.invalidate(("student", student_id))
+
+    def _index_item(self, section, item_id, item):
+        """Indexar (o reindexar) un usuario, curso o evaluación si el índice de búsqueda ya existe"""
+        if self._search_index is not None:
+            self._search_index.add(item_id, USER_KINDS[item.user_type] if section == "users" else section,
+                                   [getattr(item, field) for field in SEARCH_FIELDS[section]])
+
+    def load_users(self):
+        for fields in self.storage.iter_records("users"):
+            self._apply_user(*fields)
+
+    def load_courses(self):
+        for fields in self.storage.iter_records("courses"):
+            self._apply_course(*fields)
+
+    def load_evaluations(self):
+        for fields in self.storage.iter_records("evaluations"):
+            self._apply_evaluation(*fields)
+
+    def load_policies(self):
+        for course_id, *fields in self.storage.iter_records("policies"):
+            self._apply_policy(course_id, GradingPolicy.from_fields(*fields))
+
+    def load_enrollments(self):
+        """Reconstruir en una pasada las inscripciones de estudiantes y cursos"""
+        users = self._users
+        courses = self._courses
+        for student_id, course_id in self.storage.iter_records("enrollments"):
+            student = users.get(student_id)
+            course = courses.get(course_id)
+            if course is not None and type(student) is Student:
+                student._enrolled_courses[course.course_id] = None
+                course.enrolled_students[student.user_id] = None
+
+    def load_grades(self):
+        blocks = self.storage.grade_blocks()
+        if blocks is None:
+            self._load_grade_records(self.storage.iter_record_columns("grades"))
+            return
+        self._load_grade_blocks(blocks)
+        # Lo registrado después del snapshot binario: pocas calificaciones, una por una
+        users = self._users
+        evaluations = self._evaluations
+        for student_id, _, eval_id, grade in self.storage.iter_records("grades"):
+            student = users.get(student_id)
+            evaluation = evaluations.get(eval_id)
+            if evaluation is not None and type(student) is Student:
+                self._link_implied_enrollment(student, self._courses[evaluation.course_id])
+                student.add_grade(evaluation.course_id, evaluation.evaluation_id, float(grade))
+
+    def _link_implied_enrollment(self, student, course):
+        if course.course_id not in student._enrolled_courses:
+            # Datos anteriores a las inscripciones persistidas: la calificación implica la inscripción
+            student._enrolled_courses[course.course_id] = None
+            course.enrolled_students[student.user_id] = None
+
+    def _load_grade_records(self, batches):
+        """Cargar calificaciones por lotes de columnas (student_ids, course_ids, eval_ids, grades).
+
+        Cada celda se anota una sola vez en {eval_id: {student_id: grade}} (la
+        última gana, como con add_grade); después cada curso se carga como un
+        bloque, igual que desde el snapshot binario, con columnas y acumulados
+        armados con map sobre la evaluación entera en vez de Student.add_grade y
+        GradeStore.set en cada calificación.
+        """
+        by_evaluation = {}
+        for student_ids, _, eval_ids, grades in batches:
+            for student_id, eval_id, grade in zip(student_ids, eval_ids, grades):
+                try:
+                    by_evaluation[eval_id][student_id] = grade
+                except KeyError:
+                    by_evaluation[eval_id] = {student_id: grade}
+
+        users = self._users
+        # {course_id: ({student_id: ...}, [(eval_id, {student_id: grade})])}; de las filas solo
+        # importan las claves, en orden de aparición
+        by_course = {}
+        for eval_id, cells in by_evaluation.items():
+            evaluation = self._evaluations.get(eval_id)
+            if evaluation is not None:
+                rows, columns = by_course.setdefault(evaluation.course_id, ({}, []))
+                rows.update(cells)
+                columns.append((evaluation.evaluation_id, cells))
+
+        blocks = []
+        for course_id, (rows, columns) in by_course.items():
+            student_ids = [student_id for student_id in rows if type(users.get(student_id)) is Student]
+            columns = [(eval_id, list(map(cells.get, student_ids))) for eval_id, cells in columns]
+            if not any(None in values for _, values in columns):
+                # Todas las celdas calificadas (el caso habitual): columnas y acumulados por fila con map
+                packed = [(eval_id, len(values), array("d", map(float, values))) for eval_id, values in columns]
+                sums = array("d", map(sum, zip(*(column for _, _, column in packed))))
+                counts = array("I", [len(packed)]) * len(student_ids)
+            else:
+                sums = array("d", bytes(8 * len(student_ids)))
+                counts = array("I", bytes(4 * len(student_ids)))
+                packed = []
+                for eval_id, values in columns:
+                    column = array("d", [MISSING if grade is None else float(grade) for grade in values])
+                    for row, grade in enumerate(column):
+                        if grade == grade:
+                            sums[row] += grade
+                            counts[row] += 1
+                    packed.append((eval_id, len(values) - values.count(None), column))
+            blocks.append((course_id, student_ids, counts, sums, packed))
+        self._load_grade_blocks(blocks)
+
+    def _load_grade_blocks(self, blocks):
+        """Cargar columnas ya armadas (del snapshot binario o de _load_grade_records).
+
+        Las columnas se copian tal cual al GradeStore y los acumulados de cada
+        estudiante salen de las sumas y cantidades por fila del bloque.
+        """
+        users = self._users
+        courses = self._courses
+        evaluations = self._evaluations
+        for course_id, student_ids, counts, sums, columns in blocks:
+            course = courses.get(course_id)
+            if course is None:
+                continue
+            course_grades = self.grade_store.load_course(
+                course.course_id, [users[student_id].user_id for student_id in student_ids],
+                [(evaluations[eval_id].evaluation_id, count, data) for eval_id, count, data in columns])
+            for student_id, row in course_grades.rows.items():
+                count = counts[row]
+                if not count:
+                    continue
+                student = users[student_id]
+                self._link_implied_enrollment(student, course)
+                # Mismos acumulados que dejaría Student.add_grade con cada calificación
+                student._course_totals[course.course_id] = [sums[row], count]
+                student._total_sum += sums[row]
+                student._total_count += count
+
+    @contextlib.contextmanager
+    def _synchronized(self):
+        """Tomar el lock del almacenamiento e incorporar lo que otros procesos escribieron.
+
+        Las validaciones y la escritura ocurren con el lock tomado, así que
+        ningún proceso decide sobre datos viejos ni pisa los cambios ajenos.
+        """
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        with self.storage.locked():
+            self._lock_depth = 1
+            try:
+                self._catch_up()
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def _catch_up(self):
+        records = self.storage.changes()
+        if records is None:
+            # El almacenamiento se reemplazó: volver a cargar (de forma diferida) en vez de mezclar
+            self.load_data()
+            return
+        for kind, fields in records:
+            self._apply_record(kind, fields)
+
+    def _apply_record(self, kind, fields):
+        """Aplicar en memoria un registro ya persistido (de otro proceso o escrito sin cargar su sección)"""
+        if kind == "U":
+            self._apply_user(*fields)
+        elif kind == "C":
+            self._apply_course(*fields)
+        elif kind == "E":
+            self._apply_evaluation(*fields)
+            self._grade_matrices.pop(fields[2], None)
+        elif kind == "P":
+            self._apply_policy(fields[0], GradingPolicy.from_fields(*fields[1:]))
+        elif kind == "N":
+            student = self._users.get(fields[0])
+            course = self._courses.get(fields[1])
+            if course is not None and type(student) is Student:
+                self._link_enrollment(student, course)
+        elif kind == "G":
+            student = self._users.get(fields[0])
+            evaluation = self._evaluations.get(fields[2])
+            if evaluation is not None and type(student) is Student:
+                self._store_grade(student, evaluation, float(fields[3]))
+
+    def _persist(self, kind, *fields):
+        """Registrar una operación en el almacenamiento (o en el lote en curso)"""
+        if RECORD_SECTIONS[kind] not in self._loaded:
+            # Validado contra el backend sin cargar la sección: si se carga antes de que el registro
+            # llegue al almacenamiento (dentro de un lote), ensure_loaded lo aplica
+            self._unloaded_records.append((kind, fields))
+            if kind == "N":
+                self._unloaded_enrollments.add(fields)
+        if self._pending is not None:
+            self._pending.append((kind, fields))
+        else:
+            self._flush([(kind, fields)])
+
+    def _flush(self, records):
+        if not records:
+            return
+        if not self.storage.append(records):
+            # save_data carga todo (aplicando _unloaded_records) y reemplaza el almacenamiento
+            self.save_data()
+        self._unloaded_records.clear()
+        self._unloaded_enrollments.clear()
+        from .events import record_event
+
+        self._publish([record_event(kind, fields) for kind, fields in records])
+
+    def _publish(self, events):
+        """Registrar [(tipo, data)] en el changefeed y entregarlos a los suscriptores.
+
+        Se llama con el lock tomado y después de persistir la operación.
+        """
+        event_time = time.time()
+        if self._changefeed is None and self.storage.changefeed_path is not None:
+            from .events import ChangeFeed
+
+            self._changefeed = ChangeFeed(self.storage.changefeed_path)
+        if self._changefeed is not None:
+            timer = (self.metrics.file_timer(os.path.basename(self._changefeed.path)) if self.metrics is not None
+                     else contextlib.nullcontext())
+            with timer:
+                events = self._changefeed.append(event_time, events)
+        else:
+            from .events import ChangeEvent
+
+            events = [ChangeEvent(offset, event_type, event_time, data)
+                      for offset, (event_type, data) in enumerate(events, self._event_offset + 1)]
+            self._event_offset = events[-1].offset
+        for subscription in self._subscriptions:
+            subscription.offer(events)
+
+    def subscribe(self, maxsize=1024, types=None):
+        """Suscribirse a los eventos de cambio de este proceso (ver course_system.events).
+
+        Devuelve una Subscription con una cola de hasta maxsize eventos; types
+        limita los tipos de evento. Publicar nunca espera al suscriptor: si la
+        cola está llena el evento se descarta (Subscription.dropped) y puede
+        recuperarse con read_changes(). Los cambios de otros procesos solo
+        aparecen en el changefeed.
+        """
+        from .events import Subscription
+
+        subscription = Subscription(maxsize, types)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def read_changes(self, since=0, limit=None):
+        """Eventos del changefeed con offset mayor que since (de todos los procesos), como ChangeEvent"""
+        path = self.storage.changefeed_path
+        if path is None:
+            raise ValueError("Este almacenamiento no registra un changefeed")
+        if since < 0 or (limit is not None and limit < 1):
+            raise ValueError("Offset o límite no válido")
+        from .events import ChangeFeed
+
+        return ChangeFeed(path).read(since, limit)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Agrupar las operaciones del bloque en una sola escritura a disco"""
+        with self._synchronized():
+            if self._pending is not None:
+                yield
+                return
+            self._pending = []
+            try:
+                yield
+            finally:
+                records, self._pending = self._pending, None
+                self._flush(records)
+
+    def _enrollment_records(self):
+        """(student_id, course_id) en un orden que respeta a la vez el orden de inscripción de cada
+        estudiante (enrolled_courses) y el de cada curso (enrolled_students).
+
+        Ambos órdenes salen de la misma secuencia de inscripciones, así que se puede avanzar
+        emitiendo la inscripción que encabeza tanto la lista del estudiante como la del curso.
+        Si los órdenes no fueran compatibles, lo que quede se escribe curso por curso.
+        """
+        student_courses = {}
+        student_next = {}
+        course_next = dict.fromkeys(self._courses, 0)
+
+        def head(student_id):
+            """Primer curso del estudiante que todavía no se escribió (None si ya no quedan)"""
+            courses = student_courses.get(student_id)
+            if courses is None:
+                courses = student_courses[student_id] = list(self._users[student_id]._enrolled_courses)
+                student_next[student_id] = 0
+            position = student_next[student_id]
+            return courses[position] if position < len(courses) else None
+
+        rosters = {course_id: list(course.enrolled_students) for course_id, course in self._courses.items()}
+        ready = [(roster[0], course_id) for course_id, roster in rosters.items()
+                 if roster and head(roster[0]) == course_id]
+        ready.reverse()
+        while ready:
+            student_id, course_id = ready.pop()
+            yield student_id, course_id
+            student_next[student_id] += 1
+            course_next[course_id] += 1
+            roster = rosters[course_id]
+            if course_next[course_id] < len(roster):
+                following = roster[course_next[course_id]]
+                if head(following) == course_id:
+                    ready.append((following, course_id))
+            following = head(student_id)
+            if following is not None and rosters[following][course_next[following]] == student_id:
+                ready.append((student_id, following))
+        for course_id, roster in rosters.items():
+            for student_id in roster[course_next[course_id]:]:
+                yield student_id, course_id
+
+    def _snapshot_records(self):
+        return {
+            "users": ((user.user_id, user.name, user.email, user.user_type)
+                      for user in self._users.values()),
+            "courses": ((course.course_id, course.name, course.code, course.instructor_id)
+                        for course in self._courses.values()),
+            "evaluations": ((evaluation.evaluation_id, evaluation.name, evaluation.course_id,
+                             evaluation.evaluation_type, evaluation.max_score)
+                            for evaluation in self._evaluations.values()),
+            "policies": ((course_id, *policy.to_fields()) for course_id, policy in self._policies.items()),
+            "enrollments": self._enrollment_records(),
+            # Iterable como registros; el snapshot binario aprovecha directamente sus columnas
+            "grades": self.grade_store,
+        }
+
+    @synchronized
+    def save_data(self):
+        """Volcar el estado completo en el almacenamiento (compacta el journal de texto)"""
+        self.ensure_loaded("grades")
+        self.storage.snapshot(self._snapshot_records())
+
+    def _validate_fields(self, *values):
+        """Rechazar textos que partirían el registro al guardarlo (vale para el menú, la importación y el servidor)"""
+        for value in values:
+            if any(char in value for char in RESERVED_CHARACTERS):
+                raise ValueError("Los campos no pueden contener '|' ni saltos de línea")
+
+    def _validate_user(self, user_id, name, email, user_type):
+        self._validate_fields(user_id, name, email)
+        if self._id_in_use(user_id):
+            raise ValueError("El ID ya está en uso")
+
+        if email in self._emails:
+            raise ValueError("El email ya está registrado")
+
+        if user_type not in ["estudiante", "instructor"]:
+            raise ValueError("Tipo de usuario no válido")
+
+    @synchronized
+    def register_user(self, user_id, name, email, user_type):
+        self._validate_user(user_id, name, email, user_type)
+        self._apply_user(user_id, name, email, user_type)
+        self._persist("U", user_id, name, email, user_type)
+        print(f"{user_type.title()} registrado exitosamente")
+
+    @synchronized
+    def create_course(self, course_id, name, code, instructor_id):
+        self._validate_fields(course_id, name, code)
+        if self._id_in_use(course_id):
+            raise ValueError("El ID ya está en uso")
+
+        if not isinstance(self._users.get(instructor_id), Instructor):
+            raise NotFoundError("El instructor no existe")
+
+        if code in self._course_codes:
+            raise ValueError("El código del curso ya existe")
+
+        self._apply_course(course_id, name, code, instructor_id)
+        self._persist("C", course_id, name, code, instructor_id)
+        print(f"Curso {name} creado exitosamente")
+
+    @synchronized
+    def create_evaluation(self, evaluation_id, course_id, name, evaluation_type, max_score):
+        self._validate_fields(evaluation_id, name)
+        if self._id_in_use(evaluation_id):
+            raise ValueError("El ID ya está en uso")
+
+        if course_id not in self._courses:
+            raise NotFoundError("El curso no existe")
+
+        if evaluation_type not in ["examen", "tarea"]:
+            raise ValueError("Tipo de evaluación no válido")
+
+        # Verificar si ya existe evaluación con mismo nombre en el curso
+        if (course_id, name.lower()) in self._evaluation_names:
+            raise ValueError("Ya existe una evaluación con ese nombre en este curso")
+
+        self._apply_evaluation(evaluation_id, name, course_id, evaluation_type, max_score)
+        self._grade_matrices.pop(course_id, None)
+        self._persist("E", evaluation_id, name, course_id, evaluation_type, max_score)
+        print(f"Evaluación {name} creada exitosamente")
+
+    @synchronized
+    def set_grading_policy(self, course_id, weights, drop_lowest=None, bands=None):
+        """Definir la política de calificación de un curso.
+
+        weights: {tipo de evaluación: peso}; drop_lowest: {tipo: notas más bajas
+        a descartar}; bands: [(porcentaje mínimo, letra)] (por defecto A-F).
+        """
+        self.ensure_loaded("policies")
+        if course_id not in self._courses:
+            raise NotFoundError("El curso no existe")
+        policy = GradingPolicy(weights, drop_lowest, bands)
+        self._apply_policy(course_id, policy)
+        self._persist("P", course_id, *policy.to_fields())
+        print("Política de calificación actualizada")
+
+    def grading_policy(self, course_id):
+        """Política del curso (la predeterminada si no definió una)"""
+        self.ensure_loaded("policies")
+        return self._policies.get(course_id, DEFAULT_POLICY)
+
+    def final_grades(self, course_id):
+        """Notas finales ponderadas del curso: {student_id: (porcentaje, letra)} de solo lectura.
+
+        La primera consulta las calcula a partir del GradeStore; después se
+        mantienen al día con cada calificación registrada.
+        """
+        if course_id not in self.courses:
+            raise NotFoundError("El curso no existe")
+        self.ensure_loaded("grades")
+        final_grades = self._final_grades.get(course_id)
+        if final_grades is None:
+            final_grades = CourseFinalGrades(self.grading_policy(course_id))
+            course_grades = self.grade_store.course(course_id)
+            if course_grades is not None:
+                final_grades.build(
+                    (student_id, evaluation.evaluation_type, percent(column[row], evaluation.max_score))
+                    for evaluation in self._courses[course_id].get_course_evaluations(self)
+                    if (column := course_grades.columns.get(evaluation.evaluation_id)) is not None
+                    for student_id, row in course_grades.rows.items() if column[row] == column[row])
+            self._final_grades[course_id] = final_grades
+        return types.MappingProxyType(final_grades.grades)
+
+    def final_grade(self, student_id, course_id):
+        """(porcentaje, letra) de un estudiante en un curso, o None sin calificaciones con peso"""
+        return self.final_grades(course_id).get(student_id)
+
+    def _validate_enrollment(self, student_id, course_id):
+        # Con un backend consultable no hace falta cargar las inscripciones (ver _is_enrolled)
+        self.ensure_loaded("courses" if self._queries_backend("enrollments") else "enrollments")
+        if not isinstance(self._users.get(student_id), Student):
+            raise NotFoundError("El estudiante no existe")
+
+        if course_id not in self._courses:
+            raise NotFoundError("El curso no existe")
+
+        return self._users[student_id], self._courses[course_id]
+
+    def _is_enrolled(self, student, course_id):
+        if "enrollments" in self._loaded:
+            return course_id in student._enrolled_courses
+        return ((student.user_id, course_id) in self._unloaded_enrollments
+                or self.storage.is_enrolled(student.user_id, course_id))
+
+    def _link_enrollment(self, student, course):
+        student._enrolled_courses[course.course_id] = None
+        course.enrolled_students[student.user_id] = None
+        self.report_cache.invalidate(("student", student.user_id))
+        self.report_cache.invalidate(("course", course.course_id))
+
+    def _apply_enrollment(self, student, course):
+        if "enrollments" in self._loaded:
+            self._link_enrollment(student, course)
+        else:
+            # La carga de las inscripciones leerá esta del almacenamiento
+            self.report_cache.invalidate(("student", student.user_id))
+            self.report_cache.invalidate(("course", course.course_id))
+        self._persist("N", student.user_id, course.course_id)
+
+    @synchronized
+    def enroll_student(self, student_id, course_id):
+        student, course = self._validate_enrollment(student_id, course_id)
+
+        if self._is_enrolled(student, course_id):
+            print("El estudiante ya está inscrito")
+            return
+
+        self._apply_enrollment(student, course)
+        print("Estudiante inscrito exitosamente")
+
+    def _validate_grade(self, student_id, evaluation_id, grade):
+        # Con un backend consultable la calificación se guarda sin cargar las demás (ver _store_grade)
+        self.ensure_loaded("evaluations" if self._queries_backend("grades") else "grades")
+        student = self._users.get(student_id)
+        if not isinstance(student, Student):
+            raise NotFoundError("El estudiante no existe")
+
+        evaluation = self._evaluations.get(evaluation_id)
+        if evaluation is None:
+            raise NotFoundError("La evaluación no existe")
+
+        if not self._is_enrolled(student, evaluation.course_id):
+            raise ValueError("El estudiante no está inscrito en este curso")
+
+        # NaN marca las celdas vacías del GradeStore y no pasaría la comparación de rango
+        if not math.isfinite(grade):
+            raise ValueError("La calificación debe ser un número finito")
+        if grade < 0 or grade > evaluation.max_score:
+            raise ValueError(f"La calificación debe estar entre 0 y {evaluation.max_score}")
+
+        return student, evaluation
+
+    def _store_grade(self, student, evaluation, grade):
+        """Guardar una calificación validada en el estudiante, la evaluación y los rankings"""
+        course_id = evaluation.course_id
+        if "grades" not in self._loaded:
+            # Sin calificaciones en memoria no hay rankings ni notas finales que actualizar:
+            # la carga la leerá del almacenamiento
+            self.report_cache.invalidate(("student", student.user_id))
+            self.report_cache.invalidate(("course", course_id))
+            return
+        if self._ranking is not None:
+            self._unrank(student, course_id)
+        previous = student.add_grade(course_id, evaluation.evaluation_id, grade)
+        if self._ranking is not None:
+            self._rank(student, course_id)
+        final_grades = self._final_grades.get(course_id)
+        if final_grades is not None:
+            max_score = evaluation.max_score
+            final_grades.update(student.user_id, evaluation.evaluation_type,
+                                None if previous is None else percent(previous, max_score), percent(grade, max_score))
+        matrix = self._grade_matrices.get(course_id)
+        if matrix is not None:
+            matrix.set_grade(student.user_id, evaluation.evaluation_id, grade)
+        self.report_cache.invalidate(("student", student.user_id))
+        self.report_cache.invalidate(("course", course_id))
+
+    @synchronized
+    def register_grade(self, student_id, evaluation_id, grade):
+        student, evaluation = self._validate_grade(student_id, evaluation_id, grade)
+        self._store_grade(student, evaluation, grade)
+        self._persist("G", student_id, evaluation.course_id, evaluation_id, grade)
+        print(f"Calificación registrada: {grade}/{evaluation.max_score}")
+
+    def _iter_import_rows(self, source, columns):
+        """Recorrer filas de un archivo CSV/delimitado por "|" o de un iterable de filas.
+
+        Devuelve tuplas (número de fila, campos); la cabecera opcional se omite.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8", newline="") as file:
+                first_line = file.readline()
+                file.seek(0)
+                if "|" in first_line:
+                    rows = (line.rstrip("\r\n").split("|") for line in file)
+                else:
+                    import csv
+
+                    rows = csv.reader(file)
+                yield from self._iter_import_rows(rows, columns)
+            return
+
+        for row_number, row in enumerate(source, start=1):
+            if isinstance(row, str):
+                row = row.rstrip("\r\n").split("|")
+            fields = [str(field).strip() for field in row]
+            if not any(fields):
+                continue
+            if row_number == 1 and fields[0] == columns[0]:
+                continue
+            yield row_number, fields
+
+    def _run_import(self, source, columns, import_row):
+        """Aplicar import_row a cada fila y persistir todo el lote de una vez.
+
+        Devuelve (filas importadas, lista de errores (número de fila, mensaje)).
+        """
+        imported = 0
+        errors = []
+        with self.batch():
+            for row_number, fields in self._iter_import_rows(source, columns):
+                if len(fields) != len(columns):
+                    errors.append((row_number, f"Se esperaban {len(columns)} columnas: {', '.join(columns)}"))
+                    continue
+                try:
+                    import_row(*fields)
+                except ValueError as e:
+                    errors.append((row_number, str(e)))
+                else:
+                    imported += 1
+        return imported, errors
+
+    def _import_user(self, user_id, name, email, user_type):
+        self._validate_user(user_id, name, email, user_type)
+        self._apply_user(user_id, name, email, user_type)
+        self._persist("U", user_id, name, email, user_type)
+
+    def _import_enrollment(self, student_id, course_id):
+        student, course = self._validate_enrollment(student_id, course_id)
+        if self._is_enrolled(student, course_id):
+            raise ValueError("El estudiante ya está inscrito")
+        self._apply_enrollment(student, course)
+
+    def _import_grade(self, student_id, evaluation_id, grade):
+        try:
+            grade = float(grade)
+        except ValueError:
+            raise ValueError(f"Calificación no válida: {grade}") from None
+        student, evaluation = self._validate_grade(student_id, evaluation_id, grade)
+        self._store_grade(student, evaluation, grade)
+        self._persist("G", student_id, evaluation.course_id, evaluation_id, grade)
+
+    def import_users(self, source):
+        """Importar usuarios (user_id, name, email, user_type) desde un archivo o iterable"""
+        return self._run_import(source, ("user_id", "name", "email", "user_type"), self._import_user)
+
+    def import_enrollments(self, source):
+        """Importar inscripciones (student_id, course_id) desde un archivo o iterable"""
+        return self._run_import(source, ("student_id", "course_id"), self._import_enrollment)
+
+    def import_grades(self, source):
+        """Importar calificaciones (student_id, evaluation_id, grade) desde un archivo o iterable"""
+        return self._run_import(source, ("student_id", "evaluation_id", "grade"), self._import_grade)
+
+    def _build_rankings(self):
+        if self._ranking is not None:
+            return
+        self.ensure_loaded("grades")
+        ranking = []
+        course_rankings = {}
+        for user in self._users.values():
+            if isinstance(user, Student) and user._total_count:
+                ranking.append((user.get_overall_average(), user.user_id))
+                for course_id in user.graded_courses:
+                    course_rankings.setdefault(course_id, []).append(
+                        (user.get_course_average(course_id), user.user_id))
+        ranking.sort()
+        for entries in course_rankings.values():
+            entries.sort()
+        self._ranking = ranking
+        self._course_rankings = course_rankings
+
+    def _unrank(self, student, course_id):
+        """Quitar al estudiante de los rankings antes de modificar sus calificaciones"""
+        if student._total_count:
+            entries = self._ranking
+            del entries[bisect.bisect_left(entries, (student.get_overall_average(), student.user_id))]
+        if course_id in student.graded_courses:
+            entries = self._course_rankings[course_id]
+            del entries[bisect.bisect_left(entries, (student.get_course_average(course_id), student.user_id))]
+
+    def _rank(self, student, course_id):
+        bisect.insort(self._ranking, (student.get_overall_average(), student.user_id))
+        bisect.insort(self._course_rankings.setdefault(course_id, []),
+                      (student.get_course_average(course_id), student.user_id))
+
+    def _ranking_for(self, course_id):
+        self._build_rankings()
+        if course_id is None:
+            return self._ranking
+        if course_id not in self.courses:
+            raise NotFoundError("El curso no existe")
+        return self._course_rankings.get(course_id, [])
+
+    def low_performance_students(self, threshold=60, course_id=None):
+        """Estudiantes con promedio (general o del curso) mayor a 0 y menor al umbral.
+
+        Devuelve una lista de (estudiante, promedio) ordenada de menor a mayor promedio.
+        """
+        entries = self._ranking_for(course_id)
+        start = bisect.bisect_right(entries, 0, key=lambda entry: entry[0])
+        end = bisect.bisect_left(entries, threshold, key=lambda entry: entry[0])
+        return [(self._users[student_id], average) for average, student_id in entries[start:end]]
+
+    def top_students(self, n, course_id=None):
+        """Los n estudiantes con mayor promedio, de mayor a menor"""
+        entries = self._ranking_for(course_id)
+        return [(self._users[student_id], average)
+                for average, student_id in reversed(entries[max(len(entries) - n, 0):])]
+
+    def bottom_students(self, n, course_id=None):
+        """Los n estudiantes con menor promedio, de menor a mayor"""
+        entries = self._ranking_for(course_id)
+        return [(self._users[student_id], average) for average, student_id in entries[:max(n, 0)]]
+
+    def student_grades(self, student_id):
+        """Calificaciones de un estudiante como {course_id: {eval_id: grade}}.
+
+        Si el backend admite consultas y las calificaciones no están en memoria,
+        se consultan directamente en el almacenamiento.
+        """
+        if self._queries_backend("grades"):
+            grades = {}
+            for course_id, eval_id, grade in self.storage.student_grades(student_id):
+                grades.setdefault(course_id, {})[eval_id] = grade
+            return grades
+        self.ensure_loaded("grades")
+        student = self.users.get(student_id)
+        return student.grades if isinstance(student, Student) else {}
+
+    def course_grades(self, course_id):
+        """Calificaciones de un curso como {eval_id: {student_id: grade}}"""
+        if self._queries_backend("grades"):
+            grades = {}
+            for student_id, eval_id, grade in self.storage.course_grades(course_id):
+                grades.setdefault(eval_id, {})[student_id] = grade
+            return grades
+        self.ensure_loaded("grades")
+        course = self.courses.get(course_id)
+        if course is None:
+            return {}
+        return {evaluation.evaluation_id: evaluation.grades
+                for evaluation in course.get_course_evaluations(self) if evaluation.grades}
+
+    def course_roster(self, course_id):
+        """Lista de student_id inscritos en un curso"""
+        if self._queries_backend("enrollments"):
+            return self.storage.course_roster(course_id)
+        self.ensure_loaded("enrollments")
+        course = self._courses.get(course_id)
+        return list(course.enrolled_students) if course is not None else []
+
+    def _cached(self, key, variant, build, *args):
+        """Reporte desde la caché o construido con build(*args) y guardado"""
+        report = self.report_cache.get(key, variant)
+        if report is None:
+            report = build(*args)
+            self.report_cache.put(key, variant, report)
+        return report
+
+    def student_report(self, student_id, course_id=None):
+        """Calificaciones de un estudiante (de un curso o de todos) como StudentReport"""
+        return self._cached(("student", student_id), course_id, self._build_student_report, student_id, course_id)
+
+    def _build_student_report(self, student_id, course_id):
+        # Las calificaciones llegan con student_grades(), que puede consultarlas directamente al backend
+        self.ensure_loaded("enrollments")
+        student = self._users.get(student_id)
+        if not isinstance(student, Student):
+            raise NotFoundError("El estudiante no existe")
+
+        if course_id and course_id not in student.enrolled_courses:
+            raise ValueError("El estudiante no está inscrito en ese curso")
+
+        grades = self.student_grades(student_id)
+        evaluations = self._evaluations
+        courses = []
+        for enrolled_course_id in ([course_id] if course_id else student.enrolled_courses):
+            course = self._courses.get(enrolled_course_id)
+            if course is None and not course_id:
+                continue
+            course_grades = grades.get(enrolled_course_id, {})
+            entries = []
+            percents_by_type = {}
+            for eval_id, grade in course_grades.items():
+                evaluation = evaluations.get(eval_id)
+                if evaluation is not None:
+                    entries.append(GradeEntry(eval_id, evaluation.name, grade, evaluation.max_score,
+                                              (grade / evaluation.max_score) * 100))
+                    percents_by_type.setdefault(evaluation.evaluation_type, []).append(
+                        percent(grade, evaluation.max_score))
+            for percents in percents_by_type.values():
+                percents.sort()
+            average = sum(course_grades.values()) / len(course_grades) if course_grades else None
+            courses.append(CourseGradesSummary(enrolled_course_id, course.name if course else "Curso Desconocido",
+                                               tuple(entries), average,
+                                               self.grading_policy(enrolled_course_id).final_grade(percents_by_type)))
+
+        total_count = sum(len(course_grades) for course_grades in grades.values())
+        overall_average = (sum(sum(course_grades.values()) for course_grades in grades.values()) / total_count
+                           if total_count else None)
+        return StudentReport(student.user_id, student.name, course_id or None, tuple(courses), overall_average)
+
+    def show_student_grades(self, student_id, course_id=None):
+        try:
+            print(format_student_report(self.student_report(student_id, course_id)))
+        except ValueError as e:
+            print(e)
+
+    def grade_matrix(self, course_id):
+        """Matriz columnar de calificaciones del curso (requiere numpy)"""
+        GradeMatrix = grade_matrix_class()
+        if GradeMatrix is None:
+            raise RuntimeError("Las estadísticas por curso requieren numpy")
+        if course_id not in self.courses:
+            raise NotFoundError("El curso no existe")
+        matrix = self._grade_matrices.get(course_id)
+        if matrix is None:
+            self.ensure_loaded("grades")
+            matrix = GradeMatrix(self.courses[course_id].get_course_evaluations(self))
+            self._grade_matrices[course_id] = matrix
+        return matrix
+
+    def course_statistics(self, course_id):
+        """Estadísticas vectorizadas por evaluación y promedios normalizados por estudiante"""
+        matrix = self.grade_matrix(course_id)
+        return {"evaluations": matrix.evaluation_statistics(),
+                "student_averages": matrix.student_averages()}
+
+    def course_report(self, course_id):
+        """Datos del curso, sus evaluaciones y (con numpy) sus estadísticas como CourseReport"""
+        return self._cached(("course", course_id), None, self._build_course_report, course_id)
+
+    def _build_course_report(self, course_id):
+        if course_id not in self.courses:
+            raise NotFoundError("El curso no existe")
+
+        self.ensure_loaded("enrollments")
+        course = self.courses[course_id]
+        instructor = self.users.get(course.instructor_id)
+        evaluations = course.get_course_evaluations(self)
+
+        statistics = {}
+        average_percent = None
+        if evaluations and grade_matrix_class() is not None:
+            course_statistics = self.course_statistics(course_id)
+            statistics = {stats["evaluation_id"]: stats for stats in course_statistics["evaluations"]}
+            averages = course_statistics["student_averages"]
+            if averages:
+                average_percent = sum(averages.values()) / len(averages)
+
+        letters = {letter: 0 for _, letter in self.grading_policy(course_id).bands}
+        for _, letter in self.final_grades(course_id).values():
+            letters[letter] += 1
+
+        return CourseReport(
+            course.course_id, course.name, course.code, course.instructor_id,
+            instructor.name if instructor else None, len(course.enrolled_students),
+            tuple(EvaluationSummary(evaluation.evaluation_id, evaluation.name, evaluation.evaluation_type,
+                                    evaluation.max_score, statistics.get(evaluation.evaluation_id))
+                  for evaluation in evaluations),
+            average_percent, letters)
+
+    def compute_all_course_reports(self, workers=None, pass_threshold=60, bins=10):
+        """Resumen de fin de curso de todos los cursos: {course_id: resumen}.
+
+        Los cursos se reparten entre `workers` procesos (por defecto, uno por
+        CPU; workers=1 calcula en este proceso). Cada resumen incluye los
+        inscritos, el promedio normalizado (%), la tasa de aprobación
+        (promedio >= pass_threshold), la distribución de promedios y, por
+        evaluación, conteo, media, mínimo, máximo e histograma.
+        """
+        self.ensure_loaded("grades")
+        payloads = [course_payload(course, course.get_course_evaluations(self),
+                                   self.grade_store.course(course.course_id))
+                    for course in self._courses.values()]
+        summaries = {summary["course_id"]: summary
+                     for summary in summarize_all(payloads, workers, pass_threshold, bins)}
+        for course_id, course in self._courses.items():
+            summaries[course_id]["name"] = course.name
+            summaries[course_id]["enrolled_count"] = len(course.enrolled_students)
+        return summaries
+
+    def show_course_details(self, course_id):
+        try:
+            print(format_course_report(self.course_report(course_id)))
+        except ValueError as e:
+            print(e)
+
+    def items(self, item_type):
+        """Usuarios ("users", "students", "instructors") o cursos ("courses") como tuplas con nombre"""
+        if item_type == "courses":
+            self.ensure_loaded("courses")
+            return [CourseSummary(course.course_id, course.name, course.code, course.instructor_id,
+                                  getattr(self._users.get(course.instructor_id), "name", None))
+                    for course in self._courses.values()]
+        user_class = {"users": object, "students": Student, "instructors": Instructor}.get(item_type)
+        if user_class is None:
+            raise ValueError("Tipo de listado no válido")
+        self.ensure_loaded("users")
+        return [UserSummary(user.user_id, user.name, user.email, user.user_type)
+                for user in self._users.values() if isinstance(user, user_class)]
+
+    def list_items(self, item_type):
+        print(format_items(item_type, self.items(item_type)))
+
+    def _build_search_index(self):
+        from .search import SearchIndex  # Solo se importa con la primera búsqueda
+
+        self.ensure_loaded("evaluations")
+        self._search_index = SearchIndex()
+        for section, items in (("users", self._users), ("courses", self._courses),
+                               ("evaluations", self._evaluations)):
+            for item_id, item in items.items():
+                self._index_item(section, item_id, item)
+
+    def _search_hit(self, item_id, score):
+        section = KIND_SECTIONS[self._search_index.kind(item_id)]
+        if section == "users":
+            user = self._users[item_id]
+            return SearchHit(section, item_id, user.name, f"{user.email} ({user.user_type})", score)
+        if section == "courses":
+            course = self._courses[item_id]
+            return SearchHit(section, item_id, course.name, course.code, score)
+        evaluation = self._evaluations[item_id]
+        return SearchHit(section, item_id, evaluation.name, evaluation.course_id, score)
+
+    def search(self, query, item_type=None, page=1, page_size=20):
+        """Buscar usuarios (nombre, email), cursos (nombre, código) y evaluaciones (nombre).
+
+        Cada palabra de la consulta puede ser el comienzo de una palabra del
+        campo ("gonz" encuentra "González"); sin coincidencias por prefijo se
+        buscan palabras parecidas, lo que tolera errores de tipeo. item_type
+        limita la búsqueda ("users", "students", "instructors", "courses" o
+        "evaluations"). Devuelve la página pedida (desde 1) como SearchPage,
+        de mayor a menor puntaje.
+        """
+        if item_type is not None and item_type not in SEARCH_TYPES:
+            raise ValueError("Tipo de búsqueda no válido")
+        if page < 1 or page_size < 1:
+            raise ValueError("Página no válida")
+        if self._search_index is None:
+            self._build_search_index()
+        index = self._search_index
+        levels = index.search(query, SEARCH_TYPES.get(item_type))
+        start = (page - 1) * page_size
+        return SearchPage(query, sum(len(documents) for _, documents, _ in levels), page, page_size,
+                          tuple(self._search_hit(item_id, score)
+                                for item_id, score in index.page(levels, start, start + page_size)))
+
+    def show_search_results(self, query, item_type=None, page=1, page_size=20):
+        print(format_search_page(self.search(query, item_type, page, page_size)))
+
+    def gradebook(self, course_id):
+        """Columnas y filas (generador) del libro de calificaciones de un curso.
+
+        Una fila por estudiante inscrito: id, nombre, una columna por evaluación
+        (None si no tiene nota) y el promedio del curso (None sin calificaciones).
+        """
+        if course_id not in self.courses:
+            raise NotFoundError("El curso no existe")
+        self.ensure_loaded("grades")
+        course = self.courses[course_id]
+        evaluation_ids = [evaluation.evaluation_id for evaluation in course.get_course_evaluations(self)]
+        columns = ["student_id", "name", *evaluation_ids, "average"]
+
+        def rows():
+            course_grades = self.grade_store.course(course_id)
+            for student_id in course.enrolled_students:
+                student = self._users[student_id]
+                grades = [course_grades.get(student_id, eval_id) if course_grades else None
+                          for eval_id in evaluation_ids]
+                present = [grade for grade in grades if grade is not None]
+                yield [student_id, student.name, *grades, sum(present) / len(present) if present else None]
+
+        return columns, rows()
+
+    def transcripts(self):
+        """Columnas y filas (generador) de todas las calificaciones de todos los estudiantes"""
+        self.ensure_loaded("grades")
+        columns = ["student_id", "name", "course_id", "course_name", "evaluation_id", "evaluation_name",
+                   "grade", "max_score", "percentage"]
+
+        def rows():
+            for user in self._users.values():
+                if not isinstance(user, Student):
+                    continue
+                for course_id in user.enrolled_courses:
+                    course = self._courses[course_id]
+                    for eval_id, grade in self.grade_store.student_course_grades(user.user_id, course_id).items():
+                        evaluation = self._evaluations[eval_id]
+                        yield [user.user_id, user.name, course_id, course.name, eval_id, evaluation.name,
+                               grade, evaluation.max_score, grade / evaluation.max_score * 100]
+
+        return columns, rows()
+
+    def _export(self, destination, export_format, columns, rows):
+        write = EXPORT_FORMATS.get(export_format)
+        if write is None:
+            raise ValueError(f"Formato no válido: {export_format}")
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, "w", encoding="utf-8", newline="") as file:
+                return write(file, columns, rows)
+        return write(destination, columns, rows)
+
+    def export_gradebook(self, course_id, destination, export_format="csv"):
+        """Exportar el libro de calificaciones a una ruta o archivo abierto ("csv" o "jsonl")"""
+        return self._export(destination, export_format, *self.gradebook(course_id))
+
+    def export_transcripts(self, destination, export_format="csv"):
+        """Exportar las calificaciones de todos los estudiantes ("csv" o "jsonl")"""
+        return self._export(destination, export_format, *self.transcripts())
+
+    @synchronized
+    def clear_all_data(self):
+        """Eliminar todos los datos (la confirmación la pide la interfaz)"""
+        self.load_data()
+        self.storage.clear()
+        self._loaded.update(SECTIONS)
+        from .events import DATA_CLEARED
+
+        self._publish([(DATA_CLEARED, {})])
+
+    def _archive_store(self):
+        directory = self.storage.archive_directory
+        if directory is None:
+            raise ValueError("Este almacenamiento no admite archivos históricos")
+        from .archive import ArchiveStore  # gzip y json solo se importan al archivar o consultar
+
+        return ArchiveStore(directory)
+
+    def _archive_records(self, course, archived_at):
+        """Resumen para el índice y registros de un curso con todo lo que depende de él"""
+        course_id = course.course_id
+        instructor = self._users.get(course.instructor_id)
+        records = [{"type": "course", "course_id": course_id, "name": course.name, "code": course.code,
+                    "instructor_id": course.instructor_id, "instructor_name": getattr(instructor, "name", None),
+                    "archived_at": archived_at}]
+        policy = self._policies.get(course_id)
+        if policy is not None:
+            weights, drop_lowest, bands = policy.to_fields()
+            records.append({"type": "policy", "course_id": course_id, "weights": weights,
+                            "drop_lowest": drop_lowest, "bands": bands})
+        evaluations = course.get_course_evaluations(self)
+        records.extend({"type": "evaluation", "course_id": course_id, "evaluation_id": evaluation.evaluation_id,
+                        "name": evaluation.name, "evaluation_type": evaluation.evaluation_type,
+                        "max_score": evaluation.max_score} for evaluation in evaluations)
+        records.extend({"type": "enrollment", "course_id": course_id, "student_id": student_id,
+                        "name": self._users[student_id].name} for student_id in course.enrolled_students)
+        grade_count = len(records)
+        course_grades = self.grade_store.course(course_id)
+        if course_grades is not None:
+            records.extend({"type": "grade", "course_id": course_id, "student_id": student_id,
+                            "evaluation_id": eval_id, "grade": grade}
+                           for student_id, eval_id, grade in course_grades.iter_grades())
+        grade_count = len(records) - grade_count
+        records.extend({"type": "final_grade", "course_id": course_id, "student_id": student_id,
+                        "percent": final_grade[0], "letter": final_grade[1]}
+                       for student_id, final_grade in self.final_grades(course_id).items())
+        summary = {"name": course.name, "code": course.code, "evaluations": len(evaluations),
+                   "enrollments": len(course.enrolled_students), "grades": grade_count}
+        return summary, records
+
+    def _remove_course(self, course_id):
+        """Quitar de memoria un curso con sus evaluaciones, política, inscripciones y calificaciones"""
+        course = self._courses.pop(course_id)
+        if self._course_codes.get(course.code) == course_id:
+            del self._course_codes[course.code]
+        taught_courses = getattr(self._users.get(course.instructor_id), "taught_courses", None)
+        if taught_courses is not None and course_id in taught_courses:
+            taught_courses.remove(course_id)
+        for eval_id in course.evaluations:
+            evaluation = self._evaluations.pop(eval_id, None)
+            if evaluation is not None:
+                self._evaluation_names.pop((course_id, evaluation.name.lower()), None)
+                if self._search_index is not None:
+                    self._search_index.remove(eval_id)
+        # Las calificaciones viven en el GradeStore: al quitar el bloque del curso desaparecen
+        # de Student.grades y de Evaluation.grades
+        self.grade_store.remove_course(course_id)
+        for student_id in course.enrolled_students:
+            self._users[student_id].remove_course(course_id)
+            self.report_cache.invalidate(("student", student_id))
+        self._policies.pop(course_id, None)
+        self._final_grades.pop(course_id, None)
+        self._grade_matrices.pop(course_id, None)
+        self.report_cache.invalidate(("course", course_id))
+        if self._search_index is not None:
+            self._search_index.remove(course_id)
+        # Los rankings se reconstruyen con la próxima consulta
+        self._ranking = None
+        self._course_rankings = None
+
+    @synchronized
+    def archive_courses(self, name, course_ids):
+        """Archivar cursos terminados (por ejemplo, los de un cuatrimestre) en el archivo histórico `name`.
+
+        Cada curso pasa con sus evaluaciones, política, inscripciones,
+        calificaciones y notas finales a <name>.jsonl.gz (ver
+        course_system.archive) y se quita de los datos en uso, que se
+        compactan: cargar, guardar y recorrer los datos deja de pagar por él.
+        Los usuarios se conservan. Devuelve un ArchiveSummary de lo archivado.
+        """
+        store = self._archive_store()
+        from .archive import validate_name
+
+        validate_name(name)
+        course_ids = list(dict.fromkeys(course_ids))
+        if not course_ids:
+            raise ValueError("No se indicaron cursos para archivar")
+        for course_id in course_ids:
+            if course_id not in self.courses:
+                raise NotFoundError(f"El curso no existe: {course_id}")
+        self.ensure_loaded("grades")
+        archived_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        courses = {course_id: self._archive_records(self._courses[course_id], archived_at)
+                   for course_id in course_ids}
+        # Primero el archivo histórico (con fsync); recién después se quitan de los datos en uso
+        store.write(name, courses)
+        for course_id in course_ids:
+            self._remove_course(course_id)
+        self.storage.snapshot(self._snapshot_records())
+        from .events import COURSES_ARCHIVED
+
+        self._publish([(COURSES_ARCHIVED, {"archive": name, "course_ids": course_ids})])
+        summaries = [summary for summary, _ in courses.values()]
+        print(f"{len(course_ids)} curso(s) archivado(s) en {name}")
+        return ArchiveSummary(name, tuple(course_ids), sum(summary["evaluations"] for summary in summaries),
+                              sum(summary["enrollments"] for summary in summaries),
+                              sum(summary["grades"] for summary in summaries))
+
+    def archives(self):
+        """Archivos históricos como ArchiveSummary, en el orden en que se crearon"""
+        if self.storage.archive_directory is None:
+            return []
+        return [ArchiveSummary(name, tuple(courses), sum(course["evaluations"] for course in courses.values()),
+                               sum(course["enrollments"] for course in courses.values()),
+                               sum(course["grades"] for course in courses.values()))
+                for name, courses in self._archive_store().index().items()]
+
+    def archived_course(self, course_id, archive=None):
+        """Un curso archivado como ArchivedCourse (del último archivo que lo contiene si no se indica)"""
+        store = self._archive_store()
+        archive = archive or store.locate(course_id)
+        records = store.course_records(archive, course_id) if archive else []
+        if not records:
+            raise NotFoundError("El curso no está archivado")
+        course = records[0]
+        evaluations = []
+        students = {}
+        grades = {}
+        final_grades = {}
+        for record in records:
+            kind = record["type"]
+            if kind == "evaluation":
+                evaluations.append(EvaluationSummary(record["evaluation_id"], record["name"],
+                                                     record["evaluation_type"], record["max_score"], None))
+            elif kind == "enrollment":
+                students[record["student_id"]] = record["name"]
+            elif kind == "grade":
+                grades.setdefault(record["evaluation_id"], {})[record["student_id"]] = record["grade"]
+            elif kind == "final_grade":
+                final_grades[record["student_id"]] = (record["percent"], record["letter"])
+        return ArchivedCourse(archive, course_id, course["name"], course["code"], course["instructor_id"],
+                              course["instructor_name"], course["archived_at"], tuple(evaluations), students,
+                              grades, final_grades)
+
+    def show_archived_course(self, course_id, archive=None):
+        try:
+            print(format_archived_course(self.archived_course(course_id, archive)))
+        except ValueError as e:
+            print(e)
+
+    def archived_student_grades(self, student_id):
+        """Calificaciones archivadas de un estudiante como ArchivedGrade, archivo por archivo.
+
+        Solo descomprime los archivos históricos en los que el índice registra
+        calificaciones.
+        """
+        if self.storage.archive_directory is None:
+            return []
+        store = self._archive_store()
+        result = []
+        for name, courses in store.index().items():
+            if not any(course["grades"] for course in courses.values()):
+                continue
+            course_names = {}
+            evaluations = {}
+            found = {}  # {course_id: [ArchivedGrade]}, de la última copia de cada curso
+            for record in store.read(name, "student_id", student_id):
+                kind = record["type"]
+                if kind == "course":
+                    course_names[record["course_id"]] = record["name"]
+                    found.pop(record["course_id"], None)
+                elif kind == "evaluation":
+                    evaluations[record["evaluation_id"]] = record
+                elif kind == "grade" and record["student_id"] == student_id:
+                    evaluation = evaluations[record["evaluation_id"]]
+                    found.setdefault(record["course_id"], []).append(ArchivedGrade(
+                        name, record["course_id"], course_names[record["course_id"]], record["evaluation_id"],
+                        evaluation["name"], record["grade"], evaluation["max_score"]))
+            for grades in found.values():
+                result.extend(grades)
+        return result
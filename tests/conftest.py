@@ -0,0 +1,53 @@
+"""Fixtures compartidas: un sistema con archivos de texto en un directorio temporal"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_system import CourseManagementSystem, SQLiteStorage, TextStorage  # noqa: E402
+
+
+def quiet():
+    """Descartar los mensajes que imprimen las operaciones"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def open_system(directory, backend="text", **options):
+    """Sistema sobre los archivos de texto de directory o sobre directory/cursos.db"""
+    if backend == "sqlite":
+        return CourseManagementSystem(SQLiteStorage(os.path.join(str(directory), "cursos.db")))
+    return CourseManagementSystem(TextStorage(str(directory), **options))
+
+
+def populate(system):
+    """Un instructor, un curso C1 con un examen (E1) y una tarea (E2) y dos estudiantes inscritos"""
+    with quiet():
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        system.create_course("C1", "Curso", "COD1", "I1")
+        system.create_evaluation("E1", "C1", "Parcial", "examen", 100)
+        system.create_evaluation("E2", "C1", "Trabajo", "tarea", 100)
+        for student_id in ("S1", "S2"):
+            system.register_user(student_id, f"Estudiante {student_id}", f"{student_id.lower()}@test.com",
+                                 "estudiante")
+            system.enroll_student(student_id, "C1")
+    return system
+
+
+@pytest.fixture
+def system(tmp_path):
+    """Ver populate(), con archivos de texto"""
+    system = populate(open_system(tmp_path))
+    yield system
+    system.storage.close()
+
+
+@pytest.fixture(params=["text", "sqlite"])
+def any_system(request, tmp_path):
+    """Ver populate(), con cada backend"""
+    system = populate(open_system(tmp_path, request.param))
+    yield system
+    system.storage.close()
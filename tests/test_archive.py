@@ -0,0 +1,103 @@
+"""Archivar cursos y borrar todo: lo quitado no vuelve al recargar, con o sin snapshot binario"""
+import os
+
+import pytest
+
+from conftest import open_system, populate, quiet
+from course_system import NotFoundError
+
+
+@pytest.fixture(params=[False, True], ids=["texto", "snapshot binario"])
+def binary_snapshot(request):
+    return request.param
+
+
+@pytest.fixture
+def system(tmp_path, binary_snapshot):
+    """Ver populate(), más un curso C2 con E3 en el que también está S1, y calificaciones en ambos"""
+    system = populate(open_system(tmp_path, binary_snapshot=binary_snapshot))
+    with quiet():
+        system.create_course("C2", "Curso 2", "COD2", "I1")
+        system.create_evaluation("E3", "C2", "Final", "examen", 50)
+        system.enroll_student("S1", "C2")
+        system.register_grade("S1", "E1", 80)
+        system.register_grade("S2", "E2", 70)
+        system.register_grade("S1", "E3", 40)
+    yield system
+    system.storage.close()
+
+
+def reopen(system, binary_snapshot):
+    system.storage.close()
+    return open_system(system.storage.directory, binary_snapshot=binary_snapshot)
+
+
+def test_archived_course_leaves_the_live_data(system, binary_snapshot):
+    with quiet():
+        summary = system.archive_courses("2024-1", ["C1"])
+    assert summary == ("2024-1", ("C1",), 2, 2, 2)
+    assert "C1" not in system.courses and "E1" not in system.evaluations
+    assert system.users["S1"].grades == {"C2": {"E3": 40.0}}
+    assert list(system.users["S2"].enrolled_courses) == []
+    # Libres otra vez para un curso nuevo
+    with quiet():
+        system.create_course("C3", "Curso", "COD1", "I1")
+
+    reloaded = reopen(system, binary_snapshot)
+    # archive_courses compacta: con snapshot binario, el nuevo ya refleja el archivado
+    assert reloaded.storage.supports_queries == binary_snapshot
+    assert reloaded.course_roster("C2") == ["S1"]
+    assert sorted(reloaded.courses) == ["C2", "C3"]
+    assert sorted(reloaded.users) == ["I1", "S1", "S2"]
+    assert reloaded.users["S1"].grades == {"C2": {"E3": 40.0}}
+    assert reloaded.users["S1"].get_overall_average() == 40
+    assert list(reloaded.users["S1"].enrolled_courses) == ["C2"]
+    reloaded.storage.close()
+
+
+def test_archived_course_can_be_read_back(system, binary_snapshot):
+    with quiet():
+        system.set_grading_policy("C1", {"examen": 0.5, "tarea": 0.5})
+    final_grades = dict(system.final_grades("C1"))
+    with quiet():
+        system.archive_courses("2024-1", ["C1"])
+
+    reloaded = reopen(system, binary_snapshot)
+    course = reloaded.archived_course("C1")
+    assert (course.archive, course.name, course.code, course.instructor_name) == ("2024-1", "Curso", "COD1",
+                                                                                 "Instructor")
+    assert [evaluation.evaluation_id for evaluation in course.evaluations] == ["E1", "E2"]
+    assert course.students == {"S1": "Estudiante S1", "S2": "Estudiante S2"}
+    assert course.grades == {"E1": {"S1": 80.0}, "E2": {"S2": 70.0}}
+    assert course.final_grades == {student_id: tuple(grade) for student_id, grade in final_grades.items()}
+    assert [(grade.course_id, grade.evaluation_id, grade.grade) for grade in
+            reloaded.archived_student_grades("S1")] == [("C1", "E1", 80.0)]
+    assert [(archive.name, archive.courses) for archive in reloaded.archives()] == [("2024-1", ("C1",))]
+    with pytest.raises(NotFoundError):
+        reloaded.archived_course("C2")
+    reloaded.storage.close()
+
+
+def test_archive_rejects_unknown_courses_and_names(system):
+    with pytest.raises(NotFoundError):
+        system.archive_courses("2024-1", ["C9"])
+    with pytest.raises(ValueError):
+        system.archive_courses("../fuera", ["C1"])
+    assert system.archives() == []
+    assert "C1" in system.courses
+
+
+def test_clear_all_data_survives_reload(system, binary_snapshot):
+    system.save_data()
+    assert os.path.exists(os.path.join(system.storage.directory, "snapshot.bin")) == binary_snapshot
+    system.clear_all_data()
+    assert system.users == {} and system.courses == {}
+
+    reloaded = reopen(system, binary_snapshot)
+    # Un snapshot binario de antes del borrado no puede volver a cargarse
+    assert not reloaded.storage.supports_queries
+    assert reloaded.users == {} and reloaded.courses == {} and reloaded.evaluations == {}
+    with quiet():
+        reloaded.register_user("S1", "Otro", "otro@test.com", "estudiante")
+    assert reloaded.users["S1"].grades == {}
+    reloaded.storage.close()
@@ -0,0 +1,97 @@
+"""Caché de reportes: cada escritura descarta solo los reportes que cambia"""
+import pytest
+
+from conftest import quiet
+from course_system import NotFoundError, ReportCache
+
+# (estudiante o curso, variante): los reportes que se piden antes y después de cada escritura
+REPORTS = [("S1", None), ("S1", "C1"), ("S2", None), ("C1", None), ("C2", None)]
+
+
+@pytest.fixture
+def system(system):
+    """El sistema de conftest, más un curso C2 con E3 en el que solo está S1"""
+    with quiet():
+        system.create_course("C2", "Curso 2", "COD2", "I1")
+        system.create_evaluation("E3", "C2", "Final", "examen", 50)
+        system.enroll_student("S1", "C2")
+        system.register_grade("S1", "E1", 80)
+    return system
+
+
+def report(system, item_id, variant):
+    if item_id.startswith("S"):
+        return system.student_report(item_id, variant)
+    return system.course_report(item_id)
+
+
+def rebuilt_after(system, write):
+    """Reportes que vuelven a construirse después de write(), con todos en caché antes"""
+    for item_id, variant in REPORTS:
+        report(system, item_id, variant)
+    with quiet():
+        write()
+    rebuilt = []
+    for item_id, variant in REPORTS:
+        misses = system.report_cache.misses
+        try:
+            report(system, item_id, variant)
+        except NotFoundError:
+            pass  # Un curso archivado deja de existir
+        if system.report_cache.misses > misses:
+            rebuilt.append((item_id, variant))
+    return rebuilt
+
+
+def test_reports_are_served_from_the_cache(system):
+    first = system.student_report("S1", "C1")
+    assert system.student_report("S1", "C1") is first
+    assert system.report_cache.stats()["hits"] == 1
+
+
+def test_grade_invalidates_its_student_and_course(system):
+    before = system.student_report("S1", "C1")
+    assert rebuilt_after(system, lambda: system.register_grade("S1", "E2", 60)) == [
+        ("S1", None), ("S1", "C1"), ("C1", None)]
+    assert system.student_report("S1", "C1") != before
+
+
+def test_enrollment_invalidates_its_student_and_course(system):
+    assert rebuilt_after(system, lambda: system.enroll_student("S2", "C2")) == [("S2", None), ("C2", None)]
+    assert [course.course_id for course in system.student_report("S2").courses] == ["C1", "C2"]
+
+
+def test_evaluation_invalidates_only_its_course(system):
+    assert rebuilt_after(system, lambda: system.create_evaluation("E4", "C2", "Extra", "tarea", 10)) == [
+        ("C2", None)]
+    assert [evaluation.evaluation_id for evaluation in system.course_report("C2").evaluations] == ["E3", "E4"]
+
+
+def test_policy_invalidates_the_course_and_its_students(system):
+    assert rebuilt_after(system, lambda: system.set_grading_policy("C1", {"examen": 1})) == [
+        ("S1", None), ("S1", "C1"), ("S2", None), ("C1", None)]
+
+
+def test_new_user_and_rejected_writes_keep_every_report(system):
+    assert rebuilt_after(system, lambda: system.register_user("S3", "Estudiante S3", "s3@test.com",
+                                                              "estudiante")) == []
+    with pytest.raises(ValueError):
+        system.register_grade("S2", "E3", 10)  # S2 no está inscrito en C2
+    assert rebuilt_after(system, lambda: None) == []
+
+
+def test_archive_invalidates_the_course_and_its_students(system):
+    # Invalidar al estudiante descarta todas sus variantes, también la de C1
+    assert rebuilt_after(system, lambda: system.archive_courses("2024-1", ["C2"])) == [
+        ("S1", None), ("S1", "C1"), ("C2", None)]
+    assert [course.course_id for course in system.student_report("S1").courses] == ["C1"]
+
+
+def test_cache_is_bounded():
+    cache = ReportCache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.put(key, None, key.upper())
+    # "a" se usó después de "b": se desaloja "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1, "entries": 2, "max_entries": 2}
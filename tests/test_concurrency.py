@@ -0,0 +1,11 @@
+"""Prueba de estrés de benchmarks/bench_concurrency.py con parámetros chicos, en ambos backends"""
+import pytest
+
+from benchmarks import bench_concurrency
+
+
+@pytest.mark.parametrize("backend", ["text", "sqlite"])
+def test_processes_lose_no_grades(backend, tmp_path, monkeypatch):
+    # El script trabaja sobre el directorio actual, como en su main()
+    monkeypatch.chdir(tmp_path)
+    assert bench_concurrency.run(backend, workers=3, per_worker=120)
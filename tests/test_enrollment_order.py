@@ -0,0 +1,81 @@
+"""El orden de inscripción de estudiantes y cursos se conserva al guardar y volver a cargar"""
+import random
+
+import pytest
+
+from conftest import open_system, populate, quiet
+
+
+@pytest.fixture(params=[False, True], ids=["texto", "snapshot binario"])
+def binary_snapshot(request):
+    return request.param
+
+
+@pytest.fixture
+def system(tmp_path, binary_snapshot):
+    """El sistema de conftest, guardando también el snapshot binario si corresponde"""
+    system = populate(open_system(tmp_path, binary_snapshot=binary_snapshot))
+    yield system
+    system.storage.close()
+
+
+def reopen(tmp_path, binary_snapshot, expected_courses):
+    """Volver a abrir; con snapshot binario, los rosters se consultan primero sobre el archivo"""
+    reloaded = open_system(tmp_path, binary_snapshot=binary_snapshot)
+    if binary_snapshot:
+        assert reloaded.storage.supports_queries
+        assert {course_id: reloaded.course_roster(course_id) for course_id in expected_courses} == expected_courses
+        assert "enrollments" not in reloaded._loaded
+    return reloaded
+
+
+def test_save_data_keeps_student_and_course_order(system, tmp_path, binary_snapshot):
+    with quiet():
+        system.create_course("C2", "Curso 2", "COD2", "I1")
+        system.create_course("C3", "Curso 3", "COD3", "I1")
+        system.register_user("S3", "Estudiante S3", "s3@test.com", "estudiante")
+        # S3 se inscribe en C3 antes que en C2 y C1; S2 llega a C2 después que S3
+        for student_id, course_id in (("S3", "C3"), ("S3", "C2"), ("S2", "C2"), ("S1", "C3"),
+                                      ("S2", "C3"), ("S3", "C1")):
+            system.enroll_student(student_id, course_id)
+    expected_students = {student_id: list(system.users[student_id].enrolled_courses)
+                         for student_id in ("S1", "S2", "S3")}
+    expected_courses = {course_id: system.course_roster(course_id) for course_id in ("C1", "C2", "C3")}
+    assert expected_students["S3"] == ["C3", "C2", "C1"]
+
+    system.save_data()
+    reloaded = reopen(tmp_path, binary_snapshot, expected_courses)
+    try:
+        assert {student_id: list(reloaded.users[student_id].enrolled_courses)
+                for student_id in expected_students} == expected_students
+        assert {course_id: reloaded.course_roster(course_id) for course_id in expected_courses} == expected_courses
+        report = reloaded.student_report("S3")
+        assert [course.course_id for course in report.courses] == ["C3", "C2", "C1"]
+    finally:
+        reloaded.storage.close()
+
+
+def test_random_enrollments_survive_reload(system, tmp_path, binary_snapshot):
+    rng = random.Random(3)
+    courses = [f"C{c}" for c in range(2, 8)]
+    students = [f"S{s}" for s in range(3, 20)]
+    with quiet():
+        for course_id in courses:
+            system.create_course(course_id, f"Curso {course_id}", f"COD{course_id}", "I1")
+        for student_id in students:
+            system.register_user(student_id, f"Estudiante {student_id}", f"{student_id.lower()}@test.com",
+                                 "estudiante")
+        pairs = [(student_id, course_id) for student_id in students for course_id in courses if rng.random() < 0.5]
+        rng.shuffle(pairs)
+        for student_id, course_id in pairs:
+            system.enroll_student(student_id, course_id)
+    expected = ({student_id: list(system.users[student_id].enrolled_courses) for student_id in students},
+                {course_id: system.course_roster(course_id) for course_id in courses})
+
+    system.save_data()
+    reloaded = reopen(tmp_path, binary_snapshot, expected[1])
+    try:
+        assert ({student_id: list(reloaded.users[student_id].enrolled_courses) for student_id in students},
+                {course_id: reloaded.course_roster(course_id) for course_id in courses}) == expected
+    finally:
+        reloaded.storage.close()
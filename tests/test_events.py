@@ -0,0 +1,83 @@
+"""Eventos de cambio: offsets del changefeed entre instancias y suscriptores con cola acotada"""
+import pytest
+
+from conftest import open_system, quiet
+
+
+def grade(system, student_id, evaluation_id, value):
+    with quiet():
+        system.register_grade(student_id, evaluation_id, value)
+
+
+def test_changefeed_numbers_every_persisted_change(system):
+    events = system.read_changes()
+    assert [event.offset for event in events] == list(range(1, len(events) + 1))
+    assert [event.type for event in events[:4]] == ["user_registered", "course_created", "evaluation_created",
+                                                    "evaluation_created"]
+    last = events[-1].offset
+    grade(system, "S1", "E1", 80)
+    with pytest.raises(ValueError):
+        system.register_grade("S1", "E1", 500)
+    # La calificación rechazada no llegó a publicarse
+    [event] = system.read_changes(last)
+    assert (event.offset, event.type) == (last + 1, "grade_registered")
+    assert event.data == {"student_id": "S1", "course_id": "C1", "evaluation_id": "E1", "grade": 80}
+
+
+def test_read_changes_since_offset_and_limit(system):
+    for value in range(5):
+        grade(system, "S1", "E1", value)
+    events = system.read_changes()
+    middle = events[len(events) // 2].offset
+    assert system.read_changes(middle) == [event for event in events if event.offset > middle]
+    assert system.read_changes(middle, limit=2) == [event for event in events if event.offset > middle][:2]
+    assert system.read_changes(events[-1].offset) == []
+    for since, limit in ((-1, None), (0, 0)):
+        with pytest.raises(ValueError):
+            system.read_changes(since, limit)
+
+
+def test_offsets_continue_across_instances(system, tmp_path):
+    other = open_system(tmp_path)
+    grade(system, "S1", "E1", 10)
+    grade(other, "S2", "E1", 20)
+    grade(system, "S1", "E2", 30)
+    events = system.read_changes()
+    assert [event.offset for event in events] == list(range(1, len(events) + 1))
+    assert [(event.data["student_id"], event.data["grade"]) for event in events[-3:]] == [("S1", 10), ("S2", 20),
+                                                                                          ("S1", 30)]
+    other.storage.close()
+
+
+def test_incomplete_last_line_is_skipped_and_repaired(system):
+    last = system.read_changes()[-1].offset
+    with open(system.storage.changefeed_path, "ab") as file:
+        file.write(b'{"offset": ')
+    assert system.read_changes()[-1].offset == last
+    grade(system, "S1", "E1", 90)
+    assert [event.offset for event in system.read_changes(last)] == [last + 1]
+
+
+def test_bounded_subscriber_that_falls_behind_drops_and_recovers(system):
+    slow = system.subscribe(maxsize=2)
+    grades_only = system.subscribe(types=["grade_registered"])
+    for value in range(5):
+        grade(system, "S1", "E1", value)
+    with quiet():
+        system.create_evaluation("E3", "C1", "Recuperatorio", "examen", 100)
+
+    received = slow.drain()
+    assert [event.data["grade"] for event in received] == [0, 1]
+    assert slow.dropped == 4
+    assert slow.last_dropped == system.read_changes()[-1].offset
+    # Lo descartado se recupera del changefeed desde el último offset procesado
+    missed = system.read_changes(received[-1].offset)
+    assert [event.type for event in missed] == ["grade_registered"] * 3 + ["evaluation_created"]
+    assert [event.data["grade"] for event in grades_only.drain()] == [0, 1, 2, 3, 4]
+
+    system.unsubscribe(slow)
+    grade(system, "S2", "E1", 50)
+    assert len(slow) == 0
+    assert grades_only.get(timeout=0).data["student_id"] == "S2"
+    with pytest.raises(ValueError):
+        system.subscribe(types=["grade_deleted"])
@@ -0,0 +1,43 @@
+"""Validación de calificaciones: NaN e infinitos no pueden entrar al GradeStore"""
+import math
+
+import pytest
+
+from conftest import quiet
+
+NON_FINITE = [math.nan, math.inf, -math.inf]
+
+
+@pytest.mark.parametrize("grade", NON_FINITE)
+def test_register_grade_rejects_non_finite(system, grade):
+    with quiet():
+        system.register_grade("S1", "E1", 40)
+    with pytest.raises(ValueError, match="finito"):
+        system.register_grade("S1", "E1", grade)
+    with pytest.raises(ValueError, match="finito"):
+        system.register_grade("S2", "E1", grade)
+
+    evaluation = system.evaluations["E1"]
+    assert len(evaluation.grades) == len(list(evaluation.grades)) == 1
+    assert system.users["S1"].get_overall_average() == 40
+    assert system.users["S2"].get_overall_average() == 0
+    assert [student.user_id for student, _ in system.low_performance_students(60)] == ["S1"]
+
+
+@pytest.mark.parametrize("text", ["nan", "NaN", "inf", "-inf", "Infinity"])
+def test_import_grades_rejects_non_finite(system, text):
+    imported, errors = system.import_grades([("S1", "E1", text), ("S2", "E1", "75")])
+    assert imported == 1
+    assert [row for row, _ in errors] == [1]
+    assert dict(system.evaluations["E1"].grades) == {"S2": 75.0}
+
+
+def test_overwrite_after_rejected_grade_keeps_totals(system):
+    with quiet():
+        system.register_grade("S1", "E1", 30)
+        with pytest.raises(ValueError):
+            system.register_grade("S1", "E1", math.nan)
+        system.register_grade("S1", "E1", 50)
+    student = system.users["S1"]
+    assert student.get_overall_average() == 50
+    assert student.get_course_average("C1") == 50
@@ -0,0 +1,97 @@
+"""Carga diferida: las propiedades públicas nunca devuelven objetos a medio cargar"""
+import pytest
+
+from conftest import open_system, populate, quiet
+
+
+def reopen(system):
+    directory = system.storage.directory
+    system.storage.close()
+    return open_system(directory)
+
+
+def reopen_queryable(tmp_path, backend):
+    """Abrir un backend que responde consultas sin cargar las secciones: SQLite o texto con snapshot binario"""
+    if backend == "sqlite":
+        return open_system(tmp_path, "sqlite")
+    system = open_system(tmp_path, binary_snapshot=True)
+    assert system.storage.supports_queries
+    return system
+
+
+@pytest.fixture(params=["sqlite", "snapshot binario"])
+def backend(request, tmp_path):
+    """Ver populate(), guardado en el backend indicado"""
+    system = populate(open_system(tmp_path, "sqlite") if request.param == "sqlite"
+                      else open_system(tmp_path, binary_snapshot=True))
+    system.save_data()
+    system.storage.close()
+    return request.param
+
+
+def test_fresh_instance_sees_enrollments_and_grades(system):
+    with quiet():
+        system.register_grade("S1", "E1", 80)
+        system.register_grade("S1", "E2", 60)
+    system = reopen(system)
+    student = system.users["S1"]
+    assert list(student.enrolled_courses) == ["C1"]
+    assert student.grades == {"C1": {"E1": 80.0, "E2": 60.0}}
+    assert student.get_overall_average() == 70
+    assert list(system.courses["C1"].enrolled_students) == ["S1", "S2"]
+    assert dict(system.evaluations["E1"].grades) == {"S1": 80.0}
+    system.storage.close()
+
+
+def test_listings_and_validations_do_not_read_grades(system):
+    system = reopen(system)
+    assert [course.course_id for course in system.items("courses")] == ["C1"]
+    assert [user.user_id for user in system.items("students")] == ["S1", "S2"]
+    with quiet():
+        system.register_user("S3", "Estudiante S3", "s3@test.com", "estudiante")
+    assert "grades" not in system._loaded
+    system.storage.close()
+
+
+def test_writes_validate_against_the_backend(tmp_path, backend):
+    system = reopen_queryable(tmp_path, backend)
+    with quiet():
+        system.register_user("S3", "Estudiante S3", "s3@test.com", "estudiante")
+        system.enroll_student("S3", "C1")
+    assert "enrollments" not in system._loaded
+    with quiet():
+        system.register_grade("S1", "E1", 80)
+    # Con texto, la inscripción ya quedó en el journal y el snapshot dejó de alcanzar para consultar
+    assert ("grades" in system._loaded) == (backend != "sqlite")
+    with pytest.raises(ValueError, match="no existe"):
+        system.register_grade("S4", "E1", 50)
+    with quiet():
+        system.register_user("S4", "Estudiante S4", "s4@test.com", "estudiante")
+    with pytest.raises(ValueError, match="no está inscrito"):
+        system.register_grade("S4", "E1", 50)
+    assert system.import_enrollments([("S4", "C1"), ("S4", "C1")]) == (1, [(2, "El estudiante ya está inscrito")])
+    with quiet():
+        system.register_grade("S4", "E2", 70)
+    assert system.users["S1"].grades == {"C1": {"E1": 80.0}}
+    assert system.users["S4"].grades == {"C1": {"E2": 70.0}}
+    assert list(system.courses["C1"].enrolled_students) == ["S1", "S2", "S3", "S4"]
+    system.storage.close()
+
+
+def test_batch_applies_unloaded_writes_when_the_section_loads(tmp_path, backend):
+    system = reopen_queryable(tmp_path, backend)
+    with quiet(), system.batch():
+        system.register_user("S3", "Estudiante S3", "s3@test.com", "estudiante")
+        system.enroll_student("S3", "C1")
+        system.register_grade("S3", "E1", 90)
+        assert "grades" not in system._loaded
+        # Todavía en el lote, sin llegar al almacenamiento: la carga tiene que incluirlos igual
+        assert system.users["S3"].grades == {"C1": {"E1": 90.0}}
+        system.register_grade("S3", "E1", 95)
+    assert list(system.courses["C1"].enrolled_students) == ["S1", "S2", "S3"]
+    system.storage.close()
+
+    reloaded = open_system(tmp_path, "sqlite") if backend == "sqlite" else open_system(tmp_path)
+    assert list(reloaded.courses["C1"].enrolled_students) == ["S1", "S2", "S3"]
+    assert reloaded.users["S3"].grades == {"C1": {"E1": 95.0}}
+    reloaded.storage.close()
@@ -0,0 +1,30 @@
+"""Rankings de estudiantes por promedio"""
+import pytest
+
+from conftest import quiet
+
+
+@pytest.fixture
+def graded(system):
+    with quiet():
+        system.register_grade("S1", "E1", 80)
+        system.register_grade("S2", "E1", 50)
+    return system
+
+
+def ids(ranking):
+    return [student.user_id for student, _ in ranking]
+
+
+@pytest.mark.parametrize("course_id", [None, "C1"])
+def test_rankings_order(graded, course_id):
+    assert ids(graded.top_students(1, course_id)) == ["S1"]
+    assert ids(graded.bottom_students(1, course_id)) == ["S2"]
+    assert ids(graded.top_students(5, course_id)) == ["S1", "S2"]
+    assert ids(graded.bottom_students(5, course_id)) == ["S2", "S1"]
+
+
+@pytest.mark.parametrize("n", [0, -1, -5])
+def test_rankings_with_non_positive_n_are_empty(graded, n):
+    assert graded.top_students(n) == []
+    assert graded.bottom_students(n) == []
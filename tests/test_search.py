@@ -0,0 +1,79 @@
+"""Búsqueda: prefijos, errores de tipeo por trigramas y páginas estables"""
+import pytest
+
+from conftest import quiet
+
+
+def ids(page):
+    return [hit.item_id for hit in page.hits]
+
+
+@pytest.fixture
+def system(system):
+    """El sistema de conftest, más dos estudiantes con nombres parecidos y un curso con nombre compuesto"""
+    with quiet():
+        system.register_user("S3", "José González", "jgonzalez@uni.edu", "estudiante")
+        system.register_user("S4", "Josefina Pérez", "jperez@uni.edu", "estudiante")
+        system.create_course("C2", "Cursos avanzados", "AV-2", "I1")
+    return system
+
+
+def test_prefix_matches_ignore_case_and_accents(system):
+    assert ids(system.search("gonz")) == ["S3"]
+    assert ids(system.search("PEREZ")) == ["S4"]
+    # La palabra exacta puntúa más que el prefijo de una más larga
+    page = system.search("jose")
+    assert ids(page) == ["S3", "S4"]
+    assert page.hits[0].score > page.hits[1].score
+    assert ids(system.search("jose gonz")) == ["S3"]
+    assert ids(system.search("av 2")) == ["C2"]
+
+
+def test_typos_match_through_shared_trigrams(system):
+    page = system.search("gonzales")
+    assert ids(page) == ["S3"]
+    assert 0 < page.hits[0].score < system.search("gonzalez").hits[0].score
+    assert ids(system.search("josefna")) == ["S4"]
+    # Sin trigramas suficientes en común, o con palabras demasiado cortas, no hay resultado
+    assert ids(system.search("xyzzy")) == []
+    assert ids(system.search("gz")) == []
+
+
+def test_item_type_limits_the_results(system):
+    assert {hit.section for hit in system.search("curso").hits} == {"courses"}
+    assert ids(system.search("curso", "courses")) == ["C1", "C2"]
+    assert ids(system.search("test", "instructors")) == ["I1"]
+    assert ids(system.search("test", "students")) == ["S1", "S2"]
+    assert ids(system.search("parcial", "users")) == []
+    with pytest.raises(ValueError):
+        system.search("curso", "notas")
+
+
+def test_pages_split_the_ordered_results(system):
+    with quiet(), system.batch():
+        for number in range(5, 30):
+            system.register_user(f"S{number:02}", f"Estudiante {number}", f"s{number}@test.com", "estudiante")
+    everything = system.search("estudiante", page_size=100)
+    assert everything.total == 27
+    pages = [system.search("estudiante", page=page, page_size=10) for page in (1, 2, 3, 4)]
+    assert [page.total for page in pages] == [27] * 4
+    assert [len(page.hits) for page in pages] == [10, 10, 7, 0]
+    assert [hit for page in pages for hit in page.hits] == list(everything.hits)
+    # A igual puntaje, por id
+    assert ids(everything) == sorted(ids(everything))
+    for page, page_size in ((0, 10), (1, 0)):
+        with pytest.raises(ValueError):
+            system.search("estudiante", page=page, page_size=page_size)
+
+
+def test_index_follows_later_writes(system):
+    assert ids(system.search("martina")) == []
+    with quiet():
+        system.register_user("S5", "Martina Gómez", "mgomez@uni.edu", "estudiante")
+        system.create_evaluation("E3", "C2", "Proyecto final", "tarea", 100)
+    assert ids(system.search("martina")) == ["S5"]
+    assert ids(system.search("proyecto")) == ["E3"]
+    with quiet():
+        system.archive_courses("2024-1", ["C2"])
+    assert ids(system.search("proyecto")) == []
+    assert ids(system.search("avanzados")) == []
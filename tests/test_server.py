@@ -0,0 +1,92 @@
+"""Servidor HTTP: validación en el borde, códigos de estado y lote de escrituras fuera del bucle"""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from conftest import open_system
+from course_system import SQLiteStorage
+from course_system.server import CourseServer
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+                 .encode("latin-1") + data)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def serve(system, *requests):
+    """Respuestas (estado, JSON) a las peticiones (método, ruta[, cuerpo]), en orden"""
+    async def run():
+        server = CourseServer(system, port=0)
+        await server.start()
+        try:
+            return [await request(server.port, *args) for args in requests]
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("grade", ["NaN", "nan", "inf", "-Infinity"])
+def test_non_finite_grade_is_rejected(any_system, grade):
+    [(status, payload)] = serve(any_system, ("POST", "/grades", {"student_id": "S1", "evaluation_id": "E1",
+                                                             "grade": grade}))
+    assert status == 400 and "grade" in payload["error"]
+    assert len(any_system.evaluations["E1"].grades) == 0
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("GET", "/students/S9/grades", None),
+    ("GET", "/courses/C9", None),
+    ("GET", "/archives/courses/C1", None),
+    ("POST", "/grades", {"student_id": "S9", "evaluation_id": "E1", "grade": 50}),
+    ("POST", "/grades", {"student_id": "S1", "evaluation_id": "E9", "grade": 50}),
+    ("POST", "/enrollments", {"student_id": "S1", "course_id": "C9"}),
+])
+def test_missing_items_are_not_found(any_system, method, path, body):
+    [(status, payload)] = serve(any_system, (method, path, body))
+    assert status == 404, payload
+
+
+def test_invalid_values_are_bad_requests(any_system):
+    [(status, _)] = serve(any_system, ("POST", "/grades", {"student_id": "S1", "evaluation_id": "E1", "grade": 500}))
+    assert status == 400
+
+
+def test_writes_run_outside_the_event_loop_thread(any_system):
+    threads = []
+    register_grade = any_system.register_grade
+
+    def recorded(*args):
+        threads.append(threading.get_ident())
+        return register_grade(*args)
+
+    any_system.register_grade = recorded
+    responses = serve(any_system, ("POST", "/grades", {"student_id": "S1", "evaluation_id": "E1", "grade": 70}),
+                      ("GET", "/students/S1/grades"))
+    assert [status for status, _ in responses] == [200, 200]
+    assert threads and threading.get_ident() not in threads
+    assert responses[1][1]["overall_average"] == 70
+
+
+def test_batches_persist_across_requests(any_system, tmp_path):
+    # Peticiones en serie: cada una es su propio lote en el hilo escritor
+    responses = serve(any_system, *[("POST", "/grades", {"student_id": student_id, "evaluation_id": evaluation_id,
+                                                         "grade": grade})
+                                    for student_id, evaluation_id, grade in (("S1", "E1", 80), ("S1", "E2", 60),
+                                                                             ("S2", "E1", 40))])
+    assert [status for status, _ in responses] == [200, 200, 200]
+
+    reloaded = open_system(tmp_path, "sqlite" if isinstance(any_system.storage, SQLiteStorage) else "text")
+    try:
+        assert reloaded.student_grades("S1") == {"C1": {"E1": 80, "E2": 60}}
+        assert reloaded.student_grades("S2") == {"C1": {"E1": 40}}
+    finally:
+        reloaded.storage.close()
@@ -0,0 +1,79 @@
+"""Snapshot binario: guardar y volver a cargar da el mismo estado, y uno vencido se ignora"""
+import pytest
+
+from conftest import open_system, populate, quiet
+
+
+@pytest.fixture
+def saved(tmp_path):
+    """Ver populate(), con calificaciones y una política, guardado con snapshot binario"""
+    system = populate(open_system(tmp_path, binary_snapshot=True))
+    with quiet():
+        system.register_grade("S1", "E1", 80)
+        system.register_grade("S1", "E2", 60.5)
+        system.register_grade("S2", "E2", 90)
+        system.set_grading_policy("C1", {"examen": 0.5, "tarea": 0.5})
+    system.save_data()
+    system.storage.close()
+    return tmp_path
+
+
+def state(system):
+    return {
+        "users": {user_id: str(user) for user_id, user in system.users.items()},
+        "courses": {course_id: (str(course), list(course.enrolled_students), course.evaluations)
+                    for course_id, course in system.courses.items()},
+        "grades": {user_id: user.grades for user_id, user in system.users.items() if user_id.startswith("S")},
+        "averages": {user_id: user.get_overall_average() for user_id, user in system.users.items()
+                     if user_id.startswith("S")},
+        "final_grades": dict(system.final_grades("C1")),
+    }
+
+
+def test_round_trip_matches_the_text_files(saved):
+    from_snapshot = open_system(saved, binary_snapshot=True)
+    assert from_snapshot.storage.supports_queries
+    # Las consultas directas leen el archivo mapeado sin cargar las calificaciones
+    assert from_snapshot.student_grades("S1") == {"C1": {"E1": 80.0, "E2": 60.5}}
+    assert from_snapshot.course_grades("C1") == {"E1": {"S1": 80.0}, "E2": {"S1": 60.5, "S2": 90.0}}
+    assert from_snapshot.course_roster("C1") == ["S1", "S2"]
+    assert "grades" not in from_snapshot._loaded
+
+    (saved / "snapshot.bin").rename(saved / "snapshot.bak")
+    from_text = open_system(saved)
+    assert not from_text.storage.supports_queries
+    assert state(from_snapshot) == state(from_text)
+    from_snapshot.storage.close()
+    from_text.storage.close()
+
+
+def test_writes_after_the_snapshot_are_loaded_on_top(saved):
+    system = open_system(saved, binary_snapshot=True)
+    with quiet():
+        system.register_grade("S2", "E1", 70)
+    system.storage.close()
+
+    reloaded = open_system(saved, binary_snapshot=True)
+    # Con calificaciones en el journal el snapshot ya no alcanza para consultar, pero se sigue usando
+    assert not reloaded.storage.supports_queries
+    assert reloaded.users["S2"].grades == {"C1": {"E1": 70.0, "E2": 90.0}}
+    assert reloaded.users["S2"].get_overall_average() == 80
+    reloaded.storage.close()
+
+
+def test_snapshot_is_ignored_after_editing_a_text_file(saved):
+    with open(saved / "users.txt", "a", encoding="utf-8") as file:
+        file.write("S9|Estudiante S9|s9@test.com|estudiante\n")
+    system = open_system(saved, binary_snapshot=True)
+    assert not system.storage.supports_queries
+    assert "S9" in system.users
+    assert system.users["S1"].grades == {"C1": {"E1": 80.0, "E2": 60.5}}
+    system.storage.close()
+
+
+def test_invalid_snapshot_falls_back_to_the_text_files(saved):
+    (saved / "snapshot.bin").write_bytes(b"no es un snapshot")
+    system = open_system(saved, binary_snapshot=True)
+    assert not system.storage.supports_queries
+    assert system.users["S2"].grades == {"C1": {"E2": 90.0}}
+    system.storage.close()
@@ -0,0 +1,84 @@
+"""SQLite entre procesos: ponerse al día leyendo solo las filas nuevas de changes"""
+import pytest
+
+from conftest import open_system, populate, quiet
+
+
+@pytest.fixture
+def pair(tmp_path):
+    """Dos sistemas sobre la misma base, como dos procesos; el primero con todo cargado"""
+    first = populate(open_system(tmp_path, "sqlite"))
+    first.ensure_loaded("grades")
+    second = open_system(tmp_path, "sqlite")
+    reloads = []
+    load_data = first.load_data
+    first.load_data = lambda: (reloads.append(True), load_data())
+    yield first, second, reloads
+    first.storage.close()
+    second.storage.close()
+
+
+def test_catch_up_applies_only_new_rows(pair):
+    first, second, reloads = pair
+    with quiet():
+        second.register_grade("S1", "E1", 80)
+        second.register_user("S3", "Estudiante S3", "s3@test.com", "estudiante")
+        second.enroll_student("S3", "C1")
+        second.register_grade("S3", "E2", 55)
+        second.register_grade("S1", "E1", 90)
+
+    with quiet():
+        first.register_grade("S2", "E1", 70)  # Toma el lock y se pone al día
+    assert reloads == []
+    assert first.users["S1"].get_course_grades("C1") == {"E1": 90}
+    assert first.users["S3"].get_course_grades("C1") == {"E2": 55}
+    assert first.course_roster("C1") == ["S1", "S2", "S3"]
+
+    # Lo propio no vuelve a aplicarse y el otro ve la nota de first en su próxima operación
+    with quiet():
+        second.register_grade("S1", "E2", 60)
+        first.register_grade("S2", "E2", 65)
+        second.register_grade("S3", "E1", 45)
+    assert reloads == []
+    assert second.student_grades("S2") == {"C1": {"E1": 70, "E2": 65}}
+    assert first.users["S1"].get_overall_average() == 75
+    assert len(first.evaluations["E2"].grades) == 3
+
+
+def test_unread_sections_are_read_from_the_tables(tmp_path):
+    writer = populate(open_system(tmp_path, "sqlite"))
+    reader = open_system(tmp_path, "sqlite")
+    try:
+        reader.ensure_loaded("users")
+        with quiet():
+            writer.register_user("S3", "Estudiante S3", "s3@test.com", "estudiante")
+            writer.register_grade("S1", "E1", 40)
+            reader.register_user("S4", "Estudiante S4", "s4@test.com", "estudiante")
+        # La calificación llega al leer grades, una sola vez
+        assert reader.users["S1"].get_course_grades("C1") == {"E1": 40}
+        assert len(reader.evaluations["E1"].grades) == 1
+        assert sorted(reader.users) == ["I1", "S1", "S2", "S3", "S4"]
+    finally:
+        writer.storage.close()
+        reader.storage.close()
+
+
+def test_snapshot_or_pruned_rows_force_a_reload(pair):
+    first, second, reloads = pair
+    with quiet():
+        second.register_grade("S1", "E1", 80)
+    second.save_data()
+    first.student_grades("S1")
+    with quiet():
+        first.register_grade("S2", "E1", 10)
+    assert reloads == [True]
+    assert first.users["S1"].get_course_grades("C1") == {"E1": 80}
+
+    second.storage.CHANGE_LOG_LIMIT = 4
+    with quiet():
+        for grade in range(10):
+            second.register_grade("S1", "E2", grade)
+        first.register_grade("S2", "E1", 20)
+    assert reloads == [True, True]
+    assert first.users["S1"].get_course_grades("C1") == {"E1": 80, "E2": 9}
+    assert first.users["S2"].get_course_grades("C1") == {"E1": 20}
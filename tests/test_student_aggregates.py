@@ -0,0 +1,115 @@
+"""Los acumulados de Student coinciden con recalcular los promedios desde las calificaciones"""
+import random
+
+import pytest
+
+from conftest import open_system, populate, quiet
+from course_system import GradeStore, Student
+
+COURSES = ["C1", "C2", "C3"]
+EVALUATIONS = ["E1", "E2", "E3", "E4"]
+
+
+def recomputed(student):
+    """(promedios por curso, promedio general) recalculados con get_course_grades()"""
+    averages = {}
+    every_grade = []
+    for course_id in COURSES:
+        grades = list(student.get_course_grades(course_id).values())
+        averages[course_id] = sum(grades) / len(grades) if grades else 0
+        every_grade.extend(grades)
+    return averages, sum(every_grade) / len(every_grade) if every_grade else 0
+
+
+def assert_matches(student):
+    averages, overall = recomputed(student)
+    for course_id, average in averages.items():
+        assert student.get_course_average(course_id) == pytest.approx(average, abs=1e-9)
+    assert student.get_overall_average() == pytest.approx(overall, abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_inserts_overwrites_and_removals(seed):
+    rng = random.Random(seed)
+    store = GradeStore()
+    student = Student("S1", "Estudiante", "s1@test.com", store)
+    for _ in range(300):
+        course_id = rng.choice(COURSES)
+        if rng.random() < 0.05:
+            store.remove_course(course_id)
+            student.remove_course(course_id)
+        else:
+            # Pocas evaluaciones por curso: muchas de estas operaciones reemplazan una nota
+            student.add_grade(course_id, rng.choice(EVALUATIONS), rng.uniform(0, 100))
+        assert_matches(student)
+
+
+def test_remove_last_course_resets_totals():
+    store = GradeStore()
+    student = Student("S1", "Estudiante", "s1@test.com", store)
+    student.add_grade("C1", "E1", 0.1)
+    student.add_grade("C1", "E2", 0.2)
+    store.remove_course("C1")
+    student.remove_course("C1")
+    assert student._total_sum == 0
+    assert student.get_overall_average() == 0
+
+
+def test_aggregates_survive_save_and_reload(tmp_path):
+    rng = random.Random(1)
+    system = open_system(tmp_path)
+    with quiet(), system.batch():
+        system.register_user("I1", "Instructor", "i1@test.com", "instructor")
+        for course_id in COURSES:
+            system.create_course(course_id, f"Curso {course_id}", f"COD{course_id}", "I1")
+            for eval_id in EVALUATIONS:
+                system.create_evaluation(f"{course_id}{eval_id}", course_id, eval_id, "tarea", 100)
+        for number in range(20):
+            student_id = f"S{number}"
+            system.register_user(student_id, f"Estudiante {number}", f"s{number}@test.com", "estudiante")
+            for course_id in rng.sample(COURSES, 2):
+                system.enroll_student(student_id, course_id)
+        for _ in range(400):
+            student_id = f"S{rng.randrange(20)}"
+            course_id = rng.choice(list(system.users[student_id].enrolled_courses))
+            system.register_grade(student_id, f"{course_id}{rng.choice(EVALUATIONS)}", rng.randint(0, 100))
+    expected = {student_id: (user.get_overall_average(), {course_id: user.get_course_average(course_id)
+                                                           for course_id in COURSES})
+                for student_id, user in system.users.items() if isinstance(user, Student)}
+    system.save_data()
+    system.storage.close()
+
+    reloaded = open_system(tmp_path)
+    reloaded.ensure_loaded("grades")
+    for student_id, (overall, averages) in expected.items():
+        student = reloaded.users[student_id]
+        assert_matches(student)
+        assert student.get_overall_average() == pytest.approx(overall, abs=1e-9)
+        for course_id, average in averages.items():
+            assert student.get_course_average(course_id) == pytest.approx(average, abs=1e-9)
+    reloaded.storage.close()
+
+
+def test_reload_skips_incomplete_lines_and_applies_journal(tmp_path):
+    system = populate(open_system(tmp_path))
+    with quiet():
+        system.register_grade("S1", "E1", 80)
+        system.register_grade("S1", "E2", 60)
+        system.register_grade("S2", "E2", 90)
+    system.save_data()
+    with quiet():
+        # Después de guardar: queda en el journal y reemplaza la nota del archivo base
+        system.register_grade("S1", "E1", 40)
+    system.storage.close()
+    with open(tmp_path / "grades.txt", "a", encoding="utf-8") as file:
+        file.write("S2|C1\n")
+
+    reloaded = open_system(tmp_path)
+    reloaded.ensure_loaded("grades")
+    s1, s2 = reloaded.users["S1"], reloaded.users["S2"]
+    assert s1.get_course_grades("C1") == {"E1": 40.0, "E2": 60.0}
+    assert s2.get_course_grades("C1") == {"E2": 90.0}
+    assert_matches(s1)
+    assert_matches(s2)
+    assert s1.get_overall_average() == 50
+    reloaded.storage.close()
@@ -0,0 +1,68 @@
+"""Campos de texto con "|" o saltos de línea: se rechazan antes de llegar al journal"""
+import pytest
+
+from conftest import open_system, quiet
+from test_server import serve
+
+INJECTED = ["Parcial\nG|S1|C1|E1|100", "Parcial\r\nN|S3|C1", "Parcial|extra", "Parcial\r"]
+
+
+def assert_unchanged(tmp_path):
+    """Tras volver a cargar, el estado es el del fixture"""
+    reloaded = open_system(tmp_path)
+    try:
+        assert sorted(reloaded.evaluations) == ["E1", "E2"]
+        assert reloaded.student_grades("S1") == {}
+        assert sorted(reloaded.users) == ["I1", "S1", "S2"]
+        assert reloaded.course_roster("C1") == ["S1", "S2"]
+    finally:
+        reloaded.storage.close()
+
+
+@pytest.mark.parametrize("name", INJECTED)
+def test_create_evaluation_rejects_reserved_characters(system, tmp_path, name):
+    with pytest.raises(ValueError, match="saltos de línea"):
+        system.create_evaluation("E3", "C1", name, "tarea", 100)
+    assert "E3" not in system.evaluations
+    assert_unchanged(tmp_path)
+
+
+@pytest.mark.parametrize("fields", [
+    ("S3\nG|S1|C1|E1|100", "Nuevo", "s3@test.com", "estudiante"),
+    ("S3", "Nuevo|X", "s3@test.com", "estudiante"),
+    ("S3", "Nuevo", "s3@test.com\nU|S4|X|x@test.com|estudiante", "estudiante"),
+])
+def test_register_user_rejects_reserved_characters(system, tmp_path, fields):
+    with pytest.raises(ValueError, match="saltos de línea"):
+        system.register_user(*fields)
+    assert_unchanged(tmp_path)
+
+
+def test_create_course_rejects_reserved_characters(system, tmp_path):
+    for fields in (("C2", "Curso\nC|C3|X|COD3|I1", "COD2", "I1"), ("C2", "Curso", "COD|2", "I1")):
+        with pytest.raises(ValueError, match="saltos de línea"):
+            system.create_course(*fields)
+    assert_unchanged(tmp_path)
+
+
+def test_http_and_csv_import_reject_reserved_characters(system, tmp_path):
+    [(status, payload)] = serve(system, ("POST", "/evaluations", {
+        "evaluation_id": "E3", "course_id": "C1", "name": INJECTED[0], "evaluation_type": "tarea", "max_score": 100}))
+    assert status == 400 and "saltos de línea" in payload["error"]
+
+    source = tmp_path / "usuarios.csv"
+    source.write_text('user_id,name,email,user_type\nS3,"Nuevo\nG|S1|C1|E1|100",s3@test.com,estudiante\n',
+                      encoding="utf-8")
+    imported, errors = system.import_users(str(source))
+    assert imported == 0 and "saltos de línea" in errors[0][1]
+    assert_unchanged(tmp_path)
+
+
+def test_plain_names_still_round_trip(system, tmp_path):
+    with quiet():
+        system.create_evaluation("E3", "C1", "Trabajo práctico: ¿final?", "tarea", 100)
+    reloaded = open_system(tmp_path)
+    try:
+        assert reloaded.evaluations["E3"].name == "Trabajo práctico: ¿final?"
+    finally:
+        reloaded.storage.close()